@@ -0,0 +1,394 @@
+"""
+Command-line entry point for RPA bots and scripts (no UI modules are imported):
+
+    python -m app.cli run --profile prod-mssql --databases "tenant_*" --script deploy.sql
+    python -m app.cli databases --profile prod-mssql --databases @targets.txt
+    python -m app.cli serve --port 8765
+    python -m app.cli schedule add recon --profile prod-mssql --databases "tenant_*" --script recon.sql --cron "0 */4 * * *"
+    python -m app.cli schedule start
+    python -m app.cli manifest release.json --profile prod-mssql
+    python -m app.cli fleet --databases "prod-a:tenant_*" --databases "prod-pg:*" --script deploy.sql
+    python -m app.cli run --profile prod-mssql --databases "tenant_*" --script deploy.sql --profile-out profiles
+
+Exit codes: 0 success, 1 one or more databases failed, 2 usage/configuration error.
+"""
+
+import sys
+import json
+import argparse
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="sqltool", description="Zanvar's SQL Tool (headless)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Run a SQL script on selected databases")
+    _add_target_args(run, databases_required=False)
+    run.add_argument("--script", help="Path to a .sql file, '-' for stdin, or SQL text")
+    run.add_argument("--workers", type=int, default=None, help="Maximum databases in parallel")
+    run.add_argument("--track-migrations", action="store_true",
+                     help="Skip databases whose migration ledger already has this script")
+    run.add_argument("--journal", action="store_true", help="Record progress in the deployment journal")
+    run.add_argument("--resume", metavar="RUN_ID",
+                     help="Resume a journaled run with its recorded script and databases, skipping completed statements")
+    run.add_argument("--format", choices=["json", "text"], default="json")
+    run.add_argument("--no-results", action="store_true", help="Omit per-statement result text from JSON")
+    run.add_argument("--output", help="Write output to this file instead of stdout")
+    run.add_argument("-v", "--verbose", action="store_true", help="Echo progress to stderr")
+    run.add_argument("--metrics-file", help="Write phase timings: Prometheus textfile (*.prom) or JSON spans")
+    _add_profiler_arg(run)
+    run.set_defaults(handler=cmd_run)
+
+    dbs = sub.add_parser("databases", help="List databases a selection resolves to")
+    _add_target_args(dbs, databases_required=False)
+    dbs.set_defaults(handler=cmd_databases)
+
+    serve = sub.add_parser("serve", help="Run the local job-queue service")
+    serve.add_argument("--host", default=None, help="Address to listen on (default from AppConfig.SERVICE)")
+    serve.add_argument("--port", type=int, default=None, help="TCP port to listen on")
+    serve.add_argument("--socket", default=None, help="Listen on this Unix socket instead of TCP")
+    serve.add_argument("--workers", type=int, default=None, help="Jobs executed at the same time")
+    serve.set_defaults(handler=cmd_serve)
+
+    fleet = sub.add_parser("fleet", help="Run a SQL script on databases across several server profiles")
+    fleet.add_argument("--databases", action="append", required=False, default=None,
+                       help="'profile:selector' (names, comma lists, globs or @file); may be repeated")
+    fleet.add_argument("--script", help="Path to a .sql file, '-' for stdin, or SQL text")
+    fleet.add_argument("--server-workers", type=int, default=None, help="Maximum databases in parallel per server")
+    fleet.add_argument("--max-workers", type=int, default=None, help="Maximum databases in parallel overall")
+    fleet.add_argument("--track-migrations", action="store_true",
+                       help="Skip databases whose migration ledger already has this script")
+    fleet.add_argument("--journal", action="store_true", help="Record progress in the deployment journal")
+    fleet.add_argument("--resume", metavar="RUN_ID", help="Resume a journaled fleet run")
+    fleet.add_argument("--format", choices=["json", "text"], default="json")
+    fleet.add_argument("--no-results", action="store_true", help="Omit per-statement result text from JSON")
+    fleet.add_argument("--output", help="Write output to this file instead of stdout")
+    fleet.add_argument("-v", "--verbose", action="store_true", help="Echo progress to stderr")
+    fleet.add_argument("--metrics-file", help="Write phase timings: Prometheus textfile (*.prom) or JSON spans")
+    _add_profiler_arg(fleet)
+    fleet.set_defaults(handler=cmd_fleet)
+
+    manifest = sub.add_parser("manifest", help="Run a multi-script manifest as a per-database DAG")
+    manifest.add_argument("path", nargs="?", help="Manifest JSON file (omit with --resume)")
+    manifest.add_argument("--profile", default=None, help="Server profile (overrides the manifest's)")
+    manifest.add_argument("--workers", type=int, default=None, help="Maximum step/database nodes in parallel")
+    manifest.add_argument("--track-migrations", action="store_true",
+                          help="Skip steps whose script a database's migration ledger already has")
+    manifest.add_argument("--resume", metavar="RUN_ID", help="Resume a journaled manifest run")
+    manifest.add_argument("--format", choices=["json", "text"], default="json")
+    manifest.add_argument("--no-results", action="store_true", help="Omit per-statement result text from JSON")
+    manifest.add_argument("--output", help="Write output to this file instead of stdout")
+    manifest.add_argument("-v", "--verbose", action="store_true", help="Echo progress to stderr")
+    manifest.add_argument("--metrics-file", help="Write phase timings: Prometheus textfile (*.prom) or JSON spans")
+    _add_profiler_arg(manifest)
+    manifest.set_defaults(handler=cmd_manifest)
+
+    extract = sub.add_parser("extract", help="Extract a SELECT into one file per database")
+    _add_target_args(extract)
+    extract.add_argument("--script", required=True, help="Path to a .sql file, '-' for stdin, or SQL text")
+    extract.add_argument("--output-dir", default=None, help="Folder for the extract files (default from AppConfig.EXTRACT)")
+    extract.add_argument("--format", choices=["csv", "binary"], default=None,
+                         help="csv, or binary (PostgreSQL COPY format)")
+    extract.add_argument("--no-header", action="store_true", help="Omit the CSV header row")
+    extract.add_argument("--no-copy", action="store_true", help="Always fetch rows instead of using COPY")
+    extract.add_argument("--workers", type=int, default=None, help="Maximum databases in parallel")
+    extract.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    extract.add_argument("-v", "--verbose", action="store_true", help="Echo progress to stderr")
+    extract.set_defaults(handler=cmd_extract)
+
+    load = sub.add_parser("load", help="Bulk-load a CSV/Excel file into a table on selected databases")
+    _add_target_args(load)
+    load.add_argument("--file", required=True, help="CSV or .xlsx file; the first row holds the column names")
+    load.add_argument("--table", required=True, help="Target table, e.g. dbo.Products")
+    load.add_argument("--columns", default=None, help="Comma-separated target columns (default: the file header)")
+    load.add_argument("--sheet", default=None, help="Excel sheet name (default: the active sheet)")
+    load.add_argument("--batch-size", type=int, default=None, help="Rows per bulk call (default from AppConfig.LOAD)")
+    load.add_argument("--workers", type=int, default=None, help="Maximum databases in parallel")
+    load.add_argument("--truncate", action="store_true", help="Delete existing rows first (same transaction)")
+    load.add_argument("--commit-per-batch", action="store_true",
+                      help="Commit every batch instead of once per database")
+    load.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    load.add_argument("-v", "--verbose", action="store_true", help="Echo progress to stderr")
+    load.set_defaults(handler=cmd_load)
+
+    copy = sub.add_parser("copy", help="Copy a table or query result from one database into many")
+    _add_target_args(copy)
+    copy.add_argument("--source-db", required=True, help="Database to read from (on --profile)")
+    copy.add_argument("--table", required=True, help="Target table; also the source when --query is omitted")
+    copy.add_argument("--query", default=None, help="Source SELECT: path to a .sql file or SQL text")
+    copy.add_argument("--target-profile", default=None, help="Server profile of the targets (default: --profile)")
+    copy.add_argument("--mode", choices=["append", "replace", "upsert"], default=None)
+    copy.add_argument("--key", action="append", default=None, help="Key column for upsert; may be repeated")
+    copy.add_argument("--batch-size", type=int, default=None, help="Rows per batch (default from AppConfig.COPY)")
+    copy.add_argument("--queue-depth", type=int, default=None, help="Batches buffered per target")
+    copy.add_argument("--max-targets", type=int, default=None, help="Targets written at the same time")
+    copy.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    copy.add_argument("-v", "--verbose", action="store_true", help="Echo progress to stderr")
+    copy.set_defaults(handler=cmd_copy)
+
+    schedule = sub.add_parser("schedule", help="Manage and run recurring jobs")
+    schedule.add_argument("--jobs-file", default=None, help="Jobs file (default from AppConfig.SCHEDULER)")
+    schedule_sub = schedule.add_subparsers(dest="action", required=True)
+
+    add = schedule_sub.add_parser("add", help="Add or replace a scheduled job")
+    add.add_argument("name")
+    _add_target_args(add)
+    add.add_argument("--script", required=True, help="Path to a .sql file or SQL text")
+    add.add_argument("--cron", required=True, help='5-field cron expression, e.g. "*/30 6-18 * * 1-5"')
+    add.add_argument("--workers", type=int, default=None, help="Maximum databases in parallel for this job")
+    add.add_argument("--stagger", type=int, default=None, help="Fixed start offset in seconds (default: from name)")
+    add.add_argument("--track-migrations", action="store_true")
+    add.add_argument("--disabled", action="store_true", help="Save the job without scheduling it")
+
+    remove = schedule_sub.add_parser("remove", help="Remove a scheduled job")
+    remove.add_argument("name")
+
+    schedule_sub.add_parser("list", help="List jobs and their next run time")
+
+    once = schedule_sub.add_parser("run", help="Run one scheduled job now")
+    once.add_argument("name")
+
+    schedule_sub.add_parser("start", help="Run the scheduler until interrupted")
+    schedule.set_defaults(handler=cmd_schedule)
+
+    return parser
+
+
+def _add_target_args(parser, databases_required=True):
+    parser.add_argument("--profile", required=True, help="Server profile name from server_profiles.json")
+    parser.add_argument("--databases", action="append", required=databases_required, default=None,
+                        help="Names, comma lists, globs or @file; may be repeated")
+
+
+def _add_profiler_arg(parser):
+    parser.add_argument("--profile-out", metavar="DIR", default=None,
+                        help="Sample the run's Python stacks; write collapsed/speedscope/top files to DIR")
+
+
+def _run_profiled(args):
+    """Run the command under the sampling profiler and save its output next to the other run files."""
+    from datetime import datetime
+    from app.utils.profiler import SamplingProfiler
+
+    profiler = SamplingProfiler().start()
+    try:
+        return args.handler(args)
+    finally:
+        profiler.stop()
+        paths = profiler.save(args.profile_out, f"profile_{args.command}_{datetime.now():%Y%m%d_%H%M%S}")
+        print(profiler.top_functions(), file=sys.stderr)
+        print(f"Profile written to {paths['speedscope']}", file=sys.stderr, flush=True)
+
+
+def cmd_run(args):
+    from app import headless
+
+    if not args.resume and not (args.databases and args.script):
+        raise ValueError("Give --databases and --script, or --resume RUN_ID")
+    output = headless.run_script(
+        args.profile, args.databases, args.script,
+        max_workers=args.workers,
+        track_migrations=args.track_migrations,
+        journal=args.journal,
+        resume_run_id=args.resume,
+        verbose=args.verbose,
+        metrics_file=args.metrics_file,
+        include_results=not args.no_results,
+    )
+    return _emit_run_output(output, args)
+
+
+def cmd_databases(args):
+    from app import headless
+
+    db_manager = headless.connect_profile(args.profile)
+    if args.databases:
+        names = headless.resolve_databases(db_manager, args.databases)
+    else:
+        names = db_manager.get_databases()
+    _emit("\n".join(names), None)
+    return 0
+
+
+def cmd_fleet(args):
+    from app import headless
+
+    if not args.resume and not (args.databases and args.script):
+        raise ValueError("Give --databases and --script, or --resume RUN_ID")
+    output = headless.run_fleet(
+        args.databases, args.script,
+        per_server_workers=args.server_workers,
+        max_total_workers=args.max_workers,
+        track_migrations=args.track_migrations,
+        journal=args.journal,
+        resume_run_id=args.resume,
+        verbose=args.verbose,
+        metrics_file=args.metrics_file,
+        include_results=not args.no_results,
+    )
+    return _emit_run_output(output, args)
+
+
+def cmd_manifest(args):
+    from app import headless
+
+    if not args.path and not args.resume:
+        raise ValueError("Give a manifest path or --resume RUN_ID")
+    output = headless.run_manifest(
+        args.path, args.profile,
+        max_workers=args.workers,
+        track_migrations=args.track_migrations,
+        resume_run_id=args.resume,
+        verbose=args.verbose,
+        metrics_file=args.metrics_file,
+        include_results=not args.no_results,
+    )
+    return _emit_run_output(output, args)
+
+
+def cmd_extract(args):
+    from app import headless
+
+    output = headless.run_extract(
+        args.profile, args.databases, args.script,
+        output_dir=args.output_dir,
+        fmt=args.format,
+        header=False if args.no_header else None,
+        max_workers=args.workers,
+        use_copy=False if args.no_copy else None,
+        verbose=args.verbose,
+    )
+    _emit(json.dumps(output, indent=2, default=str), args.output)
+    return 0 if output["ok"] else 1
+
+
+def cmd_load(args):
+    from app import headless
+
+    output = headless.run_load(
+        args.profile, args.databases, args.file, args.table,
+        columns=[c.strip() for c in args.columns.split(",")] if args.columns else None,
+        sheet=args.sheet,
+        batch_size=args.batch_size,
+        max_workers=args.workers,
+        truncate=args.truncate,
+        commit_per_batch=args.commit_per_batch or None,
+        verbose=args.verbose,
+    )
+    _emit(json.dumps(output, indent=2, default=str), args.output)
+    return 0 if output["ok"] else 1
+
+
+def cmd_copy(args):
+    from app import headless
+
+    output = headless.run_copy(
+        args.profile, args.source_db, args.databases, args.table,
+        query=args.query,
+        target_profile=args.target_profile,
+        mode=args.mode,
+        keys=args.key,
+        batch_size=args.batch_size,
+        queue_depth=args.queue_depth,
+        max_targets=args.max_targets,
+        verbose=args.verbose,
+    )
+    _emit(json.dumps(output, indent=2, default=str), args.output)
+    return 0 if output["ok"] else 1
+
+
+def cmd_serve(args):
+    from app.core.config import AppConfig
+    from app.service.job_service import JobService
+
+    service = JobService(workers=args.workers)
+    settings = AppConfig.SERVICE
+    where = args.socket or f"http://{args.host or settings['host']}:{args.port or settings['port']}"
+    print(f"Serving jobs on {where}", file=sys.stderr, flush=True)
+    service.serve_forever(args.host, args.port, args.socket)
+    return 0
+
+
+def cmd_schedule(args):
+    from datetime import datetime
+    from app.service.scheduler import CronSchedule, Scheduler
+    from app.utils import scheduled_jobs
+
+    if args.action == "add":
+        CronSchedule(args.cron)  # validate before saving
+        job = {"profile": args.profile, "databases": args.databases, "script": args.script,
+               "schedule": args.cron, "enabled": not args.disabled}
+        if args.workers:
+            job["max_workers"] = args.workers
+        if args.stagger is not None:
+            job["stagger"] = args.stagger
+        if args.track_migrations:
+            job["track_migrations"] = True
+        scheduled_jobs.save_job(args.name, job, args.jobs_file)
+        return 0
+
+    if args.action == "remove":
+        if not scheduled_jobs.remove_job(args.name, args.jobs_file):
+            raise ValueError(f"Unknown scheduled job: {args.name}")
+        return 0
+
+    jobs = scheduled_jobs.load_jobs(args.jobs_file)
+    if args.action == "list":
+        now = datetime.now()
+        lines = []
+        for name, job in jobs.items():
+            if job.get("enabled", True):
+                next_run = f"{Scheduler.next_run_time(name, job, now):%Y-%m-%d %H:%M:%S}"
+            else:
+                next_run = "disabled"
+            lines.append(f"{name:<24} {job['schedule']:<18} {next_run:<20} {job['profile']}")
+        _emit("\n".join(lines), None)
+        return 0
+
+    scheduler = Scheduler(jobs_file=args.jobs_file)
+    if args.action == "run":
+        if args.name not in jobs:
+            raise ValueError(f"Unknown scheduled job: {args.name}")
+        try:
+            output = scheduler.run_job(args.name, jobs[args.name])
+        finally:
+            scheduler.close()
+        output.pop("summary", None)
+        _emit(json.dumps(output, indent=2, default=str), None)
+        return 0 if output["ok"] else 1
+
+    try:
+        scheduler.run_forever()
+    except KeyboardInterrupt:
+        scheduler.stop()
+    return 0
+
+
+def _emit_run_output(output, args):
+    text = output["summary"] if args.format == "text" else json.dumps(output, indent=2, default=str)
+    _emit(text, args.output)
+    return 0 if output["ok"] else 1
+
+
+def _emit(text, path):
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text + "\n")
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        if getattr(args, "profile_out", None):
+            return _run_profiled(args)
+        return args.handler(args)
+    except Exception as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,7 @@
 import tkinter as tk
 from tkinter import messagebox
 import threading
-from queue import Queue, Empty
+from queue import Empty
 from datetime import datetime
 
 from app.ui.components.connection_ui import ConnectionUI
@@ -9,11 +9,16 @@ from app.ui.components.main_ui import MainUI
 from app.ui.styling.styles import StyleManager
 from app.ui.styling.logo_handler import LogoHandler
 from app.database.connection import DatabaseManager
-from app.database.query_executor import QueryExecutor
+from app.database.connection_pool import ConnectionPool
+from app.database.result_store import ResultStore
+from app.database.migration_ledger import MigrationLedger
 from app.utils.query_history import QueryHistoryManager
+from app.utils.deployment_journal import DeploymentJournal
 from app.utils.file_operations import FileOperationsManager
+from app.utils.event_bus import EventBus
 from app.utils.validators import QueryValidator
 from app.core.config import AppConfig
+from app.core.query_session import QuerySession
 # FIX 1: Import BOTH save and load functions
 from app.utils.config_manager import save_credentials, load_credentials
 
@@ -28,10 +33,10 @@ class SQLToolApp:
         self.current_server = None # This will now store the whole config dict
         self.db_vars = {}
         self.db_checkbuttons = {}
-        self.message_queue = Queue()
+        self.message_queue = EventBus()  # app-level channel (connection, ledger); runs use their session's bus
         self.query_history = []
-        self.query_running = False
-        self.current_query = None
+        self.sessions = {}  # session id -> QuerySession, one per query tab
+        self.session_counter = 0
 
         self.setup_application()
         self.initialize_managers()
@@ -73,9 +78,14 @@ class SQLToolApp:
     def initialize_managers(self):
         """Initialize all manager classes."""
         self.style_manager = StyleManager(self.root, self)
-        self.db_manager = DatabaseManager()
+        # Every session tab borrows connections from one pool...
+        self.pool = ConnectionPool()
+        self.db_manager = DatabaseManager(self.pool)
         self.history_manager = QueryHistoryManager()
-        self.query_executor = QueryExecutor(self.db_manager, self.message_queue)
+        self.journal = DeploymentJournal()
+        self.ledger = MigrationLedger(self.db_manager, self.message_queue)
+        # ...and together works on at most SESSIONS['max_total_workers'] databases at once
+        self.worker_limit = threading.BoundedSemaphore(AppConfig.SESSIONS['max_total_workers'])
         self.file_manager = FileOperationsManager()
 
     def initialize_ui(self):
@@ -124,6 +134,8 @@ class SQLToolApp:
 
         self.current_server = None
         self.db_vars = {}
+        self._close_sessions()
+        self.pool.close_all()
 
         # back to login window sizing
         self.main_ui.hide()
@@ -132,11 +144,77 @@ class SQLToolApp:
         self.root.resizable(False, False)
         self.connection_ui.show()
 
-    # ------------- Query execution -------------
-    def start_query_thread(self, selected_databases, query):
-        if self.query_running:
-            messagebox.showwarning("Wait", "Query already running")
+    # ------------- Sessions -------------
+    def open_session(self):
+        """Open a new query tab with its own executor, results and cancel switch."""
+        self.session_counter += 1
+        session = QuerySession(self.session_counter, self.db_manager, self.journal, self.ledger,
+                               worker_limit=self.worker_limit)
+        self.sessions[session.id] = session
+        session.tab = self.main_ui.add_session_tab(session)
+        return session
+
+    def active_session(self):
+        tab = self.main_ui.get_active_tab()
+        return tab.session if tab else None
+
+    def running_sessions(self):
+        return [session for session in self.sessions.values() if session.running]
+
+    def _session_for_run(self):
+        """The active tab if it is idle, otherwise a new one; None once SESSIONS['max_running'] run."""
+        max_running = AppConfig.SESSIONS['max_running']
+        if len(self.running_sessions()) >= max_running:
+            messagebox.showwarning("Wait", f"{max_running} sessions are already running.")
+            return None
+        session = self.active_session()
+        if session is None or session.running:
+            session = self.open_session()
+        return session
+
+    def _start_session(self, session, status, cancellable=True):
+        session.begin_run()
+        session.tab.clear()
+        session.tab.set_running(True, cancellable=cancellable)
+        self.main_ui.update_session_tab(session.tab)
+        self.main_ui.select_session_tab(session.tab)
+        self.main_ui.set_export_enabled(False)
+        self.main_ui.show_status(f"{session.name}: {status}")
+
+    def cancel_session(self, session_id):
+        session = self.sessions.get(session_id)
+        if session and session.running:
+            session.cancel()
+            session.tab.set_running(True, cancelling=True)
+            self.main_ui.show_status(f"Cancelling {session.name}...")
+
+    def close_session(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None:
+            return
+        if session.running:
+            messagebox.showwarning("Session Running", "Cancel the run before closing its tab.")
             return
+        del self.sessions[session_id]
+        session.close()
+        self.main_ui.remove_session_tab(session.tab)
+        if not self.sessions:
+            self.open_session()
+
+    def _close_sessions(self):
+        """Cancel and close every session; their tabs go with the next UI rebuild."""
+        for session in self.sessions.values():
+            session.close()
+        self.sessions.clear()
+
+    def on_session_selected(self):
+        session = self.active_session()
+        has_results = bool(session and not session.running and session.current_query
+                           and session.current_query.get("results"))
+        self.main_ui.set_export_enabled(has_results)
+
+    # ------------- Query execution -------------
+    def start_query_thread(self, selected_databases, query, rollout_options=None, resume_run_id=None):
         if not selected_databases:
             messagebox.showwarning("Selection Error", "Select at least one database.")
             return
@@ -152,8 +230,12 @@ class SQLToolApp:
             if not confirm:
                 return
 
+        session = self._session_for_run()
+        if session is None:
+            return
+
         # record for logging
-        self.current_query = {
+        session.current_query = {
             'query': query,
             'databases': selected_databases,
             'start_time': datetime.now(),
@@ -163,24 +245,47 @@ class SQLToolApp:
         # add to history
         self.history_manager.add_query(query)
 
+        track_migrations = self.main_ui.get_track_migrations()
+        if self.main_ui.get_profile_run():
+            # Samples every thread: the query thread, its workers and the Tk dispatch loop
+            from app.utils.profiler import SamplingProfiler
+            session.profiler = SamplingProfiler().start()
+
+        # Results of the session's previous run are released (and its spill file deleted)
+        session.release_results(ResultStore() if AppConfig.RESULTS['store_results'] else None)
+
         # UI state and launch
-        self.query_running = True
-        self.main_ui.set_query_running_state(True)
-        self.main_ui.clear_results()
-        self.main_ui.show_status("Executing query...")
+        self._start_session(session, "Executing query...")
 
         threading.Thread(
             target=self._execute_query_thread,
-            args=(selected_databases, query),
+            args=(session, selected_databases, query, rollout_options, resume_run_id, track_migrations),
             daemon=True
         ).start()
 
-    def _execute_query_thread(self, databases, query):
-        """Run the query and collect structured results for saving."""
+    def _execute_query_thread(self, session, databases, query, rollout_options=None, resume_run_id=None,
+                              track_migrations=False):
+        """Run the query in session and collect structured results for saving."""
+        bus = session.bus
+        run_id = None
         try:
-            result = self.query_executor.execute_query(databases, query)
+            # Journal every run so it can be resumed after a crash
+            # Rollout settings are journaled so a resume keeps the canary and wave gating
+            run_id = resume_run_id or self.journal.start_run(query, databases, self.get_current_server_info(),
+                                                             options=rollout_options)
+            session.current_query['run_id'] = run_id
+
+            if rollout_options is not None:
+                result = session.rollout.run(databases, query, run_id=run_id,
+                                             track_migrations=track_migrations, **rollout_options)
+            else:
+                result = session.executor.execute_query(databases, query,
+                                                        max_workers=AppConfig.THROTTLE['max_workers'],
+                                                        run_id=run_id, track_migrations=track_migrations)
             # Merge aggregate metrics
-            self.current_query.update(result)
+            session.current_query.update(result)
+
+            self.journal.finish_run(run_id, DeploymentJournal.run_status(result))
 
             # Flatten per-database structured results into current_query["results"]
             flat = []
@@ -188,21 +293,136 @@ class SQLToolApp:
                 for item in db_info.get("results_struct", []):
                     flat.append(item)
             if flat:
-                self.current_query["results"] = flat
+                session.current_query["results"] = flat
+
+            bus.put(("metrics", session.metrics))
+            bus.put(("done", "Query execution completed"))
+            bus.put(("enable_log_button", True))
+        except Exception as e:
+            if run_id:
+                self.journal.finish_run(run_id, "failed")
+            bus.put(("error", f"Query execution failed: {str(e)}"))
+            bus.put(("done", "Query execution failed"))
+
+    def resume_last_run(self):
+        """Re-run the last unfinished run on this server, skipping completed statements."""
+        server = self.current_server['server'] if self.current_server else None
+        run = self.journal.last_incomplete_run(server)
+        if not run:
+            messagebox.showinfo("Resume Run", "No unfinished run to resume.")
+            return
+        for session in self.running_sessions():
+            if session.current_query and session.current_query.get('run_id') == run['run_id']:
+                messagebox.showwarning("Wait", f"This run is still running in {session.name}.")
+                return
+
+        completed = self.journal.completed_statements(run['run_id'])
+        done = sum(len(nums) for nums in completed.values())
+        rollout_options = run['options']
+        mode = "\nIt continues as a rollout: canary first, then waves." if rollout_options is not None else ""
+        confirm = messagebox.askyesno(
+            "Resume Run",
+            f"Resume run started {run['started_at']:%Y-%m-%d %H:%M:%S} on "
+            f"{len(run['databases'])} database(s)?\n\n"
+            f"{done} completed statement(s) will be skipped.{mode}"
+        )
+        if not confirm:
+            return
+
+        self.main_ui.set_query_text(run['query'])
+        self.start_query_thread(run['databases'], run['query'], rollout_options=rollout_options,
+                                resume_run_id=run['run_id'])
+
+    def show_rollout_dialog(self, selected_databases, query):
+        if not selected_databases:
+            messagebox.showwarning("Selection Error", "Select at least one database.")
+            return
+        if not query.strip():
+            messagebox.showwarning("Input Error", "Enter a SQL query.")
+            return
+        from app.ui.dialogs.rollout_dialog import RolloutDialog
+        RolloutDialog(self.root, self).show_rollout(selected_databases, query)
+
+    # ------------- Schema drift -------------
+    def start_schema_check(self, selected_databases):
+        if not selected_databases:
+            messagebox.showwarning("Selection Error", "Select at least one database.")
+            return
+
+        session = self._session_for_run()
+        if session is None:
+            return
+        # Snapshots run to completion; there is nothing to cancel
+        self._start_session(session, "Checking schema drift...", cancellable=False)
 
-            self.message_queue.put(("done", "Query execution completed"))
-            self.message_queue.put(("enable_log_button", True))
+        threading.Thread(
+            target=self._schema_check_thread,
+            args=(session, selected_databases),
+            daemon=True
+        ).start()
+
+    def _schema_check_thread(self, session, databases):
+        """Snapshot schemas in parallel and post the drift report."""
+        bus = session.bus
+        try:
+            report, _ = session.schema_manager.check_drift(databases)
+            bus.put(("execution_summary", report))
+            bus.put(("done", "Schema check completed"))
         except Exception as e:
-            self.message_queue.put(("error", f"Query execution failed: {str(e)}"))
-            self.message_queue.put(("done", "Query execution failed"))
+            bus.put(("error", f"Schema check failed: {str(e)}"))
+            bus.put(("done", "Schema check failed"))
+
+    def set_schema_baseline(self, selected_databases):
+        """Snapshot the one selected database and store it as this server's drift baseline."""
+        if len(selected_databases) != 1:
+            messagebox.showwarning("Selection Error", "Select exactly one database to use as the baseline.")
+            return
+        database = selected_databases[0]
+        if not messagebox.askyesno("Schema Baseline", f"Use the current schema of {database} as the baseline?"):
+            return
+
+        session = self._session_for_run()
+        if session is None:
+            return
+        self._start_session(session, f"Saving schema baseline from {database}...", cancellable=False)
+
+        threading.Thread(
+            target=self._set_baseline_thread,
+            args=(session, database),
+            daemon=True
+        ).start()
+
+    def _set_baseline_thread(self, session, database):
+        bus = session.bus
+        try:
+            snapshot = session.schema_manager.set_baseline(database)
+            bus.put(("execution_summary",
+                     f"Schema baseline set to {database}: {len(snapshot['objects'])} object(s) "
+                     f"at {snapshot['taken_at']}\n"))
+            bus.put(("done", "Schema baseline saved"))
+        except Exception as e:
+            bus.put(("error", f"Saving schema baseline failed: {str(e)}"))
+            bus.put(("done", "Saving schema baseline failed"))
+
+    def reset_schema_baseline(self):
+        """Forget this server's drift baseline; the next check picks the first usable database."""
+        session = self.active_session()
+        if session is None:
+            return
+        if not messagebox.askyesno("Schema Baseline", "Forget the stored schema baseline for this server?"):
+            return
+        removed = session.schema_manager.reset_baseline()
+        self.main_ui.show_status("Schema baseline reset." if removed else "No schema baseline was stored.")
 
     # ------------- File operations -------------
-    def save_query_log(self):
-        """Save current query + results; shows Save dialog and writes .log."""
-        if not self.current_query or not self.current_query.get("results"):
+    def save_query_log(self, session_id=None):
+        """Save a session's query + results (default: the active tab); shows Save dialog and writes .log."""
+        session = self.sessions.get(session_id) if session_id else self.active_session()
+        current_query = session.current_query if session else None
+        if not current_query or not current_query.get("results"):
             messagebox.showwarning("Nothing to save", "Run a query first")
             return
-        ok, msg = self.file_manager.save_query_log(self.current_query, self.current_server)
+        ok, msg = self.file_manager.save_query_log(current_query, self.current_server)
         (messagebox.showinfo if ok else messagebox.showerror)("Save Log", msg)
 
     # ------------- History -------------
@@ -215,30 +435,115 @@ class SQLToolApp:
 
     # ------------- Queue processing -------------
     def check_queue(self):
-        """Process UI messages from worker threads."""
+        """
+        Process UI messages from worker threads: the app bus and every session's bus, each
+        getting an equal share of EVENTS['max_batch'] per poll so Tk can redraw between
+        batches and no busy tab starves the others; polls again sooner while events wait.
+        """
+        settings = AppConfig.EVENTS
+        sessions = list(self.sessions.values())
+        share = max(1, settings['max_batch'] // (len(sessions) + 1))
         try:
-            while True:
-                typ, payload = self.message_queue.get_nowait()
-
-                if typ == "enable_log_button":
-                    self.main_ui.enable_save_log_button()
-                elif typ == "success":
-                    self.handle_success_message(payload)
-                elif typ == "error":
-                    self.handle_error_message(payload)
-                elif typ == "execution_summary":
-                    self.main_ui.show_execution_summary(payload)
-                elif typ == "result":
-                    self.main_ui.append_result(payload)
-                elif typ == "status":
-                    self.main_ui.show_status(payload)
-                elif typ == "done":
-                    self.query_running = False
-                    self.main_ui.set_query_running_state(False)
-        except Empty:
-            pass
+            self._drain(self.message_queue, share, self._handle_app_event)
+            for session in sessions:
+                self._drain(session.bus, share,
+                            lambda typ, payload, session=session: self._handle_session_event(session, typ, payload))
         finally:
-            self.root.after(100, self.check_queue)
+            busy = not self.message_queue.empty() or any(not s.bus.empty() for s in self.sessions.values())
+            self.root.after(settings['poll_busy_ms'] if busy else settings['poll_idle_ms'], self.check_queue)
+
+    @staticmethod
+    def _drain(bus, limit, handle):
+        for _ in range(limit):
+            try:
+                typ, payload = bus.get_nowait()
+            except Empty:
+                return
+            handle(typ, payload)
+
+    def _handle_app_event(self, typ, payload):
+        if typ == "success":
+            self.handle_success_message(payload)
+        elif typ == "error":
+            self.handle_error_message(payload)
+        elif typ == "status":
+            self.main_ui.show_status(payload)
+
+    def _handle_session_event(self, session, typ, payload):
+        tab = session.tab
+        if typ == "enable_log_button":
+            tab.enable_export()
+            if session is self.active_session():
+                self.main_ui.set_export_enabled(True)
+            self.main_ui.show_status(f"{session.name}: execution completed. You can now export the results.")
+        elif typ == "error":
+            tab.show_error(payload)
+            self.main_ui.show_error(payload)
+        elif typ == "execution_summary":
+            session.metrics.record_queue_wait()
+            tab.show_execution_summary(payload)
+            session.results_shown = 0
+        elif typ == "result":
+            self.show_result(session, payload)
+        elif typ == "metrics":
+            self.show_run_metrics(session, payload)
+        elif typ == "db_progress":
+            tab.update_progress(payload)
+        elif typ == "status":
+            self.main_ui.show_status(f"{session.name}: {payload}")
+        elif typ == "done":
+            session.running = False
+            tab.set_running(False)
+            self.main_ui.update_session_tab(tab)
+            self.main_ui.show_running_sessions(len(self.running_sessions()))
+            if session.profiler:
+                self.finish_profile(session)
+
+    def show_result(self, session, item):
+        """
+        Render one StatementResult into the session's console. Past RESULTS['render_first']
+        results, successful ones are listed by title and only rendered when clicked.
+        """
+        metrics = session.metrics
+
+        def render():
+            with metrics.span("render", item.database, item.statement_num):
+                return item.result
+
+        if item.success and item.title and not item.rendered \
+                and session.results_shown >= AppConfig.RESULTS['render_first']:
+            session.tab.append_collapsed_result(item.title, render)
+            return
+        session.results_shown += 1
+        session.tab.append_result(render())
+
+    def show_run_metrics(self, session, metrics):
+        """After a run: export the Prometheus textfile and show the phase breakdown incl. queue/render."""
+        settings = AppConfig.METRICS
+        if settings['textfile']:
+            try:
+                metrics.write_textfile(settings['textfile'])
+            except OSError as e:
+                self.main_ui.show_status(f"Metrics export failed: {e}")
+        if settings['show_breakdown']:
+            breakdown = metrics.breakdown()
+            if breakdown:
+                session.tab.append_result(f"\n{breakdown}\n{session.bus.describe()}\n")
+
+    def finish_profile(self, session):
+        """Stop the session's profiler, save its files and show the top functions."""
+        profiler, session.profiler = session.profiler, None
+        profiler.stop()
+        base_name = FileOperationsManager.default_log_name(session.current_query or {}, prefix="profile")
+        try:
+            paths = profiler.save(AppConfig.PROFILING['output_dir'], base_name.rsplit(".", 1)[0])
+        except OSError as e:
+            self.main_ui.show_status(f"Saving profile failed: {e}")
+            return
+        if session.current_query is not None:
+            session.current_query['profile'] = paths
+        session.tab.append_result(f"\n{profiler.top_functions()}\nProfile: {paths['speedscope']}\n")
+        self.main_ui.show_status(f"Profile saved to {paths['speedscope']}")
 
     def handle_success_message(self, msg):
         """On successful connection, update connection UI then switch."""
@@ -246,7 +551,7 @@ class SQLToolApp:
         self.root.after(800, self._switch_to_main_ui)
 
     def handle_error_message(self, msg):
-        if self.query_running:
+        if self.main_ui.is_shown():
             self.main_ui.show_error(msg)
         else:
             self.connection_ui.show_error(msg)
@@ -270,6 +575,10 @@ class SQLToolApp:
                 
             # 2. THEN, POPULATE the newly created UI with the database list.
             self.main_ui.populate_databases(databases)
+
+            # 3. Sessions of a previous connection went with the old UI; start with a fresh tab.
+            self._close_sessions()
+            self.open_session()
             
             self.main_ui.show()
         except Exception as e:
@@ -277,7 +586,11 @@ class SQLToolApp:
             
     # ------------- Lifecycle -------------
     def on_close(self):
+        self._close_sessions()
+        self.message_queue.close()
         self.history_manager.save_history()
+        self.journal.close()
+        self.pool.close_all()
         if self.conn:
             try:
                 self.conn.close()
@@ -163,6 +163,364 @@ class AppConfig:
         'max_column_width': 50,
     }
     
+    # =============================================================================
+    # SCHEMA SNAPSHOT SETTINGS
+    # =============================================================================
+
+    SCHEMA = {
+        # Parallel catalog readers across databases
+        'max_workers': 16,
+
+        # On-disk fingerprint cache, one file per server/database
+        'cache_dir': "schema_cache",
+        'baseline_filename': "_baseline.json",
+
+        # Object ids per detail query (keeps IN lists reasonable)
+        'detail_chunk_size': 500,
+    }
+
+    # =============================================================================
+    # ROLLOUT SETTINGS
+    # =============================================================================
+
+    ROLLOUT = {
+        # Databases run first; any failure there stops the rollout
+        'canary_count': 1,
+
+        # Databases per wave and concurrent workers inside a wave
+        'wave_size': 10,
+        'max_workers': 4,
+
+        # Halt remaining waves once this fraction of finished databases failed
+        'error_threshold': 0.10,
+    }
+
+    # =============================================================================
+    # DEPLOYMENT JOURNAL SETTINGS
+    # =============================================================================
+
+    JOURNAL = {
+        # Local SQLite file recording per-database, per-statement completion
+        'path': "deployment_journal.db",
+    }
+
+    # =============================================================================
+    # MIGRATION TRACKING SETTINGS
+    # =============================================================================
+
+    MIGRATIONS = {
+        # Ledger table created in each target database, keyed by script checksum
+        'table': "sqltool_migrations",
+
+        # Parallel ledger pre-checks across databases
+        'max_workers': 16,
+    }
+
+    # =============================================================================
+    # RETRY SETTINGS
+    # =============================================================================
+
+    RETRY = {
+        # Total attempts per connection / statement (1 disables retries)
+        'max_attempts': 3,
+
+        # Exponential backoff with full jitter, in seconds
+        'base_delay': 0.5,
+        'max_delay': 8.0,
+
+        # Re-run write statements the server rolled back (deadlock victim, serialization failure)
+        'retry_rolled_back_writes': True,
+    }
+
+    # =============================================================================
+    # ADAPTIVE THROTTLE SETTINGS
+    # =============================================================================
+
+    THROTTLE = {
+        # Sample server load during parallel runs and adjust workers (AIMD)
+        'enabled': True,
+
+        # Worker ceiling for normal executions, and the limit bounds
+        'max_workers': 8,
+        'min_workers': 1,
+        'initial_workers': 2,
+
+        # Seconds between load samples on a dedicated connection
+        'sample_interval': 2.0,
+
+        # Back off when active requests per CPU or I/O-waiting sessions per CPU exceed these
+        'cpu_high': 1.5,
+        'io_wait_high': 1.0,
+        'decrease_factor': 0.5,
+
+        # PostgreSQL does not expose the core count through SQL
+        'assumed_cpus': 8,
+    }
+
+    # =============================================================================
+    # CONNECTION POOL SETTINGS
+    # =============================================================================
+
+    POOL = {
+        'max_idle_per_database': 2,
+        'max_idle_total': 64,
+        'idle_timeout': 300,  # seconds
+    }
+
+    # =============================================================================
+    # SERVICE MODE SETTINGS
+    # =============================================================================
+
+    SERVICE = {
+        # Local HTTP API (loopback only by default)
+        'host': "127.0.0.1",
+        'port': 8765,
+
+        # Jobs executed at the same time, each with its own database fan-out
+        'workers': 4,
+
+        # Persistent job queue and progress events
+        'db_path': "service_jobs.db",
+
+        # Seconds between event polls while streaming progress to a client
+        'stream_poll_interval': 0.5,
+    }
+
+    # =============================================================================
+    # SCHEDULER SETTINGS
+    # =============================================================================
+
+    SCHEDULER = {
+        # Named recurring jobs (profile, databases, script, cron schedule)
+        'jobs_file': "scheduled_jobs.json",
+
+        # Each job fires at a fixed offset within this window so they do not all start at :00
+        'stagger_seconds': 300,
+
+        # Scheduled jobs running at the same time, and databases in parallel per job
+        'max_concurrent_jobs': 2,
+        'max_workers': 4,
+
+        # Per-run logs of scheduled jobs
+        'export_dir': "scheduled_logs",
+    }
+
+    # =============================================================================
+    # MULTI-SERVER (FLEET) SETTINGS
+    # =============================================================================
+
+    FLEET = {
+        # Databases in parallel on any one server, and open sessions across all servers
+        'per_server_workers': 4,
+        'max_total_workers': 32,
+    }
+
+    # =============================================================================
+    # DRIVER SETTINGS
+    # =============================================================================
+
+    DRIVERS = {
+        # First installed driver wins; a profile or set_config(driver=...) can pick one explicitly
+        'preference': {
+            "SQL Server": ["pyodbc", "pymssql", "turbodbc"],
+            "PostgreSQL": ["psycopg", "psycopg2"],
+            "SQLite": ["sqlite3"],
+        },
+
+        # ODBC driver name used by pyodbc and turbodbc connection strings
+        'odbc_driver': "SQL Server",
+
+        # psycopg 3 binary protocol for result transfer
+        'psycopg_binary': True,
+    }
+
+    # =============================================================================
+    # RESULT SETTINGS
+    # =============================================================================
+
+    RESULTS = {
+        # Use a driver's own Arrow/NumPy fetch (turbodbc) when pyarrow/numpy are installed
+        'native_columnar': True,
+
+        # Rows rendered into the text output per statement; all rows stay in the result set
+        'max_display_rows': 10000,
+
+        # Statements rendered into the console as results arrive; later ones are listed as
+        # one-line headers that render when clicked (errors are always shown in full)
+        'render_first': 20,
+
+        # Keep each statement's ResultSet in results_struct for export and aggregation
+        'keep_result_sets': False,
+
+        # GUI runs keep every result in a ResultStore (memory budget + spill file)
+        'store_results': True,
+
+        # Memory for stored result chunks across a run; older chunks spill to disk beyond it
+        'memory_budget_mb': 512,
+
+        # Rows per stored chunk (the unit that is spilled and read back)
+        'chunk_rows': 50000,
+
+        # Folder for spill files (None = system temp folder)
+        'spill_dir': None,
+
+        # zlib level for spilled chunks (1 = fastest)
+        'spill_compression': 1,
+    }
+
+    # =============================================================================
+    # EXTRACT SETTINGS
+    # =============================================================================
+
+    EXTRACT = {
+        # Default output format: 'csv', or 'binary' (PostgreSQL COPY binary; other engines write CSV)
+        'format': 'csv',
+
+        # Write a header row in CSV output
+        'header': True,
+
+        # Use COPY (...) TO STDOUT when the engine supports it and the query is a single SELECT
+        'use_copy': True,
+
+        # Bytes per read while streaming COPY output (psycopg2)
+        'copy_chunk_size': 1 << 20,
+
+        # Databases extracted in parallel
+        'max_workers': 4,
+
+        # Folder for one file per database
+        'output_dir': 'extracts',
+    }
+
+    # =============================================================================
+    # BULK LOAD SETTINGS
+    # =============================================================================
+
+    LOAD = {
+        # Rows sent per bulk call (fast_executemany / COPY FROM STDIN / executemany)
+        'batch_size': 5000,
+
+        # Databases loaded in parallel
+        'max_workers': 4,
+
+        # Commit after every batch instead of once per database (all-or-nothing)
+        'commit_per_batch': False,
+
+        # Treat empty CSV/Excel cells as NULL
+        'empty_as_null': True,
+
+        # Encoding of CSV source files
+        'csv_encoding': 'utf-8-sig',
+
+        # The file is parsed once and its batches replayed for every database; they stay
+        # in memory up to this size, then move to a temporary file
+        'spool_memory_mb': 256,
+
+        # Folder for that temporary file (None = system temp folder)
+        'spool_dir': None,
+    }
+
+    # =============================================================================
+    # COPY PIPELINE SETTINGS
+    # =============================================================================
+
+    COPY = {
+        # 'append', 'replace' (delete + insert in one transaction) or 'upsert' (needs key columns)
+        'mode': 'append',
+
+        # Rows per batch read from the source and written to each target
+        'batch_size': 5000,
+
+        # Batches buffered per target before the reader waits (backpressure)
+        'queue_depth': 4,
+
+        # Targets written concurrently; more targets are copied in waves that replay the
+        # batches spooled while the first wave read the source
+        'max_targets': 16,
+
+        # Spooled source batches stay in memory up to this size, then move to a temporary file
+        'spool_memory_mb': 256,
+
+        # Folder for that temporary file (None = system temp folder)
+        'spool_dir': None,
+    }
+
+    # =============================================================================
+    # METRICS SETTINGS
+    # =============================================================================
+
+    METRICS = {
+        # Record per-phase spans (connect, execute, fetch, format, commit, queue, render)
+        'enabled': True,
+
+        # Histogram bucket upper bounds in seconds
+        'buckets': [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60],
+
+        # Individual spans kept per run for the JSON export
+        'max_spans': 100000,
+
+        # Prometheus textfile written after every GUI run (None = off), e.g. for node_exporter
+        'textfile': None,
+
+        # Append the phase breakdown to the results pane after a GUI run
+        'show_breakdown': True,
+    }
+
+    # =============================================================================
+    # PROFILING SETTINGS
+    # =============================================================================
+
+    PROFILING = {
+        # Seconds between stack samples while a run is profiled
+        'interval': 0.005,
+
+        # Keep samples of threads that are only waiting (queue gets, Tk mainloop)
+        'include_idle': False,
+
+        # Rows in the top-functions summary
+        'top_functions': 25,
+
+        # Folder for profiles of GUI runs (collapsed stacks, speedscope JSON, top functions)
+        'output_dir': 'profiles',
+    }
+
+    # =============================================================================
+    # SESSION SETTINGS
+    # =============================================================================
+
+    SESSIONS = {
+        # Query tabs that may run at the same time
+        'max_running': 4,
+
+        # Databases worked on at once across all running tabs (shared connection pool)
+        'max_total_workers': 16,
+    }
+
+    # =============================================================================
+    # EVENT BUS SETTINGS
+    # =============================================================================
+
+    EVENTS = {
+        # Events waiting for the UI before producers block
+        'capacity': 2000,
+
+        # Types where a newer event replaces a pending one for the same database
+        'coalesce': ('status', 'db_progress'),
+
+        # Types discarded (and counted) instead of blocking when the bus is full
+        'droppable': ('status',),
+
+        # Seconds between checks while a producer waits for room
+        'put_poll_interval': 0.1,
+
+        # Events the UI handles per poll before letting Tk redraw
+        'max_batch': 500,
+
+        # Poll delay (ms) when the bus was drained / when events are still waiting
+        'poll_idle_ms': 100,
+        'poll_busy_ms': 5,
+    }
+
     # =============================================================================
     # FILE SETTINGS
     # =============================================================================
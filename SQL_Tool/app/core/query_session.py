@@ -0,0 +1,57 @@
+from app.database.query_executor import QueryExecutor
+from app.database.rollout import RolloutOrchestrator
+from app.database.schema_snapshot import SchemaSnapshotManager
+from app.utils.event_bus import EventBus
+
+
+class QuerySession:
+    """
+    One query tab: its own executor, event bus, results, log data and cancel switch.
+    Sessions share the app's DatabaseManager (and through it the connection pool),
+    journal, ledger and the app-wide worker limit.
+    """
+
+    def __init__(self, session_id, db_manager, journal, ledger, worker_limit=None):
+        self.id = session_id
+        self.name = f"Session {session_id}"
+        self.bus = EventBus()
+        self.executor = QueryExecutor(db_manager, self.bus, journal, ledger)
+        self.executor.worker_limit = worker_limit
+        self.rollout = RolloutOrchestrator(self.executor, self.bus)
+        self.schema_manager = SchemaSnapshotManager(db_manager, self.bus)
+        self.running = False
+        self.current_query = None   # query, databases, results ... of the last run (for the log)
+        self.result_store = None    # ResultStore of the last run
+        self.results_shown = 0      # results of the current run rendered into the console
+        self.profiler = None        # SamplingProfiler while a profiled run is in progress
+        self.tab = None             # SessionTab showing this session
+
+    @property
+    def metrics(self):
+        return self.executor.metrics
+
+    def begin_run(self):
+        """Mark the session busy for a new run; the previous run's cancel request is forgotten."""
+        self.running = True
+        self.executor.cancel_event.clear()
+        self.bus.reset_stats()
+
+    def cancel(self):
+        if self.running:
+            self.executor.cancel()
+
+    @property
+    def cancelling(self):
+        return self.running and self.executor.cancel_event.is_set()
+
+    def release_results(self, replacement=None):
+        """Close the last run's ResultStore (deleting its spill file) and use replacement instead."""
+        if self.result_store:
+            self.result_store.close()
+        self.result_store = replacement
+        self.executor.result_store = replacement
+
+    def close(self):
+        self.cancel()
+        self.bus.close()
+        self.release_results()
@@ -0,0 +1,57 @@
+"""
+Write-once, replay-many storage for row batches.
+
+A bulk load or copy into many databases reads its source a single time into a
+BatchSpool and replays the same batches for every database. Batches are pickled
+into a SpooledTemporaryFile, so a small source stays in memory and a large one
+moves to a temporary file once it passes the memory limit.
+"""
+
+import pickle
+import tempfile
+import threading
+
+
+class BatchSpool:
+    """Append batches once, then replay them in order any number of times, from any thread."""
+
+    def __init__(self, memory_bytes, spool_dir=None):
+        self._file = tempfile.SpooledTemporaryFile(max_size=memory_bytes, prefix="sqltool_batches_",
+                                                   dir=spool_dir)
+        self._index = []          # (offset, length) per batch
+        self._lock = threading.Lock()
+        self.rows = 0
+
+    def append(self, batch):
+        payload = pickle.dumps(batch, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._file.seek(0, 2)
+            self._index.append((self._file.tell(), len(payload)))
+            self._file.write(payload)
+            self.rows += len(batch)
+
+    def record(self, batches):
+        """Pass batches through unchanged while appending each one."""
+        for batch in batches:
+            self.append(batch)
+            yield batch
+
+    def replay(self):
+        """Yield the appended batches in order; each replay has its own position."""
+        for offset, length in list(self._index):
+            with self._lock:
+                self._file.seek(offset)
+                payload = self._file.read(length)
+            yield pickle.loads(payload)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+            self._index = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -0,0 +1,149 @@
+import os
+import re
+import csv
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import AppConfig
+from app.database.query_executor import QueryExecutor
+
+
+_LEADING_COMMENTS = re.compile(r"^(\s+|--[^\n]*\n?|/\*.*?\*/)+", re.S)
+_COPYABLE_START = re.compile(r"^(SELECT|WITH|VALUES|TABLE)\b", re.I)
+# SELECT ... INTO creates a table and data-modifying CTEs cannot run inside COPY
+_NOT_COPYABLE = re.compile(r"\b(INTO|INSERT|UPDATE|DELETE|MERGE)\b", re.I)
+
+
+def copy_eligible(query):
+    """
+    Return the single read-only statement in query if it can be wrapped in
+    COPY (...) TO STDOUT, otherwise None.
+    """
+    statements = QueryExecutor.split_statements(query)
+    if len(statements) != 1:
+        return None
+    statement = _LEADING_COMMENTS.sub("", statements[0]).strip().rstrip(";").strip()
+    if not _COPYABLE_START.match(statement) or _NOT_COPYABLE.search(statement):
+        return None
+    return statement
+
+
+class BulkExtractor:
+    """
+    Extract one SELECT from many databases into one file per database.
+
+    On engines with COPY support (PostgreSQL) an eligible query is wrapped in
+    COPY (...) TO STDOUT and the server's CSV or binary output is streamed straight
+    into the file, with no Python rows in between. Anything else - another engine,
+    a multi-statement script, COPY being refused - falls back to fetching batches
+    and writing them with the csv module.
+    """
+
+    def __init__(self, db_manager, message_queue=None):
+        self.db_manager = db_manager
+        self.message_queue = message_queue
+
+    def run(self, databases, query, output_dir=None, fmt=None, header=None, max_workers=None, use_copy=None):
+        """Returns {'exec_time', 'total_rows', 'total_bytes', 'databases': [per-database entry]}."""
+        settings = AppConfig.EXTRACT
+        output_dir = output_dir or settings['output_dir']
+        fmt = fmt or settings['format']
+        header = settings['header'] if header is None else header
+        max_workers = max(1, max_workers or settings['max_workers'])
+        use_copy = settings['use_copy'] if use_copy is None else use_copy
+        if fmt not in ("csv", "binary"):
+            raise ValueError(f"Unsupported extract format: {fmt}")
+        if not databases:
+            raise ValueError("No databases selected")
+        if not QueryExecutor.split_statements(query):
+            raise ValueError("No SQL statements to execute")
+
+        os.makedirs(output_dir, exist_ok=True)
+        copy_statement = copy_eligible(query) if use_copy and self.db_manager.driver.supports_copy else None
+        start_time = time.time()
+
+        def extract(db):
+            return self._extract_database(db, query, copy_statement, output_dir, fmt, header)
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(databases))) as pool:
+            entries = list(pool.map(extract, databases))
+
+        return {
+            "ok": all(entry["status"] == "Success" for entry in entries),
+            "exec_time": round(time.time() - start_time, 3),
+            "total_rows": sum(entry["rows"] or 0 for entry in entries),
+            "total_bytes": sum(entry["bytes"] for entry in entries),
+            "databases": entries,
+        }
+
+    def _extract_database(self, db, query, copy_statement, output_dir, fmt, header):
+        db_start_time = time.time()
+        entry = {"name": db, "status": "Success", "method": None, "format": fmt, "path": None,
+                 "rows": None, "bytes": 0, "exec_time": 0.0, "fallback_reason": None, "error": None}
+        driver = self.db_manager.driver
+        try:
+            with self.db_manager.database_connection(db) as conn:
+                if copy_statement is not None:
+                    path = self._output_path(output_dir, db, fmt)
+                    try:
+                        with open(path, "wb") as f:
+                            rows = driver.copy_to(conn, copy_statement, f, fmt, header)
+                        conn.commit()
+                        entry.update(method="copy", path=path, rows=rows if rows >= 0 else None)
+                    except driver.error_types as e:
+                        # COPY refused (permissions, unsupported construct): leave the aborted transaction
+                        conn.rollback()
+                        os.remove(path)
+                        entry["fallback_reason"] = str(e).strip()
+                        self._post_status(f"↩️ COPY not possible on {db}, fetching rows instead")
+                if entry["method"] is None:
+                    if fmt == "binary":
+                        entry["fallback_reason"] = entry["fallback_reason"] or "binary output needs COPY"
+                        entry["format"] = "csv"
+                    entry.update(self._fetch_to_csv(driver, conn, db, query, output_dir, header))
+        except Exception as e:
+            entry["status"] = "Error"
+            entry["error"] = str(e).strip()
+
+        if entry["path"] and os.path.exists(entry["path"]):
+            entry["bytes"] = os.path.getsize(entry["path"])
+        entry["exec_time"] = round(time.time() - db_start_time, 3)
+        if entry["status"] == "Success":
+            self._post_status(f"✅ {db}: {entry['rows'] if entry['rows'] is not None else '?'} rows "
+                              f"via {entry['method']} → {entry['path']}")
+        else:
+            self._post_status(f"❌ {db}: {entry['error']}")
+        return entry
+
+    def _fetch_to_csv(self, driver, conn, db, query, output_dir, header):
+        """Run the script and stream the last statement's result set to CSV in fetch batches."""
+        path = self._output_path(output_dir, db, "csv")
+        cursor = driver.cursor(conn)
+        rows = 0
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            for statement in QueryExecutor.split_statements(query):
+                cursor.execute(statement)
+                if not cursor.description:
+                    continue
+                # Each result set replaces the previous one; the file holds the last
+                f.seek(0)
+                f.truncate()
+                rows = 0
+                if header:
+                    writer.writerow([d[0] for d in cursor.description])
+                for batch in driver.fetch_batches(cursor, AppConfig.QUERY_BATCH_SIZE):
+                    writer.writerows(batch)
+                    rows += len(batch)
+                driver.drain_result_sets(cursor)
+        conn.commit()
+        return {"method": "fetch", "path": path, "rows": rows}
+
+    @staticmethod
+    def _output_path(output_dir, db, fmt):
+        safe_name = re.sub(r"[^\w.-]", "_", db)
+        return os.path.join(output_dir, f"{safe_name}.{'pgcopy' if fmt == 'binary' else 'csv'}")
+
+    def _post_status(self, message):
+        if self.message_queue:
+            self.message_queue.put(("status", message))
@@ -0,0 +1,132 @@
+import re
+import time
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import AppConfig
+from app.database.batch_spool import BatchSpool
+from app.utils.data_sources import open_rows
+
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][\w$]*(\.[A-Za-z_][\w$]*)*$|^(\[[^\]]+\]|\"[^\"]+\")(\.(\[[^\]]+\]|\"[^\"]+\"))*$")
+
+
+def batched(rows, size):
+    """Yield lists of up to size rows."""
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def checked_batches(rows, width, size):
+    """batched(), raising ValueError at the first row that does not have width values."""
+    for number, batch in enumerate(batched(rows, size)):
+        for offset, row in enumerate(batch):
+            if len(row) != width:
+                raise ValueError(f"Data row {number * size + offset + 1} has {len(row)} value(s), "
+                                 f"expected {width}")
+        yield batch
+
+
+class BulkLoader:
+    """
+    Load a CSV/Excel file into the same table on many databases. Rows go through the
+    driver's bulk path in batches: fast_executemany on pyodbc, COPY FROM STDIN on
+    PostgreSQL, executemany elsewhere. For several databases the file is parsed and
+    checked once into a BatchSpool before any database is touched, and every database
+    replays the same batches; a single database streams the file directly.
+    """
+
+    def __init__(self, db_manager, message_queue=None):
+        self.db_manager = db_manager
+        self.message_queue = message_queue
+
+    def run(self, databases, source_path, table, columns=None, sheet=None, batch_size=None, max_workers=None,
+            truncate=False, commit_per_batch=None):
+        """
+        columns: target column names in file order (default: the file's header row).
+        A row with the wrong number of values raises ValueError before any of several
+        databases is touched; a single-database load rolls back instead.
+        Returns {'ok', 'exec_time', 'total_rows', 'databases': [per-database entry]}.
+        """
+        settings = AppConfig.LOAD
+        batch_size = max(1, batch_size or settings['batch_size'])
+        max_workers = max(1, max_workers or settings['max_workers'])
+        commit_per_batch = settings['commit_per_batch'] if commit_per_batch is None else commit_per_batch
+        if not databases:
+            raise ValueError("No databases selected")
+
+        with open_rows(source_path, sheet) as (header, _):
+            columns = list(columns or header)
+        if not columns:
+            raise ValueError(f"No columns found in {source_path}")
+        for name in [table, *columns]:
+            if not _IDENTIFIER.match(name):
+                raise ValueError(f"Invalid table or column name: {name!r}")
+
+        start_time = time.time()
+        if len(databases) == 1:
+            self._post_status(f"📥 Loading {source_path} into {table} on {databases[0]}")
+            with open_rows(source_path, sheet) as (_, rows):
+                entries = [self._load_database(databases[0], checked_batches(rows, len(columns), batch_size),
+                                               table, columns, truncate, commit_per_batch)]
+        else:
+            with BatchSpool(settings['spool_memory_mb'] * 1024 * 1024, settings['spool_dir']) as spool:
+                self._post_status(f"📄 Reading {source_path}")
+                with open_rows(source_path, sheet) as (_, rows):
+                    for batch in checked_batches(rows, len(columns), batch_size):
+                        spool.append(batch)
+                self._post_status(f"📥 Loading {spool.rows:,} rows into {table} on {len(databases)} database(s)")
+
+                def load(db):
+                    return self._load_database(db, spool.replay(), table, columns, truncate, commit_per_batch)
+
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(databases))) as pool:
+                    entries = list(pool.map(load, databases))
+
+        return {
+            "ok": all(entry["status"] == "Success" for entry in entries),
+            "exec_time": round(time.time() - start_time, 3),
+            "total_rows": sum(entry["rows"] for entry in entries),
+            "databases": entries,
+        }
+
+    def _load_database(self, db, batches, table, columns, truncate, commit_per_batch):
+        db_start_time = time.time()
+        entry = {"name": db, "status": "Success", "rows": 0, "committed_rows": 0, "batches": 0,
+                 "exec_time": 0.0, "error": None}
+        driver = self.db_manager.driver
+        try:
+            with self.db_manager.database_connection(db) as conn:
+                try:
+                    if truncate:
+                        driver.cursor(conn).execute(f"DELETE FROM {table}")
+                    for batch in batches:
+                        entry["rows"] += driver.bulk_load(conn, table, columns, batch)
+                        entry["batches"] += 1
+                        if commit_per_batch:
+                            conn.commit()
+                            entry["committed_rows"] = entry["rows"]
+                        self._post_status(f"📥 {db}: {entry['rows']:,} rows")
+                    conn.commit()
+                    entry["committed_rows"] = entry["rows"]
+                except Exception:
+                    conn.rollback()
+                    raise
+        except Exception as e:
+            entry["status"] = "Error"
+            entry["error"] = str(e).strip()
+
+        entry["exec_time"] = round(time.time() - db_start_time, 3)
+        if entry["status"] == "Success":
+            self._post_status(f"✅ {db}: loaded {entry['rows']:,} rows in {entry['exec_time']:.2f}s")
+        else:
+            self._post_status(f"❌ {db}: {entry['error']}")
+        return entry
+
+    def _post_status(self, message):
+        if self.message_queue:
+            self.message_queue.put(("status", message))
@@ -1,57 +1,69 @@
 # YASH KADAV
 # yashkadav52@gmail.com
 
-import pyodbc
-import psycopg2 # 1. Import the new driver
 from contextlib import contextmanager
 
+from app.database.drivers import get_driver
+
 class DatabaseManager:
-    def __init__(self):
+    def __init__(self, pool=None):
         # Renamed for clarity
         self.current_config = None
+        # Optional shared ConnectionPool; connections are reused instead of reopened
+        self.pool = pool
+        self._driver = None
 
     # 2. FIX: Rename method and add 'db_type' parameter
-    def set_config(self, db_type, server, username, password):
+    def set_config(self, db_type, server, username, password, driver=None):
         self.current_config = {
             'db_type': db_type,
             'server': server,
             'username': username,
-            'password': password
+            'password': password,
+            'driver': driver
         }
+        self._driver = None
+
+    @property
+    def driver(self):
+        """Driver backend for the current engine (see app.database.drivers)."""
+        if not self.current_config:
+            raise ValueError("No server configuration available")
+        if self._driver is None:
+            self._driver = get_driver(self.current_config['db_type'], self.current_config.get('driver'))
+        return self._driver
 
     @contextmanager
     def database_connection(self, database=""):
         if not self.current_config:
             raise ValueError("No server configuration available")
 
-        cfg = self.current_config
+        if self.pool is not None:
+            with self.pool.connection(self, database) as conn:
+                yield conn
+            return
+
         conn = None
         try:
-            # 3. FIX: Add logic to handle both database types
-            if cfg['db_type'] == "SQL Server":
-                db = database or "master"
-                conn_str = (
-                    f"DRIVER={{SQL Server}};SERVER={cfg['server']};"
-                    f"DATABASE={db};UID={cfg['username']};"
-                    f"PWD={cfg['password']};TIMEOUT=10"
-                )
-                conn = pyodbc.connect(conn_str)
-            
-            elif cfg['db_type'] == "PostgreSQL":
-                db = database or "postgres"
-                conn = psycopg2.connect(
-                    host=cfg['server'],
-                    dbname=db,
-                    user=cfg['username'],
-                    password=cfg['password'],
-                    connect_timeout=10
-                )
-            
+            conn = self.open_connection(database)
             yield conn
         finally:
             if conn:
                 conn.close()
 
+    def open_connection(self, database=""):
+        """Open a new, unpooled connection; the caller owns closing it."""
+        if not self.current_config:
+            raise ValueError("No server configuration available")
+
+        driver = self.driver
+        return driver.connect(self.current_config, database or driver.default_database)
+
+    def pool_key(self, database=""):
+        """Identity of a connection target, used to share pooled connections."""
+        cfg = self.current_config
+        return (cfg['db_type'], cfg.get('driver'), cfg['server'], cfg['username'], database or "")
+
     def test_connection(self):
         try:
             with self.database_connection():
@@ -61,23 +73,9 @@ class DatabaseManager:
 
     def get_databases(self):
         """Get list of available databases."""
-        cfg = self.current_config
-        query = ""
-        
-        # 4. FIX: Use the correct SQL query based on the database type
-        if cfg['db_type'] == "SQL Server":
-            query = "SELECT name FROM sys.databases WHERE database_id > 4 AND state = 0 ORDER BY name"
-            default_db = "master"
-        elif cfg['db_type'] == "PostgreSQL":
-            query = "SELECT datname FROM pg_database WHERE datistemplate = false;"
-            default_db = "postgres"
-        else:
-            raise ValueError(f"Unsupported database type: {cfg['db_type']}")
+        driver = self.driver
 
         try:
-            with self.database_connection(database=default_db) as conn:
-                cursor = conn.cursor()
-                cursor.execute(query)
-                return [row[0] for row in cursor.fetchall()]
+            return driver.list_databases(self)
         except Exception as e:
             raise Exception(f"Failed to fetch databases: {e}")
\ No newline at end of file
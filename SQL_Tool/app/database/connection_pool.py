@@ -0,0 +1,104 @@
+import time
+import threading
+from contextlib import contextmanager
+
+from app.core.config import AppConfig
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of warm connections shared by several DatabaseManagers.
+    Connections are keyed by (db_type, server, username, database) and handed out
+    one caller at a time; a connection that fails to reset is closed instead of reused.
+    """
+
+    def __init__(self, max_idle_per_database=None, max_idle_total=None, idle_timeout=None):
+        settings = AppConfig.POOL
+        self.max_idle_per_database = max_idle_per_database or settings['max_idle_per_database']
+        self.max_idle_total = max_idle_total or settings['max_idle_total']
+        self.idle_timeout = idle_timeout or settings['idle_timeout']
+
+        self._idle = {}          # key -> list of (conn, released_at)
+        self._idle_count = 0
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.reused = 0
+
+    @contextmanager
+    def connection(self, db_manager, database=""):
+        """Borrow a connection for db_manager's server and the given database."""
+        key = db_manager.pool_key(database)
+        conn = self._take(key)
+        if conn is None:
+            conn = db_manager.open_connection(database)
+            with self._lock:
+                self.opened += 1
+        broken = False
+        try:
+            yield conn
+        except Exception:
+            broken = True
+            raise
+        finally:
+            self._give_back(key, conn, broken)
+
+    def _take(self, key):
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                conn, released_at = idle.pop()
+                self._idle_count -= 1
+                if now - released_at <= self.idle_timeout:
+                    self.reused += 1
+                    return conn
+                self._close(conn)
+        return None
+
+    def _give_back(self, key, conn, broken):
+        if conn is None:
+            return
+        if not broken:
+            try:
+                # Never hand an open transaction to the next borrower
+                conn.rollback()
+            except Exception:
+                broken = True
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if broken or len(idle) >= self.max_idle_per_database or self._idle_count >= self.max_idle_total:
+                self._close(conn)
+                return
+            idle.append((conn, time.monotonic()))
+            self._idle_count += 1
+
+    def prune(self):
+        """Close connections idle longer than idle_timeout."""
+        now = time.monotonic()
+        with self._lock:
+            for key, idle in self._idle.items():
+                keep = [(c, t) for c, t in idle if now - t <= self.idle_timeout]
+                for conn, t in idle:
+                    if now - t > self.idle_timeout:
+                        self._close(conn)
+                self._idle_count -= len(idle) - len(keep)
+                self._idle[key] = keep
+
+    def close_all(self):
+        with self._lock:
+            for idle in self._idle.values():
+                for conn, _ in idle:
+                    self._close(conn)
+            self._idle.clear()
+            self._idle_count = 0
+
+    def stats(self):
+        with self._lock:
+            return {"opened": self.opened, "reused": self.reused, "idle": self._idle_count}
+
+    @staticmethod
+    def _close(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
@@ -0,0 +1,263 @@
+import time
+import queue
+import threading
+
+from app.core.config import AppConfig
+from app.database.batch_spool import BatchSpool
+from app.database.bulk_loader import _IDENTIFIER
+
+
+_END = object()      # source exhausted: commit
+_ABORT = object()    # source failed: roll back
+
+
+class _Target:
+    """One destination database: its bounded batch queue and progress counters."""
+
+    def __init__(self, name, queue_depth):
+        self.name = name
+        self.batches = queue.Queue(maxsize=queue_depth)
+        self.failed = threading.Event()
+        self.entry = {"name": name, "status": "Success", "rows": 0, "batches": 0, "exec_time": 0.0, "error": None}
+
+
+class CopyPipeline:
+    """
+    Copy the result of one source query into a table on many target databases.
+
+    The source query runs once; every batch is handed to a bounded queue per target
+    and a writer thread per target pushes it through the driver's bulk path. A full
+    queue blocks the reader, so the slowest target sets the pace and memory stays at
+    queue_depth batches per target. Targets beyond max_targets are copied in later
+    waves that replay the batches the first wave spooled (BatchSpool). Each target
+    commits once, after the last batch; if the source fails every target rolls back.
+
+    Modes:
+      - 'append'  insert the rows
+      - 'replace' delete the existing rows and insert in the same transaction, so readers
+                  see either the old or the new table contents (truncate-and-swap)
+      - 'upsert'  delete rows with matching key columns, then insert, batch by batch
+    """
+
+    MODES = ("append", "replace", "upsert")
+
+    def __init__(self, source_manager, target_manager=None, message_queue=None):
+        self.source_manager = source_manager
+        self.target_manager = target_manager or source_manager
+        self.message_queue = message_queue
+
+    def run(self, source_db, query, targets, table, mode=None, keys=None, batch_size=None, queue_depth=None,
+            max_targets=None):
+        """Returns {'ok', 'exec_time', 'source_rows', 'total_rows', 'reader_wait', 'databases': [...]}."""
+        settings = AppConfig.COPY
+        mode = mode or settings['mode']
+        keys = list(keys or [])
+        batch_size = max(1, batch_size or settings['batch_size'])
+        queue_depth = max(1, queue_depth or settings['queue_depth'])
+        max_targets = max(1, max_targets or settings['max_targets'])
+
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown copy mode: {mode} (expected one of {', '.join(self.MODES)})")
+        if mode == "upsert" and not keys:
+            raise ValueError("Upsert needs at least one key column")
+        for name in [table, *keys]:
+            if not _IDENTIFIER.match(name):
+                raise ValueError(f"Invalid table or column name: {name!r}")
+        if self.target_manager is self.source_manager:
+            # Never copy a database onto itself
+            targets = [db for db in targets if db != source_db]
+        if not targets:
+            raise ValueError("No target databases selected")
+
+        start_time = time.time()
+        entries = []
+        source_rows = 0
+        reader_wait = 0.0
+        source_error = None
+        columns = []
+        columns_ready = threading.Event()
+        source = self._read_source(source_db, query, keys, batch_size, columns, columns_ready, len(targets))
+        waves = [targets[i:i + max_targets] for i in range(0, len(targets), max_targets)]
+        spool = None
+        if len(waves) > 1:
+            spool = BatchSpool(settings['spool_memory_mb'] * 1024 * 1024, settings['spool_dir'])
+        try:
+            for number, wave in enumerate(waves, 1):
+                if len(waves) > 1:
+                    self._post_status(f"🌊 Wave {number}/{len(waves)}: {len(wave)} target(s)")
+                if source_error:
+                    entries.extend(self._source_failed_entry(db, source_error) for db in wave)
+                    continue
+                if number == 1:
+                    batches = source if spool is None else spool.record(source)
+                else:
+                    batches = spool.replay()
+                # While spooling, the first wave reads the whole source even if all its targets fail
+                rows, waited, wave_entries, source_error = self._run_wave(
+                    wave, batches, table, columns, columns_ready, mode, keys, queue_depth,
+                    read_all=spool is not None and number == 1)
+                if number == 1:
+                    source_rows = rows
+                reader_wait += waited
+                entries.extend(wave_entries)
+        finally:
+            source.close()
+            if spool is not None:
+                spool.close()
+
+        return {
+            "ok": all(entry["status"] == "Success" for entry in entries),
+            "exec_time": round(time.time() - start_time, 3),
+            "source_rows": source_rows,
+            "total_rows": sum(entry["rows"] for entry in entries),
+            # Time the reader spent blocked on full target queues (backpressure)
+            "reader_wait": round(reader_wait, 3),
+            "databases": entries,
+        }
+
+    def _read_source(self, source_db, query, keys, batch_size, columns, columns_ready, target_count):
+        """Run the source query, fill columns (then set columns_ready) and yield its batches."""
+        driver = self.source_manager.driver
+        with self.source_manager.database_connection(source_db) as conn:
+            cursor = driver.cursor(conn)
+            cursor.execute(query)
+            if not cursor.description:
+                raise ValueError("Source query returned no result set")
+            columns.extend(d[0] for d in cursor.description)
+            for name in columns:
+                if not _IDENTIFIER.match(name):
+                    raise ValueError(f"Source column {name!r} is not a valid target column name")
+            missing = [k for k in keys if k not in columns]
+            if missing:
+                raise ValueError(f"Key column(s) not in the source result: {', '.join(missing)}")
+            columns_ready.set()
+            self._post_status(f"📤 Reading from {source_db} into {target_count} target(s)")
+            yield from driver.fetch_batches(cursor, batch_size)
+
+    def _run_wave(self, databases, batches, table, columns, columns_ready, mode, keys, queue_depth,
+                  read_all=False):
+        """Fan batches out to one wave of targets; returns (rows, reader_wait, entries, source_error)."""
+        targets = [_Target(db, queue_depth) for db in databases]
+
+        writers = [
+            threading.Thread(target=self._write_target, args=(t, table, columns, columns_ready, mode, keys),
+                             name=f"copy-{t.name}", daemon=True)
+            for t in targets
+        ]
+        for writer in writers:
+            writer.start()
+
+        source_rows = 0
+        waited = 0.0
+        source_error = None
+        end = _END
+        try:
+            for batch in batches:
+                source_rows += len(batch)
+                waited += self._fan_out(targets, batch)
+                if not read_all and all(t.failed.is_set() for t in targets):
+                    break
+        except Exception as e:
+            end = _ABORT
+            source_error = str(e).strip()
+            for t in targets:
+                if not t.failed.is_set():
+                    t.entry["error"] = f"Source: {source_error}"
+        finally:
+            columns_ready.set()
+            for t in targets:
+                self._put(t, end)
+            for writer in writers:
+                writer.join()
+
+        return source_rows, waited, [t.entry for t in targets], source_error
+
+    @staticmethod
+    def _source_failed_entry(db, source_error):
+        """Entry for a target in a wave that never started because the source failed."""
+        entry = _Target(db, 1).entry
+        entry.update(status="Error", error=f"Source: {source_error}")
+        return entry
+
+    def _fan_out(self, targets, batch):
+        """Queue a batch for every healthy target; returns seconds spent waiting on full queues."""
+        waited = 0.0
+        for t in targets:
+            if t.failed.is_set():
+                continue
+            if not t.batches.full():
+                t.batches.put(batch)
+                continue
+            blocked_at = time.perf_counter()
+            self._put(t, batch)
+            waited += time.perf_counter() - blocked_at
+        return waited
+
+    @staticmethod
+    def _put(target, item):
+        # A failed writer stops consuming; poll so the reader never blocks on it forever
+        while True:
+            if target.failed.is_set() and item is not _END and item is not _ABORT:
+                return
+            try:
+                target.batches.put(item, timeout=0.2)
+                return
+            except queue.Full:
+                if target.failed.is_set():
+                    return
+
+    def _write_target(self, target, table, columns, columns_ready, mode, keys):
+        start_time = time.time()
+        entry = target.entry
+        driver = self.target_manager.driver
+        try:
+            columns_ready.wait()
+            with self.target_manager.database_connection(target.name) as conn:
+                try:
+                    cursor = driver.cursor(conn)
+                    if mode == "replace":
+                        cursor.execute(f"DELETE FROM {table}")
+                    if mode == "upsert":
+                        condition = " AND ".join(f"{k} = {driver.placeholder}" for k in keys)
+                        delete_sql = f"DELETE FROM {table} WHERE {condition}"
+                        key_index = [columns.index(k) for k in keys]
+
+                    while True:
+                        batch = target.batches.get()
+                        if batch is _END:
+                            break
+                        if batch is _ABORT:
+                            raise RuntimeError(entry["error"] or "Source failed")
+                        if mode == "upsert":
+                            cursor.executemany(delete_sql, [tuple(row[i] for i in key_index) for row in batch])
+                        entry["rows"] += driver.bulk_load(conn, table, columns, batch)
+                        entry["batches"] += 1
+                        self._post_status(f"📥 {target.name}: {entry['rows']:,} rows")
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+        except Exception as e:
+            target.failed.set()
+            entry["status"] = "Error"
+            entry["error"] = entry["error"] or str(e).strip()
+            entry["rows"] = 0
+            self._drain(target)
+        entry["exec_time"] = round(time.time() - start_time, 3)
+        if entry["status"] == "Success":
+            self._post_status(f"✅ {target.name}: {entry['rows']:,} rows committed in {entry['exec_time']:.2f}s")
+        else:
+            self._post_status(f"❌ {target.name}: {entry['error']}")
+
+    @staticmethod
+    def _drain(target):
+        """Discard queued batches so the reader is never left blocked on this target."""
+        while True:
+            try:
+                target.batches.get_nowait()
+            except queue.Empty:
+                return
+
+    def _post_status(self, message):
+        if self.message_queue:
+            self.message_queue.put(("status", message))
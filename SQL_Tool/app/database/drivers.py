@@ -0,0 +1,398 @@
+"""
+Driver registry: one class per DB-API backend, imported lazily so only the drivers
+actually used need to be installed.
+
+    driver = get_driver("PostgreSQL")            # first available by AppConfig.DRIVERS preference
+    driver = get_driver("SQL Server", "pymssql") # a specific backend
+
+Everything engine- or driver-specific that QueryExecutor needs (error types, result-set
+draining, cursors, cancel, bulk fetch/load) lives here.
+"""
+
+import io
+import os
+import csv
+import glob
+import sqlite3
+import importlib
+import importlib.util
+import threading
+
+from app.core.config import AppConfig
+from app.database.result_set import ResultSet
+
+
+class Driver:
+    """Base class; subclasses set name/engine/module_name and override connect."""
+
+    name = None            # registry key, e.g. "pyodbc"
+    engine = None          # db_type served, e.g. "SQL Server"
+    module_name = None     # imported on first use
+    placeholder = "?"      # DB-API parameter marker
+    default_database = ""
+    supports_copy = False  # server-side COPY ... TO STDOUT (see copy_to)
+    LIST_DATABASES_QUERY = None
+
+    def __init__(self):
+        self._module = None
+
+    @classmethod
+    def is_available(cls):
+        return importlib.util.find_spec(cls.module_name) is not None
+
+    @property
+    def module(self):
+        if self._module is None:
+            self._module = importlib.import_module(self.module_name)
+        return self._module
+
+    @property
+    def error_types(self):
+        """Exception classes raised for database errors (caught per statement by the executor)."""
+        return (self.module.Error,)
+
+    def connect(self, cfg, database):
+        raise NotImplementedError
+
+    def cursor(self, conn):
+        return conn.cursor()
+
+    def list_databases(self, db_manager):
+        with db_manager.database_connection(self.default_database) as conn:
+            cursor = conn.cursor()
+            cursor.execute(self.LIST_DATABASES_QUERY)
+            return [row[0] for row in cursor.fetchall()]
+
+    def drain_result_sets(self, cursor):
+        """Skip any further result sets so the connection is ready for the next statement."""
+
+    def cancel(self, conn, cursor=None):
+        """Cancel the statement running on conn/cursor; returns False if the driver cannot."""
+        return False
+
+    def fetch_batches(self, cursor, size=1000):
+        """Yield lists of row tuples until the result set is exhausted."""
+        while True:
+            batch = cursor.fetchmany(size)
+            if not batch:
+                return
+            yield batch
+
+    def fetch_result_set(self, cursor, batch_size=1000, store=None, label=None):
+        """Fetch the current result set into a columnar ResultSet, or into store (a ResultStore) when given."""
+        columns = [d[0] for d in cursor.description]
+        if store is not None:
+            return store.add(columns, self.fetch_batches(cursor, batch_size), label)
+        return ResultSet.from_row_batches(columns, self.fetch_batches(cursor, batch_size))
+
+    def copy_to(self, conn, query, f, fmt="csv", header=True):
+        """Stream the result of query into binary file f with the server's bulk protocol; returns rows or -1."""
+        raise NotImplementedError(f"{self.name} has no COPY support")
+
+    def bulk_load(self, conn, table, columns, rows):
+        """Insert rows (sequence of tuples) into table; the caller commits. Returns the row count."""
+        rows = list(rows)
+        if not rows:
+            return 0
+        markers = ", ".join(self.placeholder for _ in columns)
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({markers})"
+        cursor = conn.cursor()
+        cursor.executemany(sql, rows)
+        return len(rows)
+
+    @staticmethod
+    def _nextset_drain(cursor):
+        nextset = getattr(cursor, "nextset", None)
+        if nextset is None:
+            return
+        try:
+            while nextset():
+                pass
+        except Exception:
+            # Some drivers raise instead of returning None when there are no more sets
+            pass
+
+
+# =============================================================================
+# SQL SERVER
+# =============================================================================
+
+class _SqlServerDriver(Driver):
+    engine = "SQL Server"
+    default_database = "master"
+    LIST_DATABASES_QUERY = "SELECT name FROM sys.databases WHERE database_id > 4 AND state = 0 ORDER BY name"
+
+    @staticmethod
+    def connection_string(cfg, database):
+        return (
+            f"DRIVER={{{AppConfig.DRIVERS['odbc_driver']}}};SERVER={cfg['server']};"
+            f"DATABASE={database};UID={cfg['username']};"
+            f"PWD={cfg['password']};TIMEOUT=10"
+        )
+
+
+class PyodbcDriver(_SqlServerDriver):
+    name = "pyodbc"
+    module_name = "pyodbc"
+
+    def connect(self, cfg, database):
+        return self.module.connect(self.connection_string(cfg, database))
+
+    def drain_result_sets(self, cursor):
+        while cursor.nextset():
+            pass
+
+    def cancel(self, conn, cursor=None):
+        if cursor is None:
+            return False
+        cursor.cancel()
+        return True
+
+    def bulk_load(self, conn, table, columns, rows):
+        rows = list(rows)
+        if not rows:
+            return 0
+        markers = ", ".join("?" for _ in columns)
+        cursor = conn.cursor()
+        # Sends parameters as one array instead of a round trip per row
+        cursor.fast_executemany = True
+        cursor.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({markers})", rows)
+        return len(rows)
+
+
+class PymssqlDriver(_SqlServerDriver):
+    name = "pymssql"
+    module_name = "pymssql"
+    placeholder = "%s"
+
+    def connect(self, cfg, database):
+        return self.module.connect(
+            server=cfg['server'], user=cfg['username'], password=cfg['password'],
+            database=database, login_timeout=10
+        )
+
+    def drain_result_sets(self, cursor):
+        self._nextset_drain(cursor)
+
+
+class TurbodbcDriver(_SqlServerDriver):
+    name = "turbodbc"
+    module_name = "turbodbc"
+
+    def connect(self, cfg, database):
+        return self.module.connect(connection_string=self.connection_string(cfg, database))
+
+    def drain_result_sets(self, cursor):
+        self._nextset_drain(cursor)
+
+    def fetch_result_set(self, cursor, batch_size=1000, store=None, label=None):
+        """Native columnar fetch: Arrow tables when pyarrow is installed, else NumPy batches."""
+        if not AppConfig.RESULTS['native_columnar'] or store is not None:
+            # A store chunks and spills by rows, so stream batches instead of one native table
+            return super().fetch_result_set(cursor, batch_size, store, label)
+        columns = [d[0] for d in cursor.description]
+        if importlib.util.find_spec("pyarrow") is not None:
+            import pyarrow
+            tables = list(cursor.fetcharrowbatches())
+            if tables:
+                return ResultSet.from_arrow(pyarrow.concat_tables(tables))
+            return ResultSet(columns, [[] for _ in columns], 0)
+        if importlib.util.find_spec("numpy") is not None:
+            return ResultSet.from_numpy_batches(columns, cursor.fetchnumpybatches())
+        return super().fetch_result_set(cursor, batch_size)
+
+
+# =============================================================================
+# POSTGRESQL
+# =============================================================================
+
+class _PostgresDriver(Driver):
+    engine = "PostgreSQL"
+    default_database = "postgres"
+    placeholder = "%s"
+    supports_copy = True
+    LIST_DATABASES_QUERY = "SELECT datname FROM pg_database WHERE datistemplate = false;"
+
+    def cancel(self, conn, cursor=None):
+        conn.cancel()
+        return True
+
+    @staticmethod
+    def copy_sql(query, fmt="csv", header=True):
+        if fmt == "binary":
+            return f"COPY ({query}) TO STDOUT WITH (FORMAT binary)"
+        return f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER {'true' if header else 'false'})"
+
+    @staticmethod
+    def copy_from_sql(table, columns):
+        # Only an unquoted \N is NULL, so quoted empty strings load as ''
+        return f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+
+
+class Psycopg2Driver(_PostgresDriver):
+    name = "psycopg2"
+    module_name = "psycopg2"
+
+    def connect(self, cfg, database):
+        return self.module.connect(
+            host=cfg['server'], dbname=database, user=cfg['username'],
+            password=cfg['password'], connect_timeout=10
+        )
+
+    def copy_to(self, conn, query, f, fmt="csv", header=True):
+        cursor = conn.cursor()
+        cursor.copy_expert(self.copy_sql(query, fmt, header), f, size=AppConfig.EXTRACT['copy_chunk_size'])
+        return cursor.rowcount
+
+    # Stands in for None while every real value is quoted; PostgreSQL text can never contain NUL
+    NULL_TOKEN = "\x00"
+
+    def bulk_load(self, conn, table, columns, rows):
+        """
+        COPY FROM STDIN with the batch rendered as CSV: None as an unquoted \\N, values quoted,
+        binary values in bytea hex format.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, quoting=csv.QUOTE_ALL)
+        count = 0
+        for row in rows:
+            writer.writerow([self._copy_value(value) for value in row])
+            count += 1
+        if not count:
+            return 0
+        data = io.StringIO(buffer.getvalue().replace(f'"{self.NULL_TOKEN}"', "\\N"))
+        conn.cursor().copy_expert(self.copy_from_sql(table, columns), data)
+        return count
+
+    @classmethod
+    def _copy_value(cls, value):
+        if value is None:
+            return cls.NULL_TOKEN
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            # str() would send the Python literal b'...'; CSV COPY takes bytea as \x<hex>
+            return "\\x" + bytes(value).hex()
+        return value
+
+
+class PsycopgDriver(_PostgresDriver):
+    """psycopg 3; cursors use the binary protocol when AppConfig.DRIVERS['psycopg_binary'] is set."""
+
+    name = "psycopg"
+    module_name = "psycopg"
+
+    def connect(self, cfg, database):
+        return self.module.connect(
+            host=cfg['server'], dbname=database, user=cfg['username'],
+            password=cfg['password'], connect_timeout=10
+        )
+
+    def cursor(self, conn):
+        if AppConfig.DRIVERS['psycopg_binary']:
+            return conn.cursor(binary=True)
+        return conn.cursor()
+
+    def drain_result_sets(self, cursor):
+        self._nextset_drain(cursor)
+
+    def copy_to(self, conn, query, f, fmt="csv", header=True):
+        cursor = conn.cursor()
+        with cursor.copy(self.copy_sql(query, fmt, header)) as copy:
+            for data in copy:
+                f.write(data)
+        return cursor.rowcount
+
+    def bulk_load(self, conn, table, columns, rows):
+        """COPY FROM STDIN; psycopg encodes each row itself, so NULLs and types survive as-is."""
+        count = 0
+        cursor = conn.cursor()
+        with cursor.copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+                count += 1
+        return count
+
+
+# =============================================================================
+# SQLITE (local benchmarking and tests)
+# =============================================================================
+
+class SqliteDriver(Driver):
+    """'server' is a directory; each database is the file <directory>/<database>.db."""
+
+    name = "sqlite3"
+    engine = "SQLite"
+    module_name = "sqlite3"
+
+    def connect(self, cfg, database):
+        directory = cfg['server']
+        if not os.path.isdir(directory):
+            raise sqlite3.OperationalError(f"SQLite directory not found: {directory}")
+        path = os.path.join(directory, f"{database}.db") if database else ":memory:"
+        return sqlite3.connect(path, timeout=10, check_same_thread=False)
+
+    def list_databases(self, db_manager):
+        directory = db_manager.current_config['server']
+        if not os.path.isdir(directory):
+            raise sqlite3.OperationalError(f"SQLite directory not found: {directory}")
+        return sorted(os.path.splitext(os.path.basename(p))[0] for p in glob.glob(os.path.join(directory, "*.db")))
+
+    def cancel(self, conn, cursor=None):
+        conn.interrupt()
+        return True
+
+
+# =============================================================================
+# REGISTRY
+# =============================================================================
+
+_REGISTRY = {}
+_instances = {}
+_lock = threading.Lock()
+
+
+def register_driver(driver_class):
+    """Add a Driver subclass to the registry (usable as a class decorator)."""
+    _REGISTRY[driver_class.name] = driver_class
+    return driver_class
+
+
+for _driver_class in (PyodbcDriver, PymssqlDriver, TurbodbcDriver, Psycopg2Driver, PsycopgDriver, SqliteDriver):
+    register_driver(_driver_class)
+
+
+def engines():
+    """Database types with at least one registered driver."""
+    return list(dict.fromkeys(cls.engine for cls in _REGISTRY.values()))
+
+
+def available_drivers(engine=None):
+    """Names of installed drivers, optionally for one engine."""
+    return [name for name, cls in _REGISTRY.items()
+            if (engine is None or cls.engine == engine) and cls.is_available()]
+
+
+def get_driver(engine, name=None):
+    """
+    Driver instance for engine: the named one, or the first installed driver in
+    AppConfig.DRIVERS['preference'] order. Raises ValueError when none can be used.
+    """
+    if name:
+        cls = _REGISTRY.get(name)
+        if cls is None or cls.engine != engine:
+            raise ValueError(f"Driver {name!r} does not support {engine}")
+        if not cls.is_available():
+            raise ValueError(f"Driver {name!r} is not installed")
+    else:
+        candidates = AppConfig.DRIVERS['preference'].get(engine)
+        if candidates is None:
+            candidates = [n for n, c in _REGISTRY.items() if c.engine == engine]
+        if not candidates:
+            raise ValueError(f"Unsupported database type: {engine}")
+        cls = next((_REGISTRY[n] for n in candidates if n in _REGISTRY and _REGISTRY[n].is_available()), None)
+        if cls is None:
+            raise ValueError(f"No driver installed for {engine} (tried {', '.join(candidates)})")
+
+    with _lock:
+        if cls.name not in _instances:
+            _instances[cls.name] = cls()
+        return _instances[cls.name]
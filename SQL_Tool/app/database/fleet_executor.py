@@ -0,0 +1,156 @@
+import time
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import AppConfig
+from app.database.statement_result import StatementResult
+
+
+class _FleetSlot:
+    """Worker slot that must be held both fleet-wide and on the database's own server."""
+
+    def __init__(self, fleet_limit, throttle=None):
+        self.fleet_limit = fleet_limit
+        self.throttle = throttle
+
+    @contextmanager
+    def slot(self):
+        # Server slot first: a throttled server's waiting threads must not hold fleet permits
+        if self.throttle is None:
+            with self.fleet_limit:
+                yield
+        else:
+            with self.throttle.slot(), self.fleet_limit:
+                yield
+
+
+class FleetExecutor:
+    """
+    Run one script across databases on several servers (mixed engines allowed) in a single run.
+    Every server gets its own QueryExecutor, worker cap and load-aware throttle; a fleet-wide
+    cap bounds the total number of open sessions.
+    """
+
+    def __init__(self, executors, message_queue):
+        # {server name: QueryExecutor bound to that server's DatabaseManager}
+        self.executors = executors
+        for server, executor in executors.items():
+            executor.progress_label = server
+        self.message_queue = message_queue
+
+    def run(self, targets, query, per_server_workers=None, max_total_workers=None, run_id=None,
+            track_migrations=False):
+        """
+        targets: {server name: [database, ...]}. Returns the execute_query-like dict with
+        databases_info entries named 'server:database' and a 'servers' breakdown.
+        """
+        settings = AppConfig.FLEET
+        per_server_workers = max(1, per_server_workers or settings['per_server_workers'])
+        max_total_workers = max(1, max_total_workers or settings['max_total_workers'])
+
+        targets = {server: dbs for server, dbs in targets.items() if dbs}
+        if not targets:
+            raise ValueError("No databases selected")
+        statements = next(iter(self.executors.values())).split_statements(query)
+
+        fleet_limit = threading.BoundedSemaphore(max_total_workers)
+        start_time = time.time()
+        for executor in self.executors.values():
+            executor.metrics.reset()
+        self._post_status(f"🌐 Fan-out to {sum(len(d) for d in targets.values())} database(s) "
+                          f"on {len(targets)} server(s)")
+
+        def run_server(server):
+            executor = self.executors[server]
+            databases = targets[server]
+            throttle = executor.create_throttle(per_server_workers, len(databases))
+            slots = _FleetSlot(fleet_limit, throttle)
+            try:
+                if throttle:
+                    throttle.start()
+                if per_server_workers <= 1 or len(databases) <= 1:
+                    # Serial on this server, but still counted against the fleet-wide cap
+                    infos = []
+                    for db in databases:
+                        with slots.slot():
+                            infos.extend(executor.run_on_databases([db], statements, 1, run_id, track_migrations))
+                else:
+                    infos = executor.run_on_databases(databases, statements, per_server_workers, run_id,
+                                                      track_migrations, slots)
+            except Exception as e:
+                infos = [self._server_error_info(db, e) for db in databases]
+                for info in infos:
+                    executor.report_database(info)
+            finally:
+                if throttle:
+                    throttle.stop()
+            self._post_status(f"✅ {server}: {sum(1 for i in infos if i['status'] != 'Error')}/"
+                              f"{len(infos)} database(s) succeeded")
+            return [self._label(info, server) for info in infos], throttle
+
+        with ThreadPoolExecutor(max_workers=len(targets)) as pool:
+            outcomes = dict(zip(targets, pool.map(run_server, targets)))
+
+        databases_info = [info for server in targets for info in outcomes[server][0]]
+        total_exec_time = time.time() - start_time
+        total_rows = sum(info["total_rows"] for info in databases_info)
+
+        servers = self._server_breakdown(targets, databases_info)
+        notes = [f"Servers             : {len(targets)}, up to {per_server_workers} worker(s) each, "
+                 f"{max_total_workers} fleet-wide"]
+        for server, stats in servers.items():
+            notes.append(f"Server {server:<13}: {stats['ok']} ok, {stats['failed']} failed, "
+                         f"{stats['exec_time']:.2f}s")
+        reference = next(iter(self.executors.values()))
+        notes.extend(reference._run_notes(databases_info) or [])
+        reference._send_results(databases_info, total_exec_time, total_rows, notes)
+
+        return {
+            "exec_time": total_exec_time,
+            "total_rows": total_rows,
+            "databases_info": databases_info,
+            "servers": servers,
+        }
+
+    @staticmethod
+    def _server_breakdown(targets, databases_info):
+        servers = {}
+        for server in targets:
+            infos = [info for info in databases_info if info["server"] == server]
+            servers[server] = {
+                "databases": len(infos),
+                "ok": sum(1 for info in infos if info["status"] != "Error"),
+                "failed": sum(1 for info in infos if info["status"] == "Error"),
+                "total_rows": sum(info["total_rows"] for info in infos),
+                # Wall time of the slowest database on this server
+                "exec_time": max((info["exec_time"] for info in infos), default=0.0),
+            }
+        return servers
+
+    @staticmethod
+    def _label(info, server):
+        info["database"] = info["name"]
+        info["name"] = f"{server}:{info['name']}"
+        info["server"] = server
+        return info
+
+    @staticmethod
+    def _server_error_info(db, error):
+        message = f"Server: {str(error).strip()}"
+        return {
+            "name": db,
+            "exec_time": 0.0,
+            "total_rows": 0,
+            "status": "Error",
+            "statement_count": 0,
+            "skipped_statements": 0,
+            "retries": 0,
+            "errors": [message],
+            "results_struct": [StatementResult(db, 0, f"\nError on {db}: {message}\n",
+                                               success=False, error=message)],
+        }
+
+    def _post_status(self, message):
+        if self.message_queue:
+            self.message_queue.put(("status", message))
@@ -0,0 +1,168 @@
+import math
+import time
+import threading
+from contextlib import contextmanager
+
+from app.core.config import AppConfig
+
+
+class AdaptiveThrottle:
+    """
+    Concurrency limit for database workers on one server, adjusted AIMD-style from
+    sampled server load: +1 worker while the server is healthy and the limit is in use,
+    multiplicative decrease as soon as it looks overloaded.
+    """
+
+    # (active requests, I/O-waiting sessions, CPUs)
+    LOAD_QUERIES = {
+        "SQL Server": (
+            "SELECT "
+            "(SELECT COUNT(*) FROM sys.dm_exec_requests WHERE session_id > 50 AND session_id <> @@SPID), "
+            "(SELECT COUNT(*) FROM sys.dm_exec_requests WHERE session_id > 50 AND session_id <> @@SPID "
+            "AND (wait_type LIKE 'PAGEIOLATCH%' OR wait_type IN ('WRITELOG', 'IO_COMPLETION', 'ASYNC_IO_COMPLETION'))), "
+            "(SELECT COUNT(*) FROM sys.dm_os_schedulers WHERE status = 'VISIBLE ONLINE')"
+        ),
+        "PostgreSQL": (
+            "SELECT "
+            "count(*) FILTER (WHERE state = 'active' AND pid <> pg_backend_pid()), "
+            "count(*) FILTER (WHERE state = 'active' AND wait_event_type = 'IO'), "
+            "NULL "
+            "FROM pg_stat_activity"
+        ),
+    }
+
+    # Cumulative wait time, sampled as a delta between readings (SQL Server only)
+    WAIT_STATS_QUERY = (
+        "SELECT SUM(wait_time_ms) FROM sys.dm_os_wait_stats "
+        "WHERE wait_type LIKE 'PAGEIOLATCH%' OR wait_type IN ('WRITELOG', 'IO_COMPLETION')"
+    )
+
+    def __init__(self, db_manager, max_workers=None, initial_workers=None, message_queue=None):
+        settings = AppConfig.THROTTLE
+        self.db_manager = db_manager
+        self.message_queue = message_queue
+        self.max_workers = max(1, max_workers or settings['max_workers'])
+        self.min_workers = max(1, min(settings['min_workers'], self.max_workers))
+        self.db_type = (db_manager.current_config or {}).get('db_type')
+        # Only an engine whose load can be sampled starts low and grows; the rest run at the ceiling
+        self.adaptive = settings['enabled'] and self.db_type in self.LOAD_QUERIES
+        start = (initial_workers or settings['initial_workers']) if self.adaptive else self.max_workers
+        self.limit = max(self.min_workers, min(start, self.max_workers))
+
+        self.in_use = 0
+        self.peak_limit = self.limit
+        self.lowest_limit = self.limit
+        self.peak_load = 0.0
+        self.samples = 0
+        self.sample_error = None
+        if settings['enabled'] and not self.adaptive:
+            self.sample_error = f"no load sampling for {self.db_type}"
+
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._sampler = None
+        self._last_wait = None
+
+    # ------------- Limiter -------------
+    @contextmanager
+    def slot(self):
+        """Hold one worker slot for the duration of the block."""
+        with self._cond:
+            while self.in_use >= self.limit:
+                self._cond.wait()
+            self.in_use += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self.in_use -= 1
+                self._cond.notify()
+
+    def _set_limit(self, new_limit):
+        with self._cond:
+            new_limit = max(self.min_workers, min(self.max_workers, new_limit))
+            if new_limit == self.limit:
+                return
+            self.limit = new_limit
+            self.peak_limit = max(self.peak_limit, new_limit)
+            self.lowest_limit = min(self.lowest_limit, new_limit)
+            self._cond.notify_all()
+        self._post_status(f"⚖️ Adjusted concurrency to {new_limit} worker(s)")
+
+    def _post_status(self, message):
+        if self.message_queue is not None:
+            self.message_queue.put(("status", message))
+
+    # ------------- Sampling -------------
+    def start(self):
+        if self.sample_error:
+            self._post_status(f"⚖️ Adaptive throttling off ({self.sample_error}); "
+                              f"running {self.limit} worker(s)")
+        if not self.adaptive or self.max_workers <= 1:
+            return self
+        self._sampler = threading.Thread(target=self._sample_loop, daemon=True)
+        self._sampler.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._sampler:
+            self._sampler.join(timeout=AppConfig.THROTTLE['sample_interval'] * 2)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def _sample_loop(self):
+        """Keep one monitoring connection open and adjust the limit after every sample."""
+        interval = AppConfig.THROTTLE['sample_interval']
+        try:
+            with self.db_manager.database_connection() as conn:
+                cursor = conn.cursor()
+                while not self._stop.wait(interval):
+                    self.adjust(*self._sample(cursor, self.db_type))
+        except Exception as e:
+            # Without load data (e.g. no VIEW SERVER STATE) fall back to the configured ceiling
+            self.sample_error = str(e).strip()
+            self._post_status(f"⚖️ Adaptive throttling off, load sampling failed: {self.sample_error[:80]}")
+            self._set_limit(self.max_workers)
+
+    def _sample(self, cursor, db_type):
+        """Return (active requests per CPU, I/O-waiting sessions per CPU)."""
+        cursor.execute(self.LOAD_QUERIES[db_type])
+        active, io_waiting, cpus = cursor.fetchone()
+        cpus = cpus or AppConfig.THROTTLE['assumed_cpus']
+
+        if db_type == "SQL Server":
+            cursor.execute(self.WAIT_STATS_QUERY)
+            total_wait = float(cursor.fetchone()[0] or 0)
+            now = time.monotonic()
+            if self._last_wait is not None:
+                waited_ms, elapsed_ms = total_wait - self._last_wait[0], (now - self._last_wait[1]) * 1000
+                # Average number of sessions stuck on I/O over the interval
+                io_waiting = max(io_waiting, waited_ms / elapsed_ms) if elapsed_ms > 0 else io_waiting
+            self._last_wait = (total_wait, now)
+
+        return active / cpus, io_waiting / cpus
+
+    def adjust(self, cpu_load, io_load):
+        """Apply one AIMD step for the given load sample."""
+        settings = AppConfig.THROTTLE
+        self.samples += 1
+        self.peak_load = max(self.peak_load, cpu_load)
+        if cpu_load > settings['cpu_high'] or io_load > settings['io_wait_high']:
+            self._set_limit(math.floor(self.limit * settings['decrease_factor']))
+        elif self.in_use >= self.limit:
+            self._set_limit(self.limit + 1)
+
+    def describe(self):
+        """One summary line for the execution report."""
+        line = (f"Adaptive Throttle   : {self.lowest_limit}-{self.peak_limit} worker(s) "
+                f"(ceiling {self.max_workers}), {self.samples} load sample(s), "
+                f"peak {self.peak_load:.2f} active/CPU")
+        if self.sample_error:
+            line += f", adaptive throttling off: {self.sample_error[:60]}"
+        return line
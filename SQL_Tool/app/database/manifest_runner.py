@@ -0,0 +1,211 @@
+import os
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from app.database.query_executor import QueryExecutor
+from app.utils.deployment_journal import ScopedJournal
+
+
+# {
+#     "name": "release-42",
+#     "databases": ["tenant_*"],
+#     "steps": [
+#         {"id": "schema",   "script": "01_schema.sql"},
+#         {"id": "backfill", "script": "02_backfill.sql", "after": ["schema"]},
+#         {"id": "indexes",  "script": "03_indexes.sql",  "after": ["schema"]},
+#         {"id": "verify",   "script": "04_verify.sql",   "after": ["backfill", "indexes"],
+#          "databases": ["tenant_a", "tenant_b"]}
+#     ]
+# }
+
+
+def load_manifest(path):
+    """
+    Read a manifest file and inline each step's script (paths are relative to the manifest).
+    Raises ValueError for unknown dependencies, duplicate ids or cycles.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    base_dir = os.path.dirname(os.path.abspath(path))
+
+    for step in manifest.get("steps", []):
+        if "sql" not in step:
+            if "script" not in step:
+                raise ValueError(f"Step {step.get('id')!r} needs a 'script' or 'sql'")
+            script_path = os.path.join(base_dir, step["script"])
+            with open(script_path, "r", encoding="utf-8-sig") as f:
+                step["sql"] = f.read()
+    validate_manifest(manifest)
+    return manifest
+
+
+def validate_manifest(manifest):
+    steps = manifest.get("steps")
+    if not steps:
+        raise ValueError("Manifest has no steps")
+
+    ids = [step.get("id") for step in steps]
+    if None in ids or len(set(ids)) != len(ids):
+        raise ValueError("Every step needs a unique 'id'")
+    for step in steps:
+        unknown = set(step.get("after", [])) - set(ids)
+        if unknown:
+            raise ValueError(f"Step {step['id']!r} depends on unknown step(s): {', '.join(sorted(unknown))}")
+        if not step.get("databases") and not manifest.get("databases"):
+            raise ValueError(f"Step {step['id']!r} has no target databases")
+
+    # Kahn's algorithm; anything left over sits on a cycle
+    remaining = {step["id"]: set(step.get("after", [])) for step in steps}
+    while remaining:
+        ready = [sid for sid, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Dependency cycle between steps: {', '.join(sorted(remaining))}")
+        for sid in ready:
+            del remaining[sid]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+
+class ManifestRunner:
+    """
+    Executes a manifest as a DAG of (step, database) nodes. A node waits only for its
+    prerequisite steps on the same database, so a fast database can finish its whole
+    pipeline while slower ones are still on earlier steps.
+    """
+
+    def __init__(self, query_executor, message_queue):
+        self.query_executor = query_executor
+        self.message_queue = message_queue
+
+    def run(self, manifest, targets, max_workers=4, run_id=None, track_migrations=False):
+        """
+        targets: {step_id: [database, ...]} already resolved by the caller.
+        Returns the execute_query-like dict; databases_info entries are named 'step:database'.
+        """
+        validate_manifest(manifest)
+        steps = {step["id"]: step for step in manifest["steps"]}
+        statements = {sid: QueryExecutor.split_statements(step["sql"]) for sid, step in steps.items()}
+        nodes, deps = self._build_graph(manifest["steps"], targets)
+        if not nodes:
+            raise ValueError("No databases selected")
+
+        executors = {sid: self._step_executor(sid) for sid in steps}
+        all_databases = list(dict.fromkeys(db for _, db in nodes))
+        throttle = self.query_executor.create_throttle(max_workers, len(all_databases))
+
+        start_time = time.time()
+        self.query_executor.metrics.reset()
+        self._post_status(f"📋 Manifest '{manifest.get('name', 'unnamed')}': "
+                          f"{len(steps)} step(s), {len(nodes)} step/database node(s)")
+        for sid, db in nodes:
+            executors[sid]._post_progress(db, "queued", statements=len(statements[sid]))
+
+        def run_node(node):
+            sid, db = node
+            self._post_status(f"▶️ {sid} on {db}")
+            info = executors[sid].run_on_databases([db], statements[sid], 1, run_id, track_migrations)[0]
+            return self._label(info, sid, db)
+
+        def run_throttled(node):
+            if throttle is None:
+                return run_node(node)
+            with throttle.slot():
+                return run_node(node)
+
+        results = {}
+        if throttle:
+            throttle.start()
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+                running = {}
+                waiting = list(nodes)
+                while waiting or running:
+                    for node in list(waiting):
+                        prerequisites = [results.get(dep) for dep in deps[node]]
+                        if any(info is None for info in prerequisites):
+                            continue
+                        waiting.remove(node)
+                        blocked = [info["step"] for info in prerequisites if not self._succeeded(info)]
+                        if blocked:
+                            sid, db = node
+                            note = f"\n⏭️  {sid} skipped on {db}: prerequisite {', '.join(blocked)} did not succeed\n"
+                            info = QueryExecutor._skipped_database_info(db, "Skipped", note)
+                            executors[sid].report_database(info)
+                            results[node] = self._label(info, sid, db)
+                        else:
+                            running[pool.submit(run_throttled, node)] = node
+                    if not running:
+                        continue
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        results[running.pop(future)] = future.result()
+        finally:
+            if throttle:
+                throttle.stop()
+
+        databases_info = [results[node] for node in nodes]
+        total_exec_time = time.time() - start_time
+        total_rows = sum(info["total_rows"] for info in databases_info)
+
+        notes = self._step_notes(manifest["steps"], databases_info)
+        notes.extend(self.query_executor._run_notes(databases_info) or [])
+        if throttle:
+            notes.append(throttle.describe())
+        self.query_executor._send_results(databases_info, total_exec_time, total_rows, notes)
+
+        return {
+            "exec_time": total_exec_time,
+            "total_rows": total_rows,
+            "databases_info": databases_info,
+        }
+
+    @staticmethod
+    def _build_graph(steps, targets):
+        """Nodes in manifest order, and each node's same-database prerequisites."""
+        nodes = []
+        deps = {}
+        for step in steps:
+            for db in targets.get(step["id"], []):
+                node = (step["id"], db)
+                nodes.append(node)
+                # A prerequisite step that does not target this database imposes no wait
+                deps[node] = [(after, db) for after in step.get("after", []) if db in targets.get(after, [])]
+        return nodes, deps
+
+    def _step_executor(self, step_id):
+        base = self.query_executor
+        journal = ScopedJournal(base.journal, step_id) if base.journal else None
+        executor = QueryExecutor(base.db_manager, base.message_queue, journal, base.ledger, base.retry_policy,
+                                 base.metrics, base.result_store)
+        executor.progress_label = step_id
+        return executor
+
+    @staticmethod
+    def _succeeded(info):
+        # 'Current' means the migration ledger already holds this step's script
+        return info["status"] in ("Success", "Current")
+
+    @staticmethod
+    def _label(info, step_id, db):
+        info["name"] = f"{step_id}:{db}"
+        info["step"] = step_id
+        info["database"] = db
+        return info
+
+    @staticmethod
+    def _step_notes(steps, databases_info):
+        notes = []
+        for step in steps:
+            infos = [info for info in databases_info if info["step"] == step["id"]]
+            if not infos:
+                continue
+            ok = sum(1 for info in infos if info["status"] in ("Success", "Current"))
+            failed = sum(1 for info in infos if info["status"] == "Error")
+            skipped = sum(1 for info in infos if info["status"] == "Skipped")
+            notes.append(f"Step {step['id']:<15}: {ok} ok, {failed} failed, {skipped} skipped")
+        return notes
+
+    def _post_status(self, message):
+        if self.message_queue:
+            self.message_queue.put(("status", message))
@@ -0,0 +1,134 @@
+import re
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import AppConfig
+
+
+class MigrationLedger:
+    """Per-database ledger of applied scripts, keyed by script checksum."""
+
+    # Engine-specific SQL; {table} is filled from AppConfig.MIGRATIONS
+    EXISTS_QUERIES = {
+        "SQL Server": "SELECT OBJECT_ID(N'dbo.{table}', N'U')",
+        "PostgreSQL": "SELECT to_regclass('public.{table}')",
+        "SQLite": "SELECT name FROM sqlite_master WHERE type = 'table' AND name = '{table}'",
+    }
+    SELECT_QUERIES = {
+        "SQL Server": "SELECT checksum FROM dbo.{table}",
+        "PostgreSQL": "SELECT checksum FROM public.{table}",
+        "SQLite": "SELECT checksum FROM {table}",
+    }
+    CREATE_QUERIES = {
+        "SQL Server": (
+            "IF OBJECT_ID(N'dbo.{table}', N'U') IS NULL "
+            "CREATE TABLE dbo.{table} ("
+            "checksum CHAR(64) NOT NULL PRIMARY KEY, "
+            "script_name NVARCHAR(260) NULL, "
+            "applied_at DATETIME2 NOT NULL DEFAULT SYSUTCDATETIME(), "
+            "applied_by NVARCHAR(128) NULL DEFAULT SUSER_SNAME())"
+        ),
+        "PostgreSQL": (
+            "CREATE TABLE IF NOT EXISTS public.{table} ("
+            "checksum CHAR(64) PRIMARY KEY, "
+            "script_name TEXT, "
+            "applied_at TIMESTAMPTZ NOT NULL DEFAULT now(), "
+            "applied_by TEXT DEFAULT current_user)"
+        ),
+        "SQLite": (
+            "CREATE TABLE IF NOT EXISTS {table} ("
+            "checksum CHAR(64) PRIMARY KEY, "
+            "script_name TEXT, "
+            "applied_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP, "
+            "applied_by TEXT)"
+        ),
+    }
+    INSERT_QUERIES = {
+        "SQL Server": (
+            "IF NOT EXISTS (SELECT 1 FROM dbo.{table} WHERE checksum = '{checksum}') "
+            "INSERT INTO dbo.{table} (checksum, script_name) VALUES ('{checksum}', {param})"
+        ),
+        "PostgreSQL": (
+            "INSERT INTO public.{table} (checksum, script_name) VALUES ('{checksum}', {param}) "
+            "ON CONFLICT (checksum) DO NOTHING"
+        ),
+        "SQLite": "INSERT OR IGNORE INTO {table} (checksum, script_name) VALUES ('{checksum}', {param})",
+    }
+
+    def __init__(self, db_manager, message_queue=None):
+        self.db_manager = db_manager
+        self.message_queue = message_queue
+
+    @staticmethod
+    def checksum(statements):
+        """Checksum of a script's statements, insensitive to whitespace and trailing semicolons."""
+        if isinstance(statements, str):
+            statements = [s for s in statements.split(";") if s.strip()]
+        normalized = ";".join(re.sub(r"\s+", " ", s).strip() for s in statements)
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    # ------------- Pre-check -------------
+    def applied_checksums(self, database):
+        """Return the set of checksums recorded in one database's ledger (empty if none)."""
+        db_type = self._db_type()
+        table = AppConfig.MIGRATIONS['table']
+        with self.db_manager.database_connection(database) as conn:
+            cursor = conn.cursor()
+            cursor.execute(self.EXISTS_QUERIES[db_type].format(table=table))
+            row = cursor.fetchone()
+            if not row or row[0] is None:
+                return set()
+            cursor.execute(self.SELECT_QUERIES[db_type].format(table=table))
+            return {str(r[0]).strip() for r in cursor.fetchall()}
+
+    def plan(self, databases, checksums):
+        """
+        Check every database's ledger in parallel.
+        Returns {checksum: [databases that still need it]}; unreachable databases count as pending.
+        """
+        def check(db):
+            try:
+                return db, self.applied_checksums(db)
+            except Exception:
+                return db, set()
+
+        workers = max(1, min(AppConfig.MIGRATIONS['max_workers'], len(databases)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            applied = dict(pool.map(check, databases))
+
+        return {c: [db for db in databases if c not in applied[db]] for c in checksums}
+
+    def pending_databases(self, databases, checksum):
+        """Databases from the list that have not yet applied the given script checksum."""
+        self._post_status(f"🔎 Checking migration ledger on {len(databases)} database(s)...")
+        return self.plan(databases, [checksum])[checksum]
+
+    # ------------- Recording -------------
+    def record_applied(self, database, checksum, script_name=None):
+        """Create the ledger table if needed and record the script as applied."""
+        if not re.fullmatch(r"[0-9a-f]{64}", checksum):
+            raise ValueError(f"Invalid script checksum: {checksum}")
+        db_type = self._db_type()
+        table = AppConfig.MIGRATIONS['table']
+        with self.db_manager.database_connection(database) as conn:
+            cursor = conn.cursor()
+            cursor.execute(self.CREATE_QUERIES[db_type].format(table=table))
+            cursor.execute(
+                self.INSERT_QUERIES[db_type].format(table=table, checksum=checksum,
+                                                    param=self.db_manager.driver.placeholder),
+                (script_name,)
+            )
+            conn.commit()
+
+    # ------------- Helpers -------------
+    def _db_type(self):
+        cfg = self.db_manager.current_config
+        if not cfg:
+            raise ValueError("No server configuration available")
+        if cfg['db_type'] not in self.EXISTS_QUERIES:
+            raise ValueError(f"Unsupported database type: {cfg['db_type']}")
+        return cfg['db_type']
+
+    def _post_status(self, message):
+        if self.message_queue is not None:
+            self.message_queue.put(("status", message))
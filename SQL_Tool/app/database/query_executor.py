@@ -1,16 +1,77 @@
 import time
-import pyodbc
-import psycopg2
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, nullcontext
 from datetime import datetime
 
+from app.core.config import AppConfig
+from app.database.retry_policy import RetryPolicy
+from app.database.load_throttle import AdaptiveThrottle
+from app.database.statement_result import StatementResult
+from app.utils.metrics import RunMetrics
+
 
 class QueryExecutor:
-    def __init__(self, db_manager, message_queue):
+    def __init__(self, db_manager, message_queue, journal=None, ledger=None, retry_policy=None, metrics=None,
+                 result_store=None):
         self.db_manager = db_manager
         self.message_queue = message_queue
+        self.journal = journal
+        self.ledger = ledger
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.metrics = metrics or RunMetrics()
+        # ResultStore that keeps every fetched result within a memory budget (None = not kept)
+        self.result_store = result_store
+        # Prefix for database names in progress events ('server' in fleets, 'step' in manifests)
+        self.progress_label = None
+        # Set by cancel(); cleared by whoever starts the next run
+        self.cancel_event = threading.Event()
+        # Semaphore shared with other executors to cap databases worked on app-wide (None = no cap)
+        self.worker_limit = None
+        self._active = {}   # thread id -> (conn, cursor) of statements in flight, for cancel()
+        self._active_lock = threading.Lock()
+
+    def execute_query(self, databases, query, max_workers=1, run_id=None, track_migrations=False):
+        """
+        Execute query against multiple databases and return aggregate info.
+        With a journal and run_id, progress is recorded and statements already
+        completed in that run are skipped (resume). With track_migrations, databases
+        whose migration ledger already holds the script checksum are skipped.
+        """
+        statements = self.split_statements(query)
+        if not databases:
+            raise ValueError("No databases selected")
+
+        start_time = time.time()
+        self.metrics.reset()
+        throttle = self.create_throttle(max_workers, len(databases))
+        if throttle:
+            with throttle:
+                databases_info = self.run_on_databases(databases, statements, max_workers, run_id,
+                                                       track_migrations, throttle)
+        else:
+            databases_info = self.run_on_databases(databases, statements, max_workers, run_id, track_migrations)
+        overall_total_rows = sum(db_info["total_rows"] for db_info in databases_info)
+
+        total_exec_time = time.time() - start_time
+
+        notes = self._run_notes(databases_info) or []
+        if throttle:
+            notes.append(throttle.describe())
+
+        # Send results to UI
+        self._send_results(databases_info, total_exec_time, overall_total_rows, notes)
 
-    def execute_query(self, databases, query):
-        """Execute query against multiple databases and return aggregate info."""
+        # Return full structure to controller
+        return {
+            "exec_time": total_exec_time,
+            "total_rows": overall_total_rows,
+            "databases_info": databases_info,  # includes results_struct for saving
+        }
+
+    @staticmethod
+    def split_statements(query):
+        """Normalize a query into a list of statements split by semicolon."""
         # Normalize query into string
         if isinstance(query, list):
             query = " ".join(query)
@@ -19,144 +80,364 @@ class QueryExecutor:
 
         if not query or not query.strip():
             raise ValueError("Query cannot be empty")
-        if not databases:
-            raise ValueError("No databases selected")
 
-        start_time = time.time()
-        overall_total_rows = 0
-        databases_info = []
-
-        # Split statements by semicolon
         statements = [s.strip() for s in query.split(";") if s.strip()]
         if not statements:
             raise ValueError("No valid SQL statements found")
+        return statements
+
+    def timing_notes(self):
+        """Phase breakdown lines for the execution summary header."""
+        breakdown = self.metrics.breakdown()
+        return ["", *breakdown.splitlines()] if breakdown else []
+
+    def create_throttle(self, max_workers, database_count):
+        """Load-aware limiter for a parallel run, or None when the run is serial."""
+        if max_workers <= 1 or database_count <= 1:
+            return None
+        return AdaptiveThrottle(self.db_manager, max_workers, message_queue=self.message_queue)
+
+    def run_on_databases(self, databases, statements, max_workers=1, run_id=None, track_migrations=False,
+                         throttle=None, after=None):
+        """
+        Run statements on each database, up to max_workers at a time; results keep input order.
+        A throttle further limits how many of those workers may be connected at once.
+        after(db_info), if given, runs in the same worker before the database is reported.
+        """
+        completed = self.journal.completed_statements(run_id) if self.journal and run_id else {}
+
+        # One parallel ledger pre-check up front so only out-of-date databases are touched
+        checksum = None
+        pending = set(databases)
+        if track_migrations and self.ledger:
+            checksum = self.ledger.checksum(statements)
+            pending = set(self.ledger.pending_databases(databases, checksum))
 
         for db in databases:
-            db_info = self._execute_on_database(db, statements)
-            databases_info.append(db_info)
-            overall_total_rows += db_info["total_rows"]
-
-        total_exec_time = time.time() - start_time
-
-        # Send results to UI
-        self._send_results(databases_info, total_exec_time, overall_total_rows)
-
-        # Return full structure to controller
+            self._post_progress(db, "queued", statements=len(statements))
+
+        def run(db):
+            if self.cancel_event.is_set():
+                db_info = self._skipped_database_info(db, "Cancelled", f"\n⏹️  Run cancelled before {db} started\n")
+            elif db not in pending:
+                note = f"\n⏭️  Script already applied on {db} (migration ledger)\n"
+                db_info = self._skipped_database_info(db, "Current", note)
+            else:
+                with self.worker_limit or nullcontext():
+                    db_info = self._execute_on_database(db, statements, run_id, completed.get(db))
+                if checksum and db_info["status"] == "Success":
+                    self._record_migration(db_info, checksum)
+            if after is not None:
+                after(db_info)
+            self.report_database(db_info)
+            return db_info
+
+        if max_workers <= 1 or len(databases) <= 1:
+            return [run(db) for db in databases]
+
+        def run_throttled(db):
+            if throttle is None:
+                return run(db)
+            with throttle.slot():
+                return run(db)
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(databases))) as pool:
+            return list(pool.map(run_throttled, databases))
+
+    def cancel(self):
+        """
+        Stop the current run: databases not started yet are skipped, running ones stop after
+        their current statement, which is itself cancelled where the driver supports it.
+        """
+        self.cancel_event.set()
+        driver = self.db_manager.driver
+        with self._active_lock:
+            active = list(self._active.values())
+        for conn, cursor in active:
+            try:
+                driver.cancel(conn, cursor)
+            except Exception:
+                pass  # best effort; the database still stops once the statement returns
+
+    def _track_active(self, conn, cursor):
+        key = threading.get_ident()
+        with self._active_lock:
+            self._active[key] = (conn, cursor)
+        return key
+
+    def _untrack_active(self, key):
+        with self._active_lock:
+            self._active.pop(key, None)
+
+    def _post_progress(self, db, state, **fields):
+        """Per-database progress for the live summary grid: ("db_progress", {database, state, ...})."""
+        name = f"{self.progress_label}:{db}" if self.progress_label else db
+        self.message_queue.put(("db_progress", {"database": name, "state": state, **fields}))
+
+    def report_database(self, db_info):
+        """Final progress event for a finished, skipped or re-checked database."""
+        state = {"Success": "done", "Error": "error"}.get(db_info["status"], db_info["status"].lower())
+        errors = db_info.get("errors") or []
+        self._post_progress(db_info["name"], state, statement=db_info.get("statement_count", 0),
+                            rows=db_info["total_rows"], exec_time=db_info["exec_time"],
+                            error=errors[0] if errors else None)
+
+    def _record_migration(self, db_info, checksum):
+        """Write the script checksum to the database's ledger; a failure marks the database as errored."""
+        db = db_info["name"]
+        try:
+            self.ledger.record_applied(db, checksum)
+        except Exception as e:
+            error = f"Ledger: {str(e).strip()}"
+            db_info["status"] = "Error"
+            db_info["errors"].append(error)
+            db_info["results_struct"].append(StatementResult(
+                db, 0, f"\nError recording migration on {db}: {str(e).strip()}\n", success=False, error=error
+            ))
+
+    @staticmethod
+    def _run_notes(databases_info):
+        """Summary header lines for resumed statements and ledger-skipped databases."""
+        notes = []
+        skipped = sum(db_info.get("skipped_statements", 0) for db_info in databases_info)
+        if skipped:
+            notes.append(f"Resumed Run         : {skipped} already-completed statement(s) skipped")
+        current = sum(1 for db_info in databases_info if db_info["status"] == "Current")
+        if current:
+            notes.append(f"Migration Ledger    : {current} database(s) already current, skipped")
+        return notes or None
+
+    @staticmethod
+    def _skipped_database_info(db, status, note, skipped_statements=0):
+        """Result entry for a database that was not executed against."""
         return {
-            "exec_time": total_exec_time,
-            "total_rows": overall_total_rows,
-            "databases_info": databases_info,  # includes results_struct for saving
+            "name": db,
+            "exec_time": 0.0,
+            "total_rows": 0,
+            "status": status,
+            "statement_count": 0,
+            "skipped_statements": skipped_statements,
+            "errors": [],
+            "results_struct": [StatementResult(db, 0, note)] if note else []
         }
 
-    def _execute_on_database(self, db, statements):
+    def _execute_on_database(self, db, statements, run_id=None, completed=None):
         """Run list of statements on one database and collect results."""
         db_start_time = time.time()
+        db_start_ns = time.perf_counter_ns()
         db_total_rows = 0
         db_errors = []
         db_statement_count = 0
-        db_results_text = []
         db_results_struct = []
+        completed = completed or set()
+        journal = self.journal if run_id else None
+        retry_counter = [0]
+        cancelled = False
+
+        if all(i in completed for i in range(1, len(statements) + 1)):
+            note = f"\n⏭️  All {len(statements)} statement(s) already completed on {db} in this run\n"
+            return self._skipped_database_info(db, "Success", note, len(statements))
 
         try:
+            driver = self.db_manager.driver
             self.message_queue.put(("status", f"🔄 Connecting to {db}..."))
+            self._post_progress(db, "connecting")
 
-            with self.db_manager.database_connection(db) as conn:
-                cursor = conn.cursor()
+            with ExitStack() as stack:
+                # The connection lives in its own stack so a dropped one can be replaced mid-script
+                conn_stack = stack.enter_context(ExitStack())
+                conn = self._connect_with_retry(db, conn_stack, retry_counter)
+                cursor = driver.cursor(conn)
+                stack.callback(self._untrack_active, self._track_active(conn, cursor))
 
                 for i, statement in enumerate(statements, 1):
+                    if i in completed:
+                        continue
+                    if self.cancel_event.is_set():
+                        cancelled = True
+                        break
                     db_statement_count += 1
-                    try:
-                        cursor.execute(statement)
-
-                        rows = []
-                        if cursor.description:
-                            while True:
-                                batch = cursor.fetchmany(1000)
-                                if not batch:
-                                    break
-                                rows.extend(batch)
-
-                        result_text = self._format_query_results(cursor, rows, db, i)
-                        db_results_text.append(result_text)
-
-                        db_results_struct.append({
-                            "database": db,
-                            "statement_num": i,
-                            "result": result_text,
-                            "success": True
-                        })
-
-                        if cursor.description:
-                            db_total_rows += len(rows)
-
-                        # FIX: This method only exists for pyodbc, not psycopg2.
-                        # Make it conditional to prevent errors.
-                        if isinstance(conn, pyodbc.Connection):
-                            while cursor.nextset():
+                    self._post_progress(db, "running", statement=i, statements=len(statements),
+                                        rows=db_total_rows, exec_time=time.time() - db_start_time)
+                    attempt = 1
+                    while True:
+                        try:
+                            result_set, rows_affected = self._run_statement(conn, cursor, statement, db, i)
+                            db_results_struct.append(self._statement_result(db, i, result_set, rows_affected))
+                            db_total_rows += len(result_set) if result_set is not None else 0
+
+                            if journal:
+                                journal.record_statement(run_id, db, i, True)
+                            break
+
+                        # Database errors of whichever driver backs this connection
+                        except driver.error_types as e:
+                            # Rollback the transaction on error (fails when the connection dropped)
+                            try:
+                                conn.rollback()
+                            except Exception:
                                 pass
-                        
-                        # FIX: Commit after each successful statement for correct behavior.
-                        conn.commit()
-
-                    # FIX: Catch errors from BOTH drivers for generic handling.
-                    except (pyodbc.Error, psycopg2.Error) as e:
-                        # Rollback the transaction on error
-                        if conn:
-                            conn.rollback()
-                            
-                        error_msg = f"\nError in Query {i} on {db}: {str(e).strip()}\n"
-                        db_results_text.append(error_msg)
-                        db_errors.append(f"Query {i}: {str(e).strip()}")
-                        db_results_struct.append({
-                            "database": db,
-                            "statement_num": i,
-                            "result": error_msg,
-                            "success": False,
-                            "error": str(e).strip()
-                        })
+
+                            if not self.cancel_event.is_set() and self.retry_policy.should_retry(e, attempt, statement):
+                                retry_counter[0] += 1
+                                self.message_queue.put((
+                                    "status",
+                                    f"🔁 Retrying Query {i} on {db} (attempt {attempt + 1}): {str(e).strip()[:80]}"
+                                ))
+                                self.retry_policy.wait(attempt)
+                                # Deadlock victims retry on the same connection; anything else
+                                # transient may have left it dead, so open a fresh one
+                                if self.retry_policy.classify(e) == "transient":
+                                    try:
+                                        conn.close()    # a closed connection is dropped, not pooled
+                                    except Exception:
+                                        pass
+                                    conn_stack.close()
+                                    conn = self._connect_with_retry(db, conn_stack, retry_counter)
+                                    cursor = driver.cursor(conn)
+                                    self._track_active(conn, cursor)
+                                attempt += 1
+                                continue
+
+                            error_msg = f"\nError in Query {i} on {db}: {str(e).strip()}\n"
+                            db_errors.append(f"Query {i}: {str(e).strip()}")
+                            db_results_struct.append(StatementResult(
+                                db, i, error_msg, success=False, error=str(e).strip()
+                            ))
+
+                            if journal:
+                                journal.record_statement(run_id, db, i, False, str(e).strip())
+                            break
 
         except Exception as e:
             error_msg = f"\nConnection error with {db}: {str(e).strip()}\n"
-            db_results_text.append(error_msg)
             db_errors.append(f"Connection: {str(e).strip()}")
-            db_results_struct.append({
-                "database": db, "statement_num": 0, "result": error_msg,
-                "success": False, "error": str(e).strip()
-            })
+            db_results_struct.append(StatementResult(db, 0, error_msg, success=False, error=str(e).strip()))
 
         db_exec_time = time.time() - db_start_time
+        self.metrics.record("database", time.perf_counter_ns() - db_start_ns, db, None, db_start_ns)
+        status = "Cancelled" if cancelled else "Success" if not db_errors else "Error"
+
+        if journal:
+            journal.record_database(run_id, db, status)
 
         return {
             "name": db,
             "exec_time": db_exec_time,
             "total_rows": db_total_rows,
-            "status": "Success" if not db_errors else "Error",
+            "status": status,
             "statement_count": db_statement_count,
+            "skipped_statements": len(completed),
+            "retries": retry_counter[0],
             "errors": db_errors,
-            "results": db_results_text,
             "results_struct": db_results_struct
         }
 
-    def _format_query_results(self, cursor, rows, db_name, statement_num):
-        """Format query results for display with enhanced tabular styling."""
-        if not cursor.description:
-            return (
+    def _connect_with_retry(self, db, stack, retry_counter):
+        """Open a connection inside stack, retrying transient failures with backoff."""
+        attempt = 1
+        while True:
+            try:
+                with self.metrics.span("connect", db):
+                    return stack.enter_context(self.db_manager.database_connection(db))
+            except Exception as e:
+                if not self.retry_policy.should_retry(e, attempt):
+                    raise
+                retry_counter[0] += 1
+                self.message_queue.put((
+                    "status", f"🔁 Reconnecting to {db} (attempt {attempt + 1}): {str(e).strip()[:80]}"
+                ))
+                self.retry_policy.wait(attempt)
+                attempt += 1
+
+    def _run_statement(self, conn, cursor, statement, db, statement_num):
+        """
+        Execute, fetch and commit one statement.
+        Returns (result_set, rows_affected); result_set is a columnar ResultSet (None without rows).
+        """
+        driver = self.db_manager.driver
+        span = self.metrics.span
+        with span("execute", db, statement_num):
+            cursor.execute(statement)
+
+        result_set = None
+        if cursor.description:
+            with span("fetch", db, statement_num):
+                result_set = driver.fetch_result_set(cursor, AppConfig.QUERY_BATCH_SIZE,
+                                                     self.result_store, (db, statement_num))
+
+        rows_affected = cursor.rowcount
+
+        with span("fetch", db, statement_num):
+            # Further result sets (multi-statement batches) are only exposed by some drivers
+            driver.drain_result_sets(cursor)
+
+        # FIX: Commit after each successful statement for correct behavior.
+        with span("commit", db, statement_num):
+            conn.commit()
+
+        return result_set, rows_affected
+
+    def _statement_result(self, db, statement_num, result_set, rows_affected):
+        """
+        Record for a successful statement; its text is rendered when it is first viewed or saved.
+        The render is capped at RESULTS['max_display_rows']; larger results also get an uncapped
+        export that logs and JSON output stream row by row.
+        """
+        keep = self.result_store is not None or AppConfig.RESULTS['keep_result_sets']
+        total_rows = len(result_set) if result_set is not None else None
+        if result_set is None:
+            title = f"Query {statement_num} executed on {db} (rows affected: {rows_affected})"
+        else:
+            title = f"Results from Query {statement_num} on {db} ({total_rows:,} rows)"
+
+        def render():
+            with self.metrics.span("format", db, statement_num):
+                return self._format_query_results(result_set, db, statement_num, rows_affected, total_rows)
+
+        export = None
+        if total_rows and total_rows > AppConfig.RESULTS['max_display_rows']:
+            def export():
+                return self._query_result_lines(result_set, db, statement_num, rows_affected, total_rows,
+                                                max_rows=total_rows)
+
+        return StatementResult(db, statement_num, result_set=result_set if keep else None, render=render,
+                               title=title, export=export)
+
+    def _format_query_results(self, result_set, db_name, statement_num, rows_affected=None, total_rows=None,
+                              max_rows=None):
+        """
+        Format query results for display with enhanced tabular styling, reading the columns directly.
+        result_set None means a statement without rows; total_rows defaults to len(result_set).
+        At most max_rows rows are rendered (default RESULTS['max_display_rows']).
+        """
+        return "\n".join(self._query_result_lines(result_set, db_name, statement_num, rows_affected, total_rows,
+                                                   max_rows))
+
+    def _query_result_lines(self, result_set, db_name, statement_num, rows_affected=None, total_rows=None,
+                            max_rows=None):
+        """Lines of _format_query_results, generated row by row so large exports never build one string."""
+        if result_set is None:
+            yield (
                 f"\n{'═' * 80}\n"
                 f"📋 Query {statement_num} executed on {db_name}\n"
                 f"{'═' * 80}\n"
-                f"✅ Rows affected: {cursor.rowcount}\n"
+                f"✅ Rows affected: {rows_affected}\n"
                 f"{'═' * 80}\n"
             )
+            return
 
-        column_names = [c[0] for c in cursor.description]
-        if not rows:
-            return (
+        column_names = result_set.columns
+        total_rows = len(result_set) if total_rows is None else total_rows
+        if not total_rows:
+            yield (
                 f"\n{'═' * 80}\n"
                 f"📋 Results from Query {statement_num} on {db_name}\n"
                 f"{'═' * 80}\n"
                 f"⚠️  No rows returned\n"
                 f"{'═' * 80}\n"
             )
+            return
 
         # Column width bounds
         min_width = 8
@@ -165,7 +446,7 @@ class QueryExecutor:
         # sample first 100 rows for performance
         for i, name in enumerate(column_names):
             name_w = len(str(name))
-            data_ws = [len(str(row[i])) for row in rows[:100]] if rows else [0]
+            data_ws = [len(str(v)) for v in result_set.column_values(i, 0, 100)]
             width = max(min_width, min(max_width, max(name_w, max(data_ws) if data_ws else 0)))
             col_widths.append(width)
 
@@ -174,32 +455,40 @@ class QueryExecutor:
             return text if len(text) <= width else text[: width - 3] + "..."
 
         header_line = f"\n{'═' * 100}\n"
-        title_line = f"📋 Results from Query {statement_num} on {db_name} (Showing {len(rows):,} rows)\n"
+        shown = min(total_rows, AppConfig.RESULTS['max_display_rows'] if max_rows is None else max_rows)
+        if shown < total_rows:
+            title_line = (f"📋 Results from Query {statement_num} on {db_name} "
+                          f"(Showing first {shown:,} of {total_rows:,} rows)\n")
+        else:
+            title_line = f"📋 Results from Query {statement_num} on {db_name} (Showing {total_rows:,} rows)\n"
         separator_line = f"{'═' * 100}\n"
 
         top = "┌" + "┬".join("─" * (w + 2) for w in col_widths) + "┐"
         hdr = "│ " + " │ ".join(str(n).ljust(w) for n, w in zip(column_names, col_widths)) + " │"
         mid = "├" + "┼".join("─" * (w + 2) for w in col_widths) + "┤"
 
-        body = []
-        for row in rows:
-            body.append("│ " + " │ ".join(trunc(v, w).ljust(w) for v, w in zip(row, col_widths)) + " │")
-
-        bot = "└" + "┴".join("─" * (w + 2) for w in col_widths) + "┘"
-        total_line = f"\n✅ Total rows: {len(rows):,}\n{'═' * 100}\n"
+        yield from (header_line, title_line, separator_line, top, hdr, mid)
+        for row in result_set.rows(0, shown):
+            yield "│ " + " │ ".join(trunc(v, w).ljust(w) for v, w in zip(row, col_widths)) + " │"
 
-        return "\n".join([header_line, title_line, separator_line, top, hdr, mid, *body, bot, total_line])
+        yield "└" + "┴".join("─" * (w + 2) for w in col_widths) + "┘"
+        yield f"\n✅ Total rows: {total_rows:,}\n{'═' * 100}\n"
 
-    def _send_results(self, databases_info, total_exec_time, overall_total_rows):
+    def _send_results(self, databases_info, total_exec_time, overall_total_rows, notes=None):
         """Send execution summary and results to the UI message queue."""
-        summary = self._generate_execution_summary(databases_info, total_exec_time, overall_total_rows)
+        self.metrics.mark_finished()
+        notes = [*(notes or []), *self.timing_notes()]
+        if self.result_store is not None:
+            notes.append(self.result_store.describe())
+        summary = self._generate_execution_summary(databases_info, total_exec_time, overall_total_rows, notes)
         self.message_queue.put(("execution_summary", summary))
         for db_info in reversed(databases_info):
-            for result in db_info["results"]:
-                self.message_queue.put(("result", result))
+            # The records themselves go on the queue; the UI decodes each one as it renders it
+            for item in db_info["results_struct"]:
+                self.message_queue.put(("result", item))
 
-    def _generate_execution_summary(self, databases_info, total_exec_time, overall_total_rows):
-        """Generate a compact execution summary table."""
+    def _generate_execution_summary(self, databases_info, total_exec_time, overall_total_rows, notes=None):
+        """Generate a compact execution summary table; notes are extra header lines."""
         lines = []
         lines.append("=" * 100)
         lines.append("EXECUTION SUMMARY")
@@ -207,13 +496,15 @@ class QueryExecutor:
         lines.append(f"Total Execution Time: {total_exec_time:.3f} seconds")
         lines.append(f"Overall Total Rows  : {overall_total_rows:,}")
         lines.append(f"Databases Processed : {len(databases_info)}")
+        lines.append(f"Retries             : {sum(db_info.get('retries', 0) for db_info in databases_info)}")
         lines.append(f"Executed At         : {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        lines.extend(notes or [])
         lines.append("")
         lines.append("DATABASE EXECUTION DETAILS")
         lines.append("=" * 100)
 
-        headers = ["Database", "Time(s)", "Rows", "Statements", "Status", "Errors"]
-        widths = [20, 10, 12, 12, 10, 30]
+        headers = ["Database", "Time(s)", "Rows", "Statements", "Retries", "Status", "Errors"]
+        widths = [20, 10, 12, 12, 9, 10, 30]
 
         hdr_row = "|" + "|".join(f" {h:<{w-1}}" for h, w in zip(headers, widths)) + "|"
         sep_row = "|" + "|".join("-" * w for w in widths) + "|"
@@ -227,6 +518,7 @@ class QueryExecutor:
                 f"{db_info['exec_time']:.3f}",
                 f"{db_info['total_rows']:,}",
                 str(db_info["statement_count"]),
+                str(db_info.get("retries", 0)),
                 db_info["status"],
                 ("None" if not db_info.get("errors") else
                  (db_info["errors"][0][:27] + "..." if len(db_info["errors"][0]) > 27 else db_info["errors"][0])
@@ -0,0 +1,171 @@
+"""
+Columnar query results.
+
+Rows are never kept as per-row tuples: each fetched batch is transposed into its
+columns straight away. Columns that are purely integer or float are packed into
+typed arrays (8 bytes per cell); other columns are plain lists of values. Drivers
+that can deliver Arrow or NumPy batches natively (turbodbc) hand those over as-is.
+pyarrow and numpy are optional.
+"""
+
+import csv
+import sys
+from array import array
+
+
+def _optional_import(name):
+    try:
+        return __import__(name)
+    except ImportError:
+        return None
+
+
+class ResultSet:
+    """Column-oriented result of one statement."""
+
+    def __init__(self, columns, data, num_rows, source="python"):
+        self.columns = list(columns)
+        self._data = data          # one sequence per column (typed array, list, numpy or Arrow array)
+        self.num_rows = num_rows
+        self.source = source       # "python", "numpy" or "arrow"
+
+    # ------------- Construction -------------
+    @classmethod
+    def from_row_batches(cls, columns, batches):
+        """Build from an iterable of row-tuple batches (DB-API fetchmany)."""
+        builders = [_ColumnBuilder() for _ in columns]
+        num_rows = 0
+        for batch in batches:
+            num_rows += len(batch)
+            for builder, values in zip(builders, zip(*batch)):
+                builder.extend(values)
+        return cls(columns, [b.finish() for b in builders], num_rows)
+
+    @classmethod
+    def from_arrow(cls, table):
+        """Wrap a pyarrow Table."""
+        columns = table.column_names
+        return cls(columns, [table.column(i) for i in range(len(columns))], table.num_rows, "arrow")
+
+    @classmethod
+    def from_numpy_batches(cls, columns, batches):
+        """Build from dicts or sequences of NumPy (masked) arrays, one entry per column per batch."""
+        np = _optional_import("numpy")
+        chunks = [[] for _ in columns]
+        for batch in batches:
+            values = batch.values() if isinstance(batch, dict) else batch
+            for chunk, arr in zip(chunks, values):
+                chunk.append(arr)
+        data = [np.ma.concatenate(c) if c else np.ma.array([]) for c in chunks]
+        return cls(columns, data, len(data[0]) if data else 0, "numpy")
+
+    # ------------- Access -------------
+    def __len__(self):
+        return self.num_rows
+
+    def column_index(self, column):
+        return column if isinstance(column, int) else self.columns.index(column)
+
+    def column(self, column):
+        """The stored column (typed array, list, numpy or Arrow array) by index or name."""
+        return self._data[self.column_index(column)]
+
+    def column_values(self, column, start=0, stop=None):
+        """Python values of one column slice."""
+        data = self.column(column)
+        stop = self.num_rows if stop is None else min(stop, self.num_rows)
+        if self.source == "arrow":
+            return data.slice(start, max(0, stop - start)).to_pylist()
+        if self.source == "numpy":
+            return data[start:stop].tolist()
+        return list(data[start:stop])
+
+    def rows(self, start=0, stop=None):
+        """Row tuples built lazily from column slices (for display and row-wise consumers)."""
+        stop = self.num_rows if stop is None else min(stop, self.num_rows)
+        step = 10000
+        for chunk_start in range(start, stop, step):
+            chunk_stop = min(chunk_start + step, stop)
+            columns = [self.column_values(i, chunk_start, chunk_stop) for i in range(len(self.columns))]
+            yield from zip(*columns)
+
+    def to_numpy(self, column):
+        """A column as a NumPy array (requires numpy)."""
+        np = _optional_import("numpy")
+        if np is None:
+            raise RuntimeError("numpy is not installed")
+        data = self.column(column)
+        if self.source == "arrow":
+            return data.to_numpy(zero_copy_only=False)
+        return np.asarray(data)
+
+    def nbytes(self):
+        """Approximate memory held by the column data."""
+        total = 0
+        for data in self._data:
+            if isinstance(data, array):
+                total += data.itemsize * len(data)
+            elif hasattr(data, "nbytes"):
+                total += data.nbytes
+            elif data:
+                # Lists of Python objects: extrapolate from a sample
+                sample = data[:1000]
+                per_value = sum(sys.getsizeof(v) for v in sample) / len(sample)
+                total += sys.getsizeof(data) + per_value * len(data)
+        return int(total)
+
+    # ------------- Export -------------
+    def write_csv(self, f, header=True):
+        """Write all rows as CSV to an open text file; returns the row count."""
+        if self.source == "arrow" and hasattr(f, "buffer"):
+            # Stays columnar end to end; Arrow writes to the underlying binary stream
+            import pyarrow
+            import pyarrow.csv
+            f.flush()
+            table = pyarrow.table(self._data, names=self.columns)
+            pyarrow.csv.write_csv(table, f.buffer, pyarrow.csv.WriteOptions(include_header=header))
+            return self.num_rows
+        writer = csv.writer(f)
+        if header:
+            writer.writerow(self.columns)
+        writer.writerows(self.rows())
+        return self.num_rows
+
+
+class _ColumnBuilder:
+    """Accumulates one column, packing it into a typed array while every value is int or float."""
+
+    __slots__ = ("values", "typecode")
+
+    KINDS = {"q": {int}, "d": {float}}
+
+    def __init__(self):
+        self.values = None
+        self.typecode = None
+
+    def extend(self, values):
+        kinds = set(map(type, values))
+        if self.values is None:
+            self.typecode = self._detect(kinds)
+            self.values = array(self.typecode) if self.typecode else []
+        if self.typecode and kinds == self.KINDS[self.typecode]:
+            try:
+                self.values.extend(array(self.typecode, values))
+                return
+            except OverflowError:
+                pass
+        if self.typecode:
+            # A NULL, string, differently typed or out-of-range value: fall back to a plain list
+            self.values = self.values.tolist()
+            self.typecode = None
+        self.values.extend(values)
+
+    @classmethod
+    def _detect(cls, kinds):
+        for typecode, expected in cls.KINDS.items():
+            if kinds == expected:
+                return typecode
+        return None
+
+    def finish(self):
+        return self.values if self.values is not None else []
@@ -0,0 +1,210 @@
+"""
+Memory-bounded storage for query results.
+
+Results are cut into chunks of AppConfig.RESULTS['chunk_rows'] rows, each a columnar
+ResultSet. All chunks of all results in a store share one memory budget; when it is
+exceeded, the least recently used chunks are pickled, zlib-compressed and appended to a
+temporary spill file. A spilled chunk is read back on demand, so the viewer can jump to
+any row range and export/logging can stream a result start to finish.
+"""
+
+import csv
+import zlib
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+
+from app.core.config import AppConfig
+from app.database.result_set import ResultSet
+
+
+class _Chunk:
+    __slots__ = ("start", "num_rows", "result_set", "nbytes", "offset", "length")
+
+    def __init__(self, start, result_set):
+        self.start = start
+        self.num_rows = len(result_set)
+        self.result_set = result_set      # None once spilled
+        self.nbytes = result_set.nbytes()
+        self.offset = None                # position in the spill file
+        self.length = None
+
+
+class StoredResult:
+    """One statement's result inside a ResultStore; reads like a ResultSet."""
+
+    def __init__(self, store, columns, label=None):
+        self.store = store
+        self.columns = list(columns)
+        self.label = label
+        self.chunks = []
+        self.num_rows = 0
+
+    def __len__(self):
+        return self.num_rows
+
+    def column_index(self, column):
+        return column if isinstance(column, int) else self.columns.index(column)
+
+    def _chunks_between(self, start, stop):
+        for chunk in self.chunks:
+            if chunk.start + chunk.num_rows <= start:
+                continue
+            if chunk.start >= stop:
+                return
+            yield chunk
+
+    def column_values(self, column, start=0, stop=None):
+        stop = self.num_rows if stop is None else min(stop, self.num_rows)
+        index = self.column_index(column)
+        values = []
+        for chunk in self._chunks_between(start, stop):
+            result_set = self.store.read(chunk)
+            values.extend(result_set.column_values(index, max(0, start - chunk.start), stop - chunk.start))
+        return values
+
+    def rows(self, start=0, stop=None):
+        """Row tuples for [start, stop), loading only the chunks that cover it."""
+        stop = self.num_rows if stop is None else min(stop, self.num_rows)
+        for chunk in self._chunks_between(start, stop):
+            result_set = self.store.read(chunk)
+            yield from result_set.rows(max(0, start - chunk.start), stop - chunk.start)
+
+    def nbytes(self):
+        """Bytes of this result currently held in memory."""
+        return sum(chunk.nbytes for chunk in self.chunks if chunk.result_set is not None)
+
+    def write_csv(self, f, header=True):
+        writer = csv.writer(f)
+        if header:
+            writer.writerow(self.columns)
+        writer.writerows(self.rows())
+        return self.num_rows
+
+
+class ResultStore:
+    """Holds StoredResults within a shared memory budget, spilling old chunks to a temp file."""
+
+    def __init__(self, budget_bytes=None, chunk_rows=None, spill_dir=None):
+        settings = AppConfig.RESULTS
+        self.budget_bytes = budget_bytes or settings['memory_budget_mb'] * 1024 * 1024
+        self.chunk_rows = chunk_rows or settings['chunk_rows']
+        self.spill_dir = spill_dir or settings['spill_dir']
+        self.compression = settings['spill_compression']
+        self.results = []
+        self.resident_bytes = 0
+        self.spilled_bytes = 0       # compressed bytes in the spill file
+        self.spilled_chunks = 0
+        self._resident = OrderedDict()   # id(chunk) -> chunk, least recently used first
+        self._lock = threading.RLock()
+        self._file = None
+
+    # ------------- Writing -------------
+    def add(self, columns, batches, label=None):
+        """Consume row batches (lists of tuples) into a new StoredResult."""
+        result = StoredResult(self, columns, label)
+        pending = []
+        pending_rows = 0
+        try:
+            for batch in batches:
+                pending.append(batch)
+                pending_rows += len(batch)
+                if pending_rows >= self.chunk_rows:
+                    self._append_chunk(result, ResultSet.from_row_batches(columns, pending))
+                    pending, pending_rows = [], 0
+            if pending or not result.chunks:
+                self._append_chunk(result, ResultSet.from_row_batches(columns, pending))
+        except Exception:
+            # A fetch that fails halfway (retried by the executor) must not leave a partial result
+            self.discard(result)
+            raise
+        with self._lock:
+            self.results.append(result)
+        return result
+
+    def add_result_set(self, result_set, label=None):
+        """Store an already fetched ResultSet (e.g. a native Arrow fetch) in chunk_rows pieces."""
+        batches = (list(result_set.rows(start, start + self.chunk_rows))
+                   for start in range(0, len(result_set), self.chunk_rows))
+        return self.add(result_set.columns, batches, label)
+
+    def _append_chunk(self, result, result_set):
+        chunk = _Chunk(result.num_rows, result_set)
+        result.chunks.append(chunk)
+        result.num_rows += chunk.num_rows
+        with self._lock:
+            self._resident[id(chunk)] = chunk
+            self.resident_bytes += chunk.nbytes
+            self._enforce_budget()
+
+    def discard(self, result):
+        with self._lock:
+            for chunk in result.chunks:
+                if self._resident.pop(id(chunk), None) is not None:
+                    self.resident_bytes -= chunk.nbytes
+            result.chunks = []
+            result.num_rows = 0
+            if result in self.results:
+                self.results.remove(result)
+
+    # ------------- Budget -------------
+    def _enforce_budget(self):
+        while self.resident_bytes > self.budget_bytes and self._resident:
+            _, chunk = self._resident.popitem(last=False)
+            self._spill(chunk)
+
+    def _spill(self, chunk):
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(prefix="sqltool_results_", dir=self.spill_dir)
+        result_set = chunk.result_set
+        columns = [result_set.column(i) if result_set.source == "python" else result_set.column_values(i)
+                   for i in range(len(result_set.columns))]
+        payload = zlib.compress(pickle.dumps(columns, pickle.HIGHEST_PROTOCOL), self.compression)
+        self._file.seek(0, 2)
+        chunk.offset = self._file.tell()
+        chunk.length = len(payload)
+        self._file.write(payload)
+        chunk.result_set = None
+        self.resident_bytes -= chunk.nbytes
+        self.spilled_bytes += chunk.length
+        self.spilled_chunks += 1
+
+    # ------------- Reading -------------
+    def read(self, chunk):
+        """The chunk's ResultSet, from memory or decoded from the spill file (not re-admitted)."""
+        with self._lock:
+            result_set = chunk.result_set
+            if result_set is not None:
+                self._resident.move_to_end(id(chunk))
+                return result_set
+            self._file.seek(chunk.offset)
+            payload = self._file.read(chunk.length)
+        columns = pickle.loads(zlib.decompress(payload))
+        header = [None] * len(columns)
+        return ResultSet(header, columns, chunk.num_rows)
+
+    def stats(self):
+        return {
+            "results": len(self.results),
+            "rows": sum(len(r) for r in self.results),
+            "resident_mb": round(self.resident_bytes / 1e6, 2),
+            "spilled_mb": round(self.spilled_bytes / 1e6, 2),
+            "spilled_chunks": self.spilled_chunks,
+            "budget_mb": round(self.budget_bytes / 1e6, 2),
+        }
+
+    def describe(self):
+        s = self.stats()
+        return (f"Result Store        : {s['rows']:,} row(s) in {s['results']} result(s), "
+                f"{s['resident_mb']:.1f} MB in memory, {s['spilled_mb']:.1f} MB spilled "
+                f"(budget {s['budget_mb']:.0f} MB)")
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._resident.clear()
+            self.results = []
+            self.resident_bytes = 0
@@ -0,0 +1,109 @@
+import re
+import time
+import random
+
+from app.core.config import AppConfig
+
+
+class RetryPolicy:
+    """
+    Decide whether a failed connection or statement is worth retrying, and how long to wait.
+    Errors are classified by driver error code: SQLSTATE (pyodbc args[0], psycopg2 pgcode,
+    psycopg 3 sqlstate) and the native SQL Server error number (pymssql args[0], or embedded
+    in the pyodbc message).
+    """
+
+    # The server rolled the statement's transaction back: safe to re-run it as a whole
+    ROLLBACK_CODES = {
+        "1205",     # SQL Server: deadlock victim
+        "40001",    # serialization failure
+        "40P01",    # PostgreSQL: deadlock detected
+    }
+
+    # Transient, but the server may or may not have applied the work
+    TRANSIENT_CODES = {
+        "08S01", "08001", "08003", "08004", "08006",    # connection failures
+        "HYT00", "HYT01",                               # ODBC timeouts
+        "57P01", "57P02", "57P03",                      # PostgreSQL: admin/crash shutdown, cannot connect now
+        "53300",                                        # PostgreSQL: too many connections
+        "-2", "53", "233", "10053", "10054", "10060",   # SQL Server: timeout / network
+        "40197", "40501", "40613", "49918", "49919",    # Azure SQL: service busy / unavailable
+    }
+
+    # Used only when a driver gives no code (e.g. psycopg2 connect errors)
+    TRANSIENT_MESSAGES = (
+        "timeout expired", "timed out", "could not connect", "connection refused",
+        "server closed the connection", "connection reset", "communication link failure",
+    )
+
+    READ_ONLY = re.compile(r"^\s*(select|with|show|explain)\b", re.IGNORECASE)
+    WRITES = re.compile(
+        r"\b(insert|update|delete|merge|into|create|alter|drop|truncate|exec|execute|call|grant|revoke)\b",
+        re.IGNORECASE,
+    )
+
+    def __init__(self, max_attempts=None, base_delay=None, max_delay=None, retry_rolled_back_writes=None):
+        settings = AppConfig.RETRY
+        self.max_attempts = max(1, max_attempts or settings['max_attempts'])
+        self.base_delay = settings['base_delay'] if base_delay is None else base_delay
+        self.max_delay = settings['max_delay'] if max_delay is None else max_delay
+        self.retry_rolled_back_writes = (
+            settings['retry_rolled_back_writes'] if retry_rolled_back_writes is None else retry_rolled_back_writes
+        )
+
+    # ------------- Classification -------------
+    @staticmethod
+    def error_codes(exc):
+        """All driver codes found on an exception: SQLSTATE and native error numbers."""
+        codes = set()
+        for attr in ("pgcode", "sqlstate"):
+            code = getattr(exc, attr, None)
+            if code:
+                codes.add(code)
+        args = getattr(exc, "args", ())
+        if args and isinstance(args[0], str) and re.fullmatch(r"[0-9A-Z]{5}", args[0]):
+            codes.add(args[0])
+        if args and isinstance(args[0], int):
+            codes.add(str(args[0]))
+        # pyodbc messages carry the native number as "... (1205) (SQLExecDirectW)"
+        codes.update(re.findall(r"\((-?\d+)\)\s*\(SQL\w+\)", str(exc)))
+        return codes
+
+    def classify(self, exc):
+        """Return 'rolled_back', 'transient' or 'permanent'."""
+        codes = self.error_codes(exc)
+        if codes & self.ROLLBACK_CODES:
+            return "rolled_back"
+        if codes & self.TRANSIENT_CODES:
+            return "transient"
+        message = str(exc).lower()
+        if any(marker in message for marker in self.TRANSIENT_MESSAGES):
+            return "transient"
+        return "permanent"
+
+    def is_read_only(self, statement):
+        return bool(self.READ_ONLY.match(statement)) and not self.WRITES.search(statement)
+
+    # ------------- Decisions -------------
+    def should_retry(self, exc, attempt, statement=None):
+        """
+        attempt is the 1-based attempt that just failed. Without a statement the failure
+        happened while connecting, before any work was sent, so it is always safe to retry.
+        Statements are retried only when re-running them cannot double-apply work: reads,
+        or writes the server reports as rolled back (each statement is its own transaction).
+        """
+        if attempt >= self.max_attempts:
+            return False
+        kind = self.classify(exc)
+        if kind == "permanent":
+            return False
+        if statement is None or self.is_read_only(statement):
+            return True
+        return kind == "rolled_back" and self.retry_rolled_back_writes
+
+    def delay(self, attempt):
+        """Full-jitter exponential backoff for the given failed attempt."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+    def wait(self, attempt):
+        time.sleep(self.delay(attempt))
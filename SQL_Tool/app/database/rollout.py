@@ -0,0 +1,168 @@
+import time
+
+from app.core.config import AppConfig
+from app.database.statement_result import StatementResult
+
+
+class RolloutOrchestrator:
+    """Deploy a script canary-first, then in waves that halt on a rising error rate."""
+
+    def __init__(self, query_executor, message_queue):
+        self.query_executor = query_executor
+        self.db_manager = query_executor.db_manager
+        self.message_queue = message_queue
+
+    def run(self, databases, query, canary_count=None, wave_size=None, max_workers=None,
+            error_threshold=None, post_checks=None, canaries=None, run_id=None, track_migrations=False):
+        """
+        Run query on databases in stages and return the same structure as execute_query.
+        canaries (explicit list) overrides canary_count; post_checks are SQL queries run
+        after the script on every database and must pass for that database to count as a success.
+        run_id is passed through to the executor's journal so a halted rollout can be resumed;
+        with track_migrations, databases already holding the script in their ledger are skipped.
+        """
+        settings = AppConfig.ROLLOUT
+        canary_count = settings['canary_count'] if canary_count is None else canary_count
+        wave_size = max(1, wave_size or settings['wave_size'])
+        max_workers = max(1, max_workers or settings['max_workers'])
+        error_threshold = settings['error_threshold'] if error_threshold is None else error_threshold
+        post_checks = [q for q in (post_checks or []) if q.strip()]
+
+        statements = self.query_executor.split_statements(query)
+        if not databases:
+            raise ValueError("No databases selected")
+
+        if canaries:
+            canary_dbs = [db for db in databases if db in canaries]
+        else:
+            canary_dbs = list(databases[:canary_count])
+        remaining = [db for db in databases if db not in canary_dbs]
+        waves = [remaining[i:i + wave_size] for i in range(0, len(remaining), wave_size)]
+
+        start_time = time.time()
+        self.query_executor.metrics.reset()
+        results = {}
+        notes = []
+        halted_reason = None
+
+        # One throttle across all stages so the learned limit carries over between waves
+        throttle = self.query_executor.create_throttle(max_workers, len(databases))
+        if throttle:
+            throttle.start()
+        try:
+            halted_reason = self._run_stages(canary_dbs, waves, statements, max_workers, error_threshold,
+                                             post_checks, run_id, track_migrations, throttle, results, notes)
+        finally:
+            if throttle:
+                throttle.stop()
+
+        notes.append(f"Waves               : {len(waves)} x up to {wave_size} database(s), "
+                     f"{max_workers} in parallel")
+        if throttle:
+            notes.append(throttle.describe())
+        if halted_reason:
+            notes.append(f"ROLLOUT HALTED      : {halted_reason}")
+            self._post_status(f"⛔ Rollout halted: {halted_reason}")
+
+        databases_info = [results.get(db) or self._skipped_info(db) for db in databases]
+        notes.extend(self.query_executor._run_notes(databases_info) or [])
+        total_exec_time = time.time() - start_time
+        overall_total_rows = sum(db_info["total_rows"] for db_info in databases_info)
+
+        self.query_executor._send_results(databases_info, total_exec_time, overall_total_rows, notes)
+
+        return {
+            "exec_time": total_exec_time,
+            "total_rows": overall_total_rows,
+            "databases_info": databases_info,
+            "halted": bool(halted_reason),
+            "halted_reason": halted_reason,
+        }
+
+    def _run_stages(self, canary_dbs, waves, statements, max_workers, error_threshold, post_checks,
+                    run_id, track_migrations, throttle, results, notes):
+        """Run canary then waves, filling results and notes; returns the halt reason or None."""
+        stage_args = (statements, max_workers, post_checks, run_id, track_migrations, throttle)
+
+        if canary_dbs:
+            self._post_status(f"🐤 Canary: running on {len(canary_dbs)} database(s)...")
+            canary_info = self._run_stage(canary_dbs, *stage_args)
+            results.update(canary_info)
+            failed = [db for db, info in canary_info.items() if info["status"] == "Error"]
+            notes.append(f"Canary              : {', '.join(canary_dbs)} "
+                         f"({'passed' if not failed else 'FAILED'})")
+            if failed:
+                return f"canary failed on {', '.join(failed)}"
+
+        finished = 0
+        failures = 0
+        for wave_num, wave in enumerate(waves, 1):
+            if self.query_executor.cancel_event.is_set():
+                return "cancelled by user"
+            self._post_status(f"🌊 Wave {wave_num}/{len(waves)}: running on {len(wave)} database(s)...")
+            wave_info = self._run_stage(wave, *stage_args)
+            results.update(wave_info)
+
+            finished += len(wave)
+            failures += sum(1 for info in wave_info.values() if info["status"] == "Error")
+            error_rate = failures / finished
+            if error_rate > error_threshold:
+                return f"error rate {error_rate:.0%} exceeded {error_threshold:.0%} after wave {wave_num}"
+        return None
+
+    def _run_stage(self, databases, statements, max_workers, post_checks, run_id=None, track_migrations=False,
+                   throttle=None):
+        """
+        Run the script on one stage; each database's post-checks run in the same worker
+        right after its script, so they share the stage's parallelism. Returns {database: db_info}.
+        """
+        def after(db_info):
+            if db_info["status"] in ("Success", "Current"):
+                self._apply_post_checks(db_info, post_checks)
+
+        infos = self.query_executor.run_on_databases(databases, statements, max_workers, run_id,
+                                                     track_migrations, throttle,
+                                                     after=after if post_checks else None)
+        return {db_info["name"]: db_info for db_info in infos}
+
+    def _apply_post_checks(self, db_info, post_checks):
+        """
+        Run post-check queries on a database over one connection. A check fails when it
+        errors, returns no row, or when its first returned value is NULL, zero or false.
+        """
+        db = db_info["name"]
+        failures = []
+        try:
+            with self.db_manager.database_connection(db) as conn:
+                for num, check in enumerate(post_checks, 1):
+                    try:
+                        cursor = conn.cursor()
+                        cursor.execute(check)
+                        row = cursor.fetchone() if cursor.description else None
+                        if row is None:
+                            failures.append((num, "returned no rows" if cursor.description
+                                             else "returned no result set"))
+                        elif not row[0]:
+                            failures.append((num, f"returned {row[0]!r}"))
+                    except Exception as e:
+                        failures.append((num, str(e).strip()))
+        except Exception as e:
+            # No connection: every check not yet judged fails with the connection error
+            judged = {num for num, _ in failures}
+            failures.extend((num, str(e).strip()) for num in range(1, len(post_checks) + 1)
+                            if num not in judged)
+
+        for num, detail in sorted(failures):
+            error = f"Post-check {num} failed: {detail}"
+            db_info["status"] = "Error"
+            db_info["errors"].append(error)
+            db_info["results_struct"].append(StatementResult(db, 0, f"\n❌ {error} on {db}\n",
+                                                             success=False, error=error))
+
+    def _skipped_info(self, db):
+        info = self.query_executor._skipped_database_info(db, "Skipped", None)
+        self.query_executor.report_database(info)
+        return info
+
+    def _post_status(self, message):
+        self.message_queue.put(("status", message))
@@ -0,0 +1,402 @@
+import os
+import re
+import json
+import hashlib
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from app.core.config import AppConfig
+
+
+class SchemaSnapshotManager:
+    """Fingerprint database schemas concurrently and diff them against a baseline."""
+
+    # Bumped whenever fingerprints change shape; caches and baselines of other versions are reread
+    FINGERPRINT_VERSION = 2
+
+    # One row per user object: (object id, schema, name, type, modification stamp)
+    STAMP_QUERIES = {
+        # Index and constraint changes are folded into their table's stamp (count + newest change)
+        "SQL Server": (
+            "SELECT o.object_id, s.name, o.name, o.type, CONVERT(varchar(30), o.modify_date, 126) "
+            "+ ':' + CAST((SELECT COUNT(*) FROM sys.indexes i WHERE i.object_id = o.object_id) AS varchar(10)) "
+            "+ ':' + ISNULL((SELECT CAST(COUNT(*) AS varchar(10)) + '/' + CONVERT(varchar(30), MAX(k.modify_date), 126) "
+            "FROM sys.objects k WHERE k.parent_object_id = o.object_id), '') "
+            "FROM sys.objects o JOIN sys.schemas s ON s.schema_id = o.schema_id "
+            "WHERE o.is_ms_shipped = 0 AND o.type IN ('U', 'V', 'P', 'FN', 'IF', 'TF', 'TR')"
+        ),
+        # pg_class has no modify date; the row versions of the relation, its attributes,
+        # indexes and constraints change on every DDL touching them, which is all we need.
+        "PostgreSQL": (
+            "SELECT c.oid, n.nspname, c.relname, c.relkind::text, "
+            "c.xmin::text || ':' || COALESCE((SELECT max(a.xmin::text::bigint) FROM pg_catalog.pg_attribute a "
+            "WHERE a.attrelid = c.oid)::text, '') "
+            "|| ':' || (SELECT count(*)::text || '/' || COALESCE(max(GREATEST(x.xmin::text::bigint, "
+            "ic.xmin::text::bigint))::text, '') FROM pg_catalog.pg_index x "
+            "JOIN pg_catalog.pg_class ic ON ic.oid = x.indexrelid WHERE x.indrelid = c.oid) "
+            "|| ':' || (SELECT count(*)::text || '/' || COALESCE(max(k.xmin::text::bigint)::text, '') "
+            "FROM pg_catalog.pg_constraint k WHERE k.conrelid = c.oid) "
+            "FROM pg_catalog.pg_class c JOIN pg_catalog.pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE n.nspname NOT IN ('pg_catalog', 'information_schema') AND n.nspname !~ '^pg_toast' "
+            "AND c.relkind IN ('r', 'v', 'm', 'p') "
+            "UNION ALL "
+            "SELECT p.oid, n.nspname, p.proname || '(' || pg_catalog.pg_get_function_identity_arguments(p.oid) || ')', "
+            "'f', p.xmin::text "
+            "FROM pg_catalog.pg_proc p JOIN pg_catalog.pg_namespace n ON n.oid = p.pronamespace "
+            "WHERE n.nspname NOT IN ('pg_catalog', 'information_schema') AND p.prokind <> 'a'"
+        ),
+    }
+
+    # Column definitions for tables/views, restricted to an id list
+    COLUMN_QUERIES = {
+        "SQL Server": (
+            "SELECT c.object_id, c.column_id, c.name, t.name, c.max_length, c.precision, c.scale, "
+            "c.is_nullable, ISNULL(dc.definition, '') "
+            "FROM sys.columns c JOIN sys.types t ON t.user_type_id = c.user_type_id "
+            "LEFT JOIN sys.default_constraints dc ON dc.object_id = c.default_object_id "
+            "WHERE c.object_id IN ({ids})"
+        ),
+        "PostgreSQL": (
+            "SELECT a.attrelid, a.attnum, a.attname, pg_catalog.format_type(a.atttypid, a.atttypmod), "
+            "a.attnotnull, COALESCE(pg_catalog.pg_get_expr(d.adbin, d.adrelid), '') "
+            "FROM pg_catalog.pg_attribute a "
+            "LEFT JOIN pg_catalog.pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum "
+            "WHERE a.attnum > 0 AND NOT a.attisdropped AND a.attrelid IN ({ids})"
+        ),
+    }
+
+    # Indexes and constraints of tables: (table id, kind, name, definition)
+    INDEX_QUERIES = {
+        # Primary keys and unique constraints are covered by their indexes
+        "SQL Server": (
+            "SELECT i.object_id, 'index', i.name, i.type_desc "
+            "+ CASE WHEN i.is_primary_key = 1 THEN ' PRIMARY KEY' WHEN i.is_unique_constraint = 1 THEN ' UNIQUE CONSTRAINT' "
+            "WHEN i.is_unique = 1 THEN ' UNIQUE' ELSE '' END + ' (' + ISNULL(STUFF((SELECT ',' + c.name "
+            "+ CASE WHEN ic.is_descending_key = 1 THEN ' DESC' ELSE '' END "
+            "+ CASE WHEN ic.is_included_column = 1 THEN ' INCLUDE' ELSE '' END "
+            "FROM sys.index_columns ic JOIN sys.columns c ON c.object_id = ic.object_id AND c.column_id = ic.column_id "
+            "WHERE ic.object_id = i.object_id AND ic.index_id = i.index_id "
+            "ORDER BY ic.key_ordinal, ic.index_column_id FOR XML PATH('')), 1, 1, ''), '') + ')' "
+            "+ ISNULL(' WHERE ' + i.filter_definition, '') "
+            "FROM sys.indexes i WHERE i.type > 0 AND i.object_id IN ({ids}) "
+            "UNION ALL "
+            "SELECT cc.parent_object_id, 'check', cc.name, cc.definition "
+            "FROM sys.check_constraints cc WHERE cc.parent_object_id IN ({ids}) "
+            "UNION ALL "
+            "SELECT fk.parent_object_id, 'foreign key', fk.name, "
+            "OBJECT_SCHEMA_NAME(fk.referenced_object_id) + '.' + OBJECT_NAME(fk.referenced_object_id) + ' (' "
+            "+ ISNULL(STUFF((SELECT ',' + COL_NAME(fkc.parent_object_id, fkc.parent_column_id) + '>' "
+            "+ COL_NAME(fkc.referenced_object_id, fkc.referenced_column_id) FROM sys.foreign_key_columns fkc "
+            "WHERE fkc.constraint_object_id = fk.object_id ORDER BY fkc.constraint_column_id FOR XML PATH('')), 1, 1, ''), '') "
+            "+ ') ON DELETE ' + fk.delete_referential_action_desc + ' ON UPDATE ' + fk.update_referential_action_desc "
+            "FROM sys.foreign_keys fk WHERE fk.parent_object_id IN ({ids})"
+        ),
+        "PostgreSQL": (
+            "SELECT x.indrelid, 'index', ic.relname, pg_catalog.pg_get_indexdef(x.indexrelid) "
+            "FROM pg_catalog.pg_index x JOIN pg_catalog.pg_class ic ON ic.oid = x.indexrelid "
+            "WHERE x.indrelid IN ({ids}) "
+            "UNION ALL "
+            "SELECT k.conrelid, 'constraint', k.conname, pg_catalog.pg_get_constraintdef(k.oid) "
+            "FROM pg_catalog.pg_constraint k WHERE k.conrelid IN ({ids})"
+        ),
+    }
+
+    # Source text of views, procedures, functions and triggers
+    DEFINITION_QUERIES = {
+        "SQL Server": "SELECT m.object_id, m.definition FROM sys.sql_modules m WHERE m.object_id IN ({ids})",
+        "PostgreSQL": (
+            "SELECT c.oid, pg_catalog.pg_get_viewdef(c.oid) FROM pg_catalog.pg_class c "
+            "WHERE c.relkind IN ('v', 'm') AND c.oid IN ({ids}) "
+            "UNION ALL "
+            "SELECT p.oid, pg_catalog.pg_get_functiondef(p.oid) FROM pg_catalog.pg_proc p "
+            "WHERE p.oid IN ({ids})"
+        ),
+    }
+
+    def __init__(self, db_manager, message_queue=None):
+        self.db_manager = db_manager
+        self.message_queue = message_queue
+
+    # ------------- Snapshots -------------
+    def snapshot_databases(self, databases):
+        """Snapshot several databases concurrently; returns {database: snapshot}."""
+        snapshots = {}
+        workers = max(1, min(AppConfig.SCHEMA['max_workers'], len(databases)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(self.snapshot_database, db): db for db in databases}
+            for future in as_completed(futures):
+                db = futures[future]
+                try:
+                    snapshots[db] = future.result()
+                except Exception as e:
+                    snapshots[db] = {"error": str(e).strip(), "objects": {}}
+                self._post_status(f"🧬 Schema read for {db} ({len(snapshots)}/{len(databases)})")
+        return snapshots
+
+    def snapshot_database(self, database):
+        """
+        Fingerprint every user object of one database.
+        Only objects whose modification stamp differs from the cached snapshot are reread.
+        """
+        db_type = self._db_type()
+        cache = self._load_cache(database)
+        cached = cache.get("objects", {}) if cache.get("version") == self.FINGERPRINT_VERSION else {}
+
+        with self.db_manager.database_connection(database) as conn:
+            cursor = conn.cursor()
+            cursor.execute(self.STAMP_QUERIES[db_type])
+            current = {}
+            for object_id, schema, name, obj_type, stamp in cursor.fetchall():
+                key = f"{schema}.{name}"
+                current[key] = {"id": object_id, "type": str(obj_type).strip(), "stamp": str(stamp)}
+
+            stale = [
+                key for key, obj in current.items()
+                if key not in cached
+                or cached[key].get("stamp") != obj["stamp"]
+                or cached[key].get("type") != obj["type"]
+            ]
+            details = self._read_details(cursor, db_type, [current[k]["id"] for k in stale])
+
+        stale_keys = set(stale)
+        objects = {}
+        for key, obj in current.items():
+            if key in stale_keys:
+                columns, definition, parts = details.get(obj["id"], ([], "", []))
+                obj["fingerprint"] = self._fingerprint(obj["type"], columns, definition, parts)
+            else:
+                obj["fingerprint"] = cached[key]["fingerprint"]
+            objects[key] = obj
+
+        snapshot = {
+            "version": self.FINGERPRINT_VERSION,
+            "db_type": db_type,
+            "taken_at": datetime.now().isoformat(timespec="seconds"),
+            "objects": objects,
+            "reread": len(stale),
+        }
+        self._save_cache(database, snapshot)
+        return snapshot
+
+    def _read_details(self, cursor, db_type, object_ids):
+        """Read columns, definitions, indexes and constraints: {id: (columns, definition, parts)}."""
+        details = {oid: ([], "", []) for oid in object_ids}
+        chunk = AppConfig.SCHEMA['detail_chunk_size']
+        for start in range(0, len(object_ids), chunk):
+            ids = ", ".join(str(int(oid)) for oid in object_ids[start:start + chunk])
+
+            cursor.execute(self.COLUMN_QUERIES[db_type].format(ids=ids))
+            for row in cursor.fetchall():
+                details[row[0]][0].append(tuple(str(v) for v in row[1:]))
+
+            cursor.execute(self.DEFINITION_QUERIES[db_type].format(ids=ids))
+            for object_id, definition in cursor.fetchall():
+                columns, _, parts = details[object_id]
+                details[object_id] = (columns, definition or "", parts)
+
+            cursor.execute(self.INDEX_QUERIES[db_type].format(ids=ids))
+            for row in cursor.fetchall():
+                details[row[0]][2].append(tuple(str(v) for v in row[1:]))
+        return details
+
+    @staticmethod
+    def _fingerprint(obj_type, columns, definition, parts=()):
+        """
+        Stable hash of an object's shape: columns, source text (whitespace normalized)
+        and, for tables, indexes and constraints.
+        """
+        normalized = re.sub(r"\s+", " ", definition).strip().lower()
+        payload = json.dumps([obj_type, sorted(columns), normalized, sorted(parts)], separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+    # ------------- Drift -------------
+    def check_drift(self, databases, baseline=None):
+        """
+        Snapshot databases and diff each one against a baseline.
+        baseline may be a database name; otherwise the stored baseline is used (refreshed
+        from its database when it was fingerprinted by an older version), or the first
+        database with a usable snapshot becomes (and is saved as) the baseline.
+        Returns (report_text, drift) where drift maps database -> differences.
+        """
+        if not databases:
+            raise ValueError("No databases selected")
+
+        stored = {} if baseline else self.load_baseline()
+        refresh = bool(stored) and stored.get("version") != self.FINGERPRINT_VERSION
+        if refresh:
+            baseline, stored = stored.get("database"), {}
+
+        targets = list(databases)
+        if baseline and baseline not in targets:
+            targets.insert(0, baseline)
+        snapshots = self.snapshot_databases(targets)
+
+        if stored:
+            base_label = f"{stored.get('database')} (saved {stored.get('taken_at')})"
+            base_objects = stored.get("objects", {})
+        else:
+            if baseline:
+                self._check_usable(baseline, snapshots[baseline])
+                if refresh:
+                    self.save_baseline(baseline, snapshots[baseline])
+            else:
+                # Never let a failed or empty first snapshot become the permanent baseline
+                baseline = next((db for db in databases if self._usable(snapshots[db])), None)
+                if baseline is None:
+                    raise ValueError("No database returned a usable schema snapshot to use as the baseline")
+                self.save_baseline(baseline, snapshots[baseline])
+            base_label, base_objects = baseline, snapshots[baseline]["objects"]
+
+        drift = {}
+        for db in databases:
+            snap = snapshots[db]
+            if snap.get("error"):
+                drift[db] = {"error": snap["error"]}
+                continue
+            drift[db] = self.diff_objects(base_objects, snap.get("objects", {}))
+
+        return self._generate_drift_report(base_label, drift, snapshots), drift
+
+    @staticmethod
+    def diff_objects(base_objects, objects):
+        """Compare two {key: object} maps by fingerprint."""
+        return {
+            "missing": sorted(k for k in base_objects if k not in objects),
+            "extra": sorted(k for k in objects if k not in base_objects),
+            "changed": sorted(
+                k for k in base_objects
+                if k in objects and base_objects[k]["fingerprint"] != objects[k]["fingerprint"]
+            ),
+        }
+
+    def _generate_drift_report(self, base_label, drift, snapshots):
+        """Build the drift report shown in the results console."""
+        lines = []
+        lines.append("=" * 100)
+        lines.append("SCHEMA DRIFT REPORT")
+        lines.append("=" * 100)
+        lines.append(f"Baseline            : {base_label}")
+        lines.append(f"Databases Checked   : {len(drift)}")
+        lines.append(f"Executed At         : {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        lines.append("")
+
+        headers = ["Database", "Objects", "Reread", "Missing", "Extra", "Changed", "Status"]
+        widths = [20, 10, 10, 10, 10, 10, 26]
+        sep_row = "|" + "|".join("-" * w for w in widths) + "|"
+        lines.append("|" + "|".join(f" {h:<{w-1}}" for h, w in zip(headers, widths)) + "|")
+        lines.append(sep_row)
+
+        details = []
+        for db, diff in drift.items():
+            snap = snapshots.get(db, {})
+            if "error" in diff:
+                row_vals = [db[:19], "-", "-", "-", "-", "-", ("Error: " + diff["error"])[:25]]
+            else:
+                drifted = any(diff.values())
+                row_vals = [
+                    db[:19], len(snap.get("objects", {})), snap.get("reread", 0),
+                    len(diff["missing"]), len(diff["extra"]), len(diff["changed"]),
+                    "DRIFT" if drifted else "In sync",
+                ]
+                if drifted:
+                    details.append(f"\n{db}:")
+                    for kind in ("missing", "extra", "changed"):
+                        for key in diff[kind]:
+                            details.append(f"  {kind:<8} {key}")
+            lines.append("|" + "|".join(f" {str(v):<{w-1}}" for v, w in zip(row_vals, widths)) + "|")
+
+        lines.append(sep_row)
+        if details:
+            lines.append("")
+            lines.append("DRIFT DETAILS")
+            lines.append("=" * 100)
+            lines.extend(details)
+        lines.append("=" * 100)
+        lines.append("")
+        return "\n".join(lines)
+
+    # ------------- Cache -------------
+    def _server_dir(self):
+        server = self.db_manager.current_config['server']
+        return os.path.join(AppConfig.SCHEMA['cache_dir'], self._safe_name(server))
+
+    def _cache_path(self, database):
+        return os.path.join(self._server_dir(), f"{self._safe_name(database)}.json")
+
+    def _load_cache(self, database):
+        return self._read_json(self._cache_path(database))
+
+    def _save_cache(self, database, snapshot):
+        self._write_json(self._cache_path(database), snapshot)
+
+    def load_baseline(self):
+        """Return the stored baseline snapshot for the current server, or {}."""
+        return self._read_json(self._baseline_path())
+
+    def save_baseline(self, database, snapshot):
+        """Store a database snapshot as the baseline for the current server; failed or empty ones are refused."""
+        self._check_usable(database, snapshot)
+        data = dict(snapshot, database=database)
+        self._write_json(self._baseline_path(), data)
+
+    def set_baseline(self, database):
+        """Snapshot database and make it the baseline for the current server."""
+        snapshot = self.snapshot_database(database)
+        self.save_baseline(database, snapshot)
+        return snapshot
+
+    def reset_baseline(self):
+        """Forget the stored baseline; the next drift check picks a new one. Returns whether one existed."""
+        path = self._baseline_path()
+        if not os.path.exists(path):
+            return False
+        os.remove(path)
+        return True
+
+    def _baseline_path(self):
+        return os.path.join(self._server_dir(), AppConfig.SCHEMA['baseline_filename'])
+
+    @staticmethod
+    def _usable(snapshot):
+        return not snapshot.get("error") and bool(snapshot.get("objects"))
+
+    def _check_usable(self, database, snapshot):
+        if snapshot.get("error"):
+            raise ValueError(f"Cannot use {database} as the schema baseline: {snapshot['error']}")
+        if not snapshot.get("objects"):
+            raise ValueError(f"Cannot use {database} as the schema baseline: it has no user objects")
+
+    @staticmethod
+    def _read_json(path):
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+    @staticmethod
+    def _write_json(path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _safe_name(name):
+        return re.sub(r"[^A-Za-z0-9_.-]", "_", str(name))
+
+    # ------------- Helpers -------------
+    def _db_type(self):
+        cfg = self.db_manager.current_config
+        if not cfg:
+            raise ValueError("No server configuration available")
+        if cfg['db_type'] not in self.STAMP_QUERIES:
+            raise ValueError(f"Unsupported database type: {cfg['db_type']}")
+        return cfg['db_type']
+
+    def _post_status(self, message):
+        if self.message_queue is not None:
+            self.message_queue.put(("status", message))
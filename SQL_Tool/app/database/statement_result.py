@@ -0,0 +1,110 @@
+"""
+Per-statement result records.
+
+A run keeps exactly one copy of each statement's output: the StatementResult in
+results_struct. The UI queue, current_query["results"] and the log writer all pass the
+record itself around instead of the text. Query output is kept as typed rows and only
+rendered to text when it is first viewed or saved; the rendered text is then cached.
+"""
+
+
+class CompactText:
+    """
+    Rendered text held as UTF-8 bytes. CPython stores a str at the width of its widest
+    character, so a single emoji in a result header makes a multi-megabyte table take
+    4 bytes per character; mostly-ASCII tables are close to 1 byte per character in UTF-8.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, text):
+        self.data = text.encode("utf-8")
+
+    def __str__(self):
+        return self.data.decode("utf-8")
+
+    def __len__(self):
+        return len(self.data)
+
+
+class StatementResult:
+    """
+    Outcome of one statement on one database (statement_num 0 for database-level notes
+    and errors). Readable like the dicts it replaces: item["result"], item.get("error").
+    Pass render (a no-argument callable returning the text) instead of result to defer
+    rendering; title is a one-line description that can be shown before rendering. export
+    (a no-argument callable returning lines) gives logs the full text when the render is
+    capped for display.
+    """
+
+    __slots__ = ("database", "statement_num", "success", "error", "result_set", "title", "_payload", "_render",
+                 "_export")
+
+    FIELDS = ("database", "statement_num", "result", "success", "error", "result_set")
+
+    def __init__(self, database, statement_num, result=None, success=True, error=None, result_set=None,
+                 render=None, title=None, export=None):
+        self.database = database
+        self.statement_num = statement_num
+        self.success = success
+        self.error = error
+        self.result_set = result_set
+        self.title = title
+        self._payload = CompactText(result) if result else None
+        self._render = render
+        self._export = export
+
+    @property
+    def rendered(self):
+        return self._render is None
+
+    @property
+    def result(self):
+        """The rendered text, rendering it on first use (decoded on each access; don't hold on to it)."""
+        render = self._render
+        if render is not None:
+            text = render()
+            self._payload = CompactText(text) if text else None
+            self._render = None
+            return text
+        return str(self._payload) if self._payload is not None else ""
+
+    def export_lines(self):
+        """Full text for logs and exports as an iterable of lines (never cached, never capped)."""
+        if self._export is not None:
+            return self._export()
+        return self.result.split("\n")
+
+    def full_result(self):
+        return "\n".join(self.export_lines())
+
+    def payload_size(self):
+        """Bytes held for the rendered text."""
+        return len(self._payload) if self._payload is not None else 0
+
+    # ------------- Dict-style access for log writers and JSON summaries -------------
+    def get(self, key, default=None):
+        if key not in self.FIELDS:
+            return default
+        value = getattr(self, key)
+        return default if value is None and key in ("error", "result_set") else value
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in self.FIELDS and (key not in ("error", "result_set") or getattr(self, key) is not None)
+
+    def to_dict(self):
+        item = {"database": self.database, "statement_num": self.statement_num,
+                "result": self.result, "success": self.success}
+        if self.error is not None:
+            item["error"] = self.error
+        return item
+
+    def __repr__(self):
+        state = "ok" if self.success else f"error={self.error!r}"
+        size = f"{self.payload_size()} bytes" if self.rendered else "not rendered"
+        return f"StatementResult({self.database!r}, {self.statement_num}, {state}, {size})"
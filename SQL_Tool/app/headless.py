@@ -0,0 +1,391 @@
+"""
+Headless API for running SQL scripts without the Tkinter UI.
+Only database and utility modules are imported here so bots get a fast cold start.
+"""
+
+import os
+import sys
+import fnmatch
+
+from app.core.config import AppConfig
+from app.database.connection import DatabaseManager
+from app.database.query_executor import QueryExecutor
+from app.utils.server_profiles import get_profile
+
+
+class StatusSink:
+    """Stands in for the UI message queue: keeps the summary, optionally echoes status lines."""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+        self.summary = ""
+
+    def put(self, item):
+        typ, payload = item
+        if typ == "execution_summary":
+            self.summary = payload
+        elif typ == "status" and self.stream is not None:
+            print(payload, file=self.stream, flush=True)
+
+
+def connect_profile(profile, pool=None):
+    """Return a DatabaseManager configured from a profile name or profile dict."""
+    if isinstance(profile, str):
+        profile = get_profile(profile)
+    db_manager = DatabaseManager(pool)
+    db_manager.set_config(profile['db_type'], profile['server'], profile['username'], profile.get('password', ''),
+                          profile.get('driver'))
+    return db_manager
+
+
+def resolve_databases(db_manager, selectors):
+    """
+    Expand database selectors, keeping order and dropping duplicates:
+      - "@path"           one database name per line in a file
+      - "tenant_*"        glob matched against the server's database list
+      - "a,b,c" / "name"  literal names
+    """
+    if isinstance(selectors, str):
+        selectors = [selectors]
+
+    names = []
+    for selector in selectors:
+        for part in selector.split(","):
+            part = part.strip()
+            if part.startswith("@"):
+                with open(part[1:], "r", encoding="utf-8") as f:
+                    names.extend(line.strip() for line in f if line.strip() and not line.startswith("#"))
+            elif part:
+                names.append(part)
+
+    available = None
+    resolved = []
+    for name in names:
+        if any(ch in name for ch in "*?["):
+            if available is None:
+                available = db_manager.get_databases()
+            resolved.extend(db for db in available if fnmatch.fnmatchcase(db, name))
+        else:
+            resolved.append(name)
+    return list(dict.fromkeys(resolved))
+
+
+def read_script(script):
+    """Accept a path to a .sql file, '-' for stdin, or SQL text."""
+    if script == "-":
+        return sys.stdin.read()
+    if os.path.isfile(script):
+        with open(script, "r", encoding="utf-8-sig") as f:
+            return f.read()
+    return script
+
+
+def run_script(profile, databases, script, max_workers=None, track_migrations=False, journal=False,
+               resume_run_id=None, verbose=False, metrics_file=None, include_results=True):
+    """
+    Run a script on the selected databases of one server profile.
+    A resumed run replays the script and databases recorded at its start (databases and
+    script are then ignored); one started as a rollout continues as a rollout.
+    Returns a JSON-serializable dict (see summarize) plus the text summary under 'summary';
+    include_results=False leaves out the per-statement result text without rendering it.
+    """
+    db_manager = connect_profile(profile)
+    sink = StatusSink(sys.stderr if verbose else None)
+
+    run_journal = None
+    ledger = None
+    rollout_options = None
+    if journal or resume_run_id:
+        from app.utils.deployment_journal import DeploymentJournal
+        run_journal = DeploymentJournal()
+    if track_migrations:
+        from app.database.migration_ledger import MigrationLedger
+        ledger = MigrationLedger(db_manager, sink)
+
+    executor = QueryExecutor(db_manager, sink, run_journal, ledger)
+    run_id = None
+    try:
+        if resume_run_id:
+            run = run_journal.get_run(resume_run_id)
+            if not run or run['kind'] != "query":
+                raise ValueError(f"No query run {resume_run_id} in the journal")
+            # Completed statements are matched by position, so only the journaled script is safe
+            selected, query, rollout_options = run['databases'], run['query'], run['options']
+        else:
+            selected = resolve_databases(db_manager, databases)
+            query = read_script(script)
+
+        if run_journal:
+            run_id = resume_run_id or run_journal.start_run(query, selected, db_manager.current_config)
+        if rollout_options is not None:
+            from app.database.rollout import RolloutOrchestrator
+            result = RolloutOrchestrator(executor, sink).run(selected, query, run_id=run_id,
+                                                              track_migrations=track_migrations, **rollout_options)
+        else:
+            result = executor.execute_query(
+                selected, query,
+                max_workers=max_workers or AppConfig.THROTTLE['max_workers'],
+                run_id=run_id, track_migrations=track_migrations
+            )
+        if run_journal:
+            run_journal.finish_run(run_id, run_journal.run_status(result))
+    except Exception:
+        if run_journal and run_id:
+            run_journal.finish_run(run_id, "failed")
+        raise
+    finally:
+        if run_journal:
+            run_journal.close()
+
+    output = summarize(result, include_results)
+    output["run_id"] = run_id
+    output["timing"] = export_metrics(executor.metrics, metrics_file)
+    output["summary"] = sink.summary
+    return output
+
+
+def run_manifest(manifest_path=None, profile=None, max_workers=None, track_migrations=False,
+                 resume_run_id=None, verbose=False, metrics_file=None, include_results=True):
+    """
+    Run a manifest (see app.database.manifest_runner) as a per-database DAG.
+    Always journaled; a resumed run replays the manifest, scripts and targets recorded at its start.
+    """
+    import json
+    from app.database.manifest_runner import ManifestRunner, load_manifest
+    from app.utils.deployment_journal import DeploymentJournal
+
+    run_journal = DeploymentJournal()
+    try:
+        if resume_run_id:
+            run = run_journal.get_run(resume_run_id)
+            if not run or run['kind'] != "manifest":
+                raise ValueError(f"No manifest run {resume_run_id} in the journal")
+            manifest = json.loads(run['query'])
+        else:
+            manifest = load_manifest(manifest_path)
+
+        profile = profile or manifest.get("profile")
+        if not profile:
+            raise ValueError("No server profile given on the command line or in the manifest")
+        db_manager = connect_profile(profile)
+        sink = StatusSink(sys.stderr if verbose else None)
+
+        # Resolve every step's targets once; the journal keeps them for resume
+        targets = manifest.get("targets")
+        if targets is None:
+            targets = {
+                step["id"]: resolve_databases(db_manager, step.get("databases") or manifest["databases"])
+                for step in manifest["steps"]
+            }
+            manifest = dict(manifest, targets=targets, profile=profile)
+
+        ledger = None
+        if track_migrations:
+            from app.database.migration_ledger import MigrationLedger
+            ledger = MigrationLedger(db_manager, sink)
+
+        executor = QueryExecutor(db_manager, sink, run_journal, ledger)
+        all_databases = list(dict.fromkeys(db for dbs in targets.values() for db in dbs))
+        run_id = resume_run_id or run_journal.start_run(json.dumps(manifest), all_databases,
+                                                        db_manager.current_config, kind="manifest")
+        try:
+            result = ManifestRunner(executor, sink).run(
+                manifest, targets,
+                max_workers=max_workers or AppConfig.THROTTLE['max_workers'],
+                run_id=run_id, track_migrations=track_migrations
+            )
+            run_journal.finish_run(run_id, DeploymentJournal.run_status(result))
+        except Exception:
+            run_journal.finish_run(run_id, "failed")
+            raise
+    finally:
+        run_journal.close()
+
+    output = summarize(result, include_results)
+    output["run_id"] = run_id
+    output["timing"] = export_metrics(executor.metrics, metrics_file)
+    output["summary"] = sink.summary
+    return output
+
+
+def parse_fleet_selectors(selectors):
+    """
+    Group 'profile:selector' entries by profile, keeping order:
+      ["prod-a:tenant_*", "prod-pg:billing,crm"] -> {"prod-a": ["tenant_*"], "prod-pg": ["billing,crm"]}
+    """
+    if isinstance(selectors, str):
+        selectors = [selectors]
+    grouped = {}
+    for selector in selectors:
+        profile, sep, rest = selector.partition(":")
+        if not sep or not profile.strip() or not rest.strip():
+            raise ValueError(f"Expected 'profile:databases', got {selector!r}")
+        grouped.setdefault(profile.strip(), []).append(rest.strip())
+    return grouped
+
+
+def run_fleet(selectors, script, per_server_workers=None, max_total_workers=None, track_migrations=False,
+              journal=False, resume_run_id=None, verbose=False, metrics_file=None, include_results=True):
+    """
+    Run one script on databases spread over several server profiles (see parse_fleet_selectors).
+    Returns the summarize dict plus a per-server breakdown under 'servers'.
+    """
+    from app.database.fleet_executor import FleetExecutor
+    from app.utils.deployment_journal import DeploymentJournal, ScopedJournal
+    from app.utils.metrics import RunMetrics
+
+    sink = StatusSink(sys.stderr if verbose else None)
+    run_journal = DeploymentJournal() if journal or resume_run_id else None
+    try:
+        if resume_run_id:
+            run = run_journal.get_run(resume_run_id)
+            if not run or run['kind'] != "fleet":
+                raise ValueError(f"No fleet run {resume_run_id} in the journal")
+            # Replay the exact databases and script recorded at the start of the run
+            selectors, query = run['databases'], run['query']
+        else:
+            query = read_script(script)
+
+        grouped = parse_fleet_selectors(selectors)
+        # One recorder for all servers so the phase breakdown covers the whole fleet
+        metrics = RunMetrics()
+        executors = {}
+        targets = {}
+        for profile, profile_selectors in grouped.items():
+            db_manager = connect_profile(profile)
+            targets[profile] = resolve_databases(db_manager, profile_selectors)
+
+            ledger = None
+            if track_migrations:
+                from app.database.migration_ledger import MigrationLedger
+                ledger = MigrationLedger(db_manager, sink)
+            scoped = ScopedJournal(run_journal, profile) if run_journal else None
+            executors[profile] = QueryExecutor(db_manager, sink, scoped, ledger, metrics=metrics)
+
+        run_id = resume_run_id
+        if run_journal and not run_id:
+            qualified = [f"{profile}:{db}" for profile, dbs in targets.items() for db in dbs]
+            run_id = run_journal.start_run(query, qualified, {"server": ",".join(targets)}, kind="fleet")
+        try:
+            result = FleetExecutor(executors, sink).run(
+                targets, query,
+                per_server_workers=per_server_workers, max_total_workers=max_total_workers,
+                run_id=run_id, track_migrations=track_migrations
+            )
+            if run_journal:
+                run_journal.finish_run(run_id, DeploymentJournal.run_status(result))
+        except Exception:
+            if run_journal and run_id:
+                run_journal.finish_run(run_id, "failed")
+            raise
+    finally:
+        if run_journal:
+            run_journal.close()
+
+    output = summarize(result, include_results)
+    output["servers"] = result["servers"]
+    output["run_id"] = run_id
+    output["timing"] = export_metrics(metrics, metrics_file)
+    output["summary"] = sink.summary
+    return output
+
+
+def run_extract(profile, databases, script, output_dir=None, fmt=None, header=None, max_workers=None,
+                use_copy=None, verbose=False):
+    """
+    Extract a SELECT from the selected databases into one file per database (see BulkExtractor).
+    Returns the extractor's JSON-serializable dict.
+    """
+    from app.database.bulk_extract import BulkExtractor
+
+    db_manager = connect_profile(profile)
+    selected = resolve_databases(db_manager, databases)
+    sink = StatusSink(sys.stderr if verbose else None)
+    return BulkExtractor(db_manager, sink).run(
+        selected, read_script(script), output_dir=output_dir, fmt=fmt, header=header,
+        max_workers=max_workers, use_copy=use_copy
+    )
+
+
+def run_load(profile, databases, source_path, table, columns=None, sheet=None, batch_size=None,
+             max_workers=None, truncate=False, commit_per_batch=None, verbose=False):
+    """
+    Bulk-load a CSV/Excel file into a table on the selected databases (see BulkLoader).
+    Returns the loader's JSON-serializable dict.
+    """
+    from app.database.bulk_loader import BulkLoader
+
+    db_manager = connect_profile(profile)
+    selected = resolve_databases(db_manager, databases)
+    sink = StatusSink(sys.stderr if verbose else None)
+    return BulkLoader(db_manager, sink).run(
+        selected, source_path, table, columns=columns, sheet=sheet, batch_size=batch_size,
+        max_workers=max_workers, truncate=truncate, commit_per_batch=commit_per_batch
+    )
+
+
+def run_copy(profile, source_db, databases, table, query=None, target_profile=None, mode=None, keys=None,
+             batch_size=None, queue_depth=None, max_targets=None, verbose=False):
+    """
+    Copy a source query (default: the whole table) from one database into the table on
+    the selected databases, optionally on another server profile (see CopyPipeline).
+    """
+    from app.database.copy_pipeline import CopyPipeline
+
+    source_manager = connect_profile(profile)
+    target_manager = connect_profile(target_profile) if target_profile else source_manager
+    selected = resolve_databases(target_manager, databases)
+    sink = StatusSink(sys.stderr if verbose else None)
+    query = read_script(query) if query else f"SELECT * FROM {table}"
+    return CopyPipeline(source_manager, target_manager, sink).run(
+        source_db, query, selected, table, mode=mode, keys=keys, batch_size=batch_size,
+        queue_depth=queue_depth, max_targets=max_targets
+    )
+
+
+def export_metrics(metrics, path=None):
+    """
+    Per-phase timing for the JSON output. With a path, also writes a Prometheus
+    textfile (*.prom) or the full JSON including individual spans (anything else).
+    """
+    if path:
+        if path.endswith(".prom"):
+            metrics.write_textfile(path)
+        else:
+            import json
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(metrics.to_json(), f, indent=2)
+    return metrics.to_json(include_spans=False)["phases"]
+
+
+def summarize(result, include_results=True):
+    """Flatten an executor result into plain, JSON-friendly structures."""
+    databases = []
+    for db_info in result.get("databases_info", []):
+        entry = {
+            "name": db_info["name"],
+            "status": db_info["status"],
+            "exec_time": round(db_info["exec_time"], 3),
+            "total_rows": db_info["total_rows"],
+            "statement_count": db_info["statement_count"],
+            "retries": db_info.get("retries", 0),
+            "errors": db_info["errors"],
+        }
+        if include_results:
+            entry["statements"] = [
+                {
+                    "statement_num": item.get("statement_num", 0),
+                    "success": item.get("success", True),
+                    "error": item.get("error"),
+                    "result": item.full_result() if hasattr(item, "full_result") else item.get("result", ""),
+                }
+                for item in db_info.get("results_struct", [])
+            ]
+        databases.append(entry)
+
+    return {
+        "ok": all(db["status"] != "Error" for db in databases),
+        "exec_time": round(result.get("exec_time", 0.0), 3),
+        "total_rows": result.get("total_rows", 0),
+        "databases": databases,
+    }
@@ -0,0 +1,191 @@
+import json
+import uuid
+import sqlite3
+import threading
+from datetime import datetime
+
+from app.core.config import AppConfig
+
+
+class JobQueue:
+    """
+    Persistent job queue with per-job progress events, stored in a local SQLite file.
+    Jobs are dispatched round-robin across clients so one busy bot cannot starve the others.
+    """
+
+    SCHEMA = [
+        """CREATE TABLE IF NOT EXISTS jobs (
+            job_id TEXT PRIMARY KEY,
+            client TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            request TEXT NOT NULL,
+            status TEXT NOT NULL,
+            submitted_at TEXT NOT NULL,
+            started_at TEXT,
+            finished_at TEXT,
+            result TEXT,
+            run_id TEXT
+        )""",
+        """CREATE TABLE IF NOT EXISTS job_events (
+            job_id TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            recorded_at TEXT NOT NULL,
+            type TEXT NOT NULL,
+            payload TEXT,
+            PRIMARY KEY (job_id, seq)
+        )""",
+        "CREATE INDEX IF NOT EXISTS ix_jobs_status ON jobs(status, client, submitted_at)",
+    ]
+
+    FINISHED = ("done", "failed")
+
+    def __init__(self, path=None):
+        self.path = path or AppConfig.SERVICE['db_path']
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        for ddl in self.SCHEMA:
+            self._conn.execute(ddl)
+        # Queues created before jobs were journaled have no 'run_id' column
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")]
+        if "run_id" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN run_id TEXT")
+        # Jobs that were running when the service stopped go back to the queue; they keep
+        # their run_id so the worker resumes the journaled run instead of starting over
+        self._conn.execute("UPDATE jobs SET status = 'queued', started_at = NULL WHERE status = 'running'")
+        self._conn.commit()
+        self._last_dispatch = {}
+        self._closed = False
+
+    # ------------- Submitting -------------
+    def submit(self, client, kind, request):
+        job_id = uuid.uuid4().hex
+        with self._changed:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, client, kind, request, status, submitted_at) "
+                "VALUES (?, ?, ?, ?, 'queued', ?)",
+                (job_id, client, kind, json.dumps(request), self._now())
+            )
+            self._insert_event(job_id, "queued", {"client": client})
+            self._conn.commit()
+            self._changed.notify_all()
+        return job_id
+
+    # ------------- Dispatching -------------
+    def claim_next(self, timeout=None):
+        """Block until a job is available, mark it running and return it (None on timeout/close)."""
+        with self._changed:
+            while not self._closed:
+                rows = self._conn.execute(
+                    "SELECT job_id, client, kind, request, run_id FROM jobs WHERE status = 'queued' "
+                    "ORDER BY submitted_at"
+                ).fetchall()
+                if rows:
+                    # Oldest job of the client that was served least recently
+                    first_per_client = {}
+                    for row in rows:
+                        first_per_client.setdefault(row[1], row)
+                    client = min(first_per_client, key=lambda c: self._last_dispatch.get(c, ""))
+                    job_id, client, kind, request, run_id = first_per_client[client]
+
+                    now = self._now()
+                    self._last_dispatch[client] = now
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'running', started_at = ? WHERE job_id = ?", (now, job_id)
+                    )
+                    self._conn.commit()
+                    return {"job_id": job_id, "client": client, "kind": kind, "request": json.loads(request),
+                            "run_id": run_id}
+                if not self._changed.wait(timeout):
+                    return None
+        return None
+
+    def set_run_id(self, job_id, run_id):
+        """Remember the journal run of a job as soon as it starts, for resume after a restart."""
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET run_id = ? WHERE job_id = ?", (run_id, job_id))
+            self._conn.commit()
+
+    def finish(self, job_id, status, result):
+        with self._changed:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, result = ? WHERE job_id = ?",
+                (status, self._now(), json.dumps(result, default=str), job_id)
+            )
+            # Written with the status so a follower never sees 'done' without its final event
+            self._insert_event(job_id, status, None)
+            self._conn.commit()
+            self._changed.notify_all()
+
+    # ------------- Events -------------
+    def add_event(self, job_id, event_type, payload):
+        with self._changed:
+            seq = self._insert_event(job_id, event_type, payload)
+            self._conn.commit()
+            self._changed.notify_all()
+        return seq
+
+    def _insert_event(self, job_id, event_type, payload):
+        # Caller holds the lock and commits
+        seq = self._conn.execute(
+            "SELECT COALESCE(MAX(seq), 0) + 1 FROM job_events WHERE job_id = ?", (job_id,)
+        ).fetchone()[0]
+        self._conn.execute(
+            "INSERT INTO job_events (job_id, seq, recorded_at, type, payload) VALUES (?, ?, ?, ?, ?)",
+            (job_id, seq, self._now(), event_type, json.dumps(payload, default=str))
+        )
+        return seq
+
+    def events_after(self, job_id, after=0):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, recorded_at, type, payload FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq",
+                (job_id, after)
+            ).fetchall()
+        return [
+            {"seq": seq, "at": recorded_at, "type": typ, "payload": json.loads(payload) if payload else None}
+            for seq, recorded_at, typ, payload in rows
+        ]
+
+    def wait_for_change(self, timeout):
+        """Sleep until any job or event changes, or timeout."""
+        with self._changed:
+            self._changed.wait(timeout)
+
+    # ------------- Reading -------------
+    def get(self, job_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT job_id, client, kind, status, submitted_at, started_at, finished_at, result "
+                "FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if not row:
+            return None
+        keys = ("job_id", "client", "kind", "status", "submitted_at", "started_at", "finished_at", "result")
+        job = dict(zip(keys, row))
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def list_jobs(self, client=None, limit=100):
+        sql = "SELECT job_id, client, kind, status, submitted_at, finished_at FROM jobs"
+        params = []
+        if client:
+            sql += " WHERE client = ?"
+            params.append(client)
+        sql += " ORDER BY submitted_at DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        keys = ("job_id", "client", "kind", "status", "submitted_at", "finished_at")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def close(self):
+        with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+            self._conn.close()
+
+    @staticmethod
+    def _now():
+        return datetime.now().isoformat(timespec="microseconds")
@@ -0,0 +1,244 @@
+"""
+Long-running service mode: one process, warm pooled connections and a local API
+in front of a persistent job queue.
+
+    POST /jobs                      {"client", "profile", "databases", "script", "workers", "track_migrations"}
+    GET  /jobs?client=NAME          recent jobs
+    GET  /jobs/<id>                 job status and result
+    GET  /jobs/<id>/events?after=N  NDJSON progress stream, ends when the job finishes
+    GET  /health                    queue, worker and pool statistics
+"""
+
+import os
+import json
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from app.core.config import AppConfig
+from app.database.connection_pool import ConnectionPool
+from app.database.query_executor import QueryExecutor
+from app.service.job_queue import JobQueue
+from app.utils.deployment_journal import DeploymentJournal
+from app import headless
+
+
+class JobEventSink:
+    """Message-queue stand-in that records executor progress as job events."""
+
+    FORWARDED = ("status", "error", "execution_summary")
+
+    def __init__(self, job_queue, job_id):
+        self.job_queue = job_queue
+        self.job_id = job_id
+        self.summary = ""
+
+    def put(self, item):
+        typ, payload = item
+        if typ == "execution_summary":
+            self.summary = payload
+        if typ in self.FORWARDED:
+            self.job_queue.add_event(self.job_id, typ, payload)
+
+
+class JobService:
+    """Worker pool that drains the job queue through QueryExecutor using a shared ConnectionPool."""
+
+    def __init__(self, workers=None, db_path=None):
+        settings = AppConfig.SERVICE
+        self.worker_count = workers or settings['workers']
+        self.queue = JobQueue(db_path)
+        self.pool = ConnectionPool()
+        self.journal = DeploymentJournal()
+        self._threads = []
+        self._stopping = threading.Event()
+
+    # ------------- Lifecycle -------------
+    def start(self):
+        for i in range(self.worker_count):
+            thread = threading.Thread(target=self._worker_loop, name=f"job-worker-{i + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        # Jobs still running are requeued when the service next starts
+        self.queue.close()
+        self.pool.close_all()
+        self.journal.close()
+
+    # ------------- Jobs -------------
+    def submit(self, request):
+        missing = [key for key in ("profile", "databases", "script") if not request.get(key)]
+        if missing:
+            raise ValueError(f"Missing field(s): {', '.join(missing)}")
+        client = str(request.get("client") or "anonymous")
+        return self.queue.submit(client, "run", request)
+
+    def _worker_loop(self):
+        while not self._stopping.is_set():
+            job = self.queue.claim_next(timeout=1.0)
+            if job is None:
+                if not self._stopping.is_set():
+                    self.pool.prune()
+                continue
+            self._run_job(job)
+
+    def _run_job(self, job):
+        job_id = job["job_id"]
+        request = job["request"]
+        sink = JobEventSink(self.queue, job_id)
+        run_id = None
+        try:
+            db_manager = headless.connect_profile(request["profile"], pool=self.pool)
+            # A job requeued after a restart resumes its run on the databases resolved back then
+            run = self.journal.get_run(job["run_id"]) if job.get("run_id") else None
+            if run:
+                run_id, selected = run['run_id'], run['databases']
+                sink.put(("status", f"Job {job_id[:8]} resumed on {len(selected)} database(s)"))
+            else:
+                selected = headless.resolve_databases(db_manager, request["databases"])
+                sink.put(("status", f"Job {job_id[:8]} started on {len(selected)} database(s)"))
+
+            ledger = None
+            if request.get("track_migrations"):
+                from app.database.migration_ledger import MigrationLedger
+                ledger = MigrationLedger(db_manager, sink)
+
+            if run_id is None:
+                run_id = self.journal.start_run(request["script"], selected, db_manager.current_config)
+                self.queue.set_run_id(job_id, run_id)
+            executor = QueryExecutor(db_manager, sink, self.journal, ledger)
+            result = executor.execute_query(
+                selected, request["script"],
+                max_workers=request.get("workers") or AppConfig.THROTTLE['max_workers'],
+                run_id=run_id, track_migrations=bool(request.get("track_migrations"))
+            )
+            self.journal.finish_run(run_id, DeploymentJournal.run_status(result))
+
+            output = headless.summarize(result, include_results=request.get("include_results", True))
+            output["run_id"] = run_id
+            output["summary"] = sink.summary
+            self.queue.finish(job_id, "done", output)
+        except Exception as e:
+            if run_id:
+                self.journal.finish_run(run_id, "failed")
+            sink.put(("error", str(e)))
+            self.queue.finish(job_id, "failed", {"ok": False, "error": str(e), "run_id": run_id})
+
+    def health(self):
+        jobs = self.queue.list_jobs(limit=1000)
+        counts = {}
+        for job in jobs:
+            counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return {"workers": self.worker_count, "jobs": counts, "pool": self.pool.stats()}
+
+    # ------------- Serving -------------
+    def make_server(self, host=None, port=None, socket_path=None):
+        handler = type("BoundJobRequestHandler", (JobRequestHandler,), {"service": self})
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            return UnixHTTPServer(socket_path, handler)
+        settings = AppConfig.SERVICE
+        return ThreadingHTTPServer((host or settings['host'], port or settings['port']), handler)
+
+    def serve_forever(self, host=None, port=None, socket_path=None):
+        server = self.make_server(host, port, socket_path)
+        self.start()
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            self.stop()
+            if socket_path and os.path.exists(socket_path):
+                os.remove(socket_path)
+
+
+class UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    service = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        parts = [p for p in url.path.split("/") if p]
+
+        if parts == ["health"]:
+            return self._send_json(200, self.service.health())
+        if parts == ["jobs"]:
+            client = params.get("client", [None])[0]
+            return self._send_json(200, {"jobs": self.service.queue.list_jobs(client)})
+        if len(parts) == 2 and parts[0] == "jobs":
+            job = self.service.queue.get(parts[1])
+            if job is None:
+                return self._send_json(404, {"error": "Unknown job"})
+            return self._send_json(200, job)
+        if len(parts) == 3 and parts[0] == "jobs" and parts[2] == "events":
+            after = int(params.get("after", ["0"])[0] or 0)
+            return self._stream_events(parts[1], after)
+        self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        if urlparse(self.path).path.rstrip("/") != "/jobs":
+            return self._send_json(404, {"error": "Not found"})
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            request = json.loads(self.rfile.read(length) or b"{}")
+            job_id = self.service.submit(request)
+        except (ValueError, TypeError) as e:
+            return self._send_json(400, {"error": str(e)})
+        self._send_json(202, {"job_id": job_id})
+
+    def _stream_events(self, job_id, after):
+        queue = self.service.queue
+        if queue.get(job_id) is None:
+            return self._send_json(404, {"error": "Unknown job"})
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        poll = AppConfig.SERVICE['stream_poll_interval']
+        try:
+            while True:
+                # Read the status first so events written before it finished are not missed
+                finished = queue.get(job_id)["status"] in JobQueue.FINISHED
+                for event in queue.events_after(job_id, after):
+                    self._write_chunk(json.dumps(event, default=str) + "\n")
+                    after = event["seq"]
+                if finished:
+                    break
+                queue.wait_for_change(poll)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def _write_chunk(self, text):
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_json(self, code, payload):
+        data = json.dumps(payload, default=str).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self):
+        # Unix-socket clients have no (host, port) address
+        if isinstance(self.client_address, tuple):
+            return self.client_address[0]
+        return "unix"
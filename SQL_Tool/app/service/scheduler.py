@@ -0,0 +1,280 @@
+"""
+Cron-style scheduler for recurring headless runs.
+
+Each job fires at its cron times plus a fixed per-job stagger offset. A job that is
+still running when it fires again is coalesced into a single follow-up run; fires
+missed while the scheduler was down are not replayed.
+"""
+
+import os
+import re
+import sys
+import hashlib
+import threading
+from datetime import datetime, timedelta
+
+from app.core.config import AppConfig
+from app.database.connection_pool import ConnectionPool
+from app.database.query_executor import QueryExecutor
+from app.utils.deployment_journal import DeploymentJournal
+from app.utils.file_operations import FileOperationsManager
+from app.utils.scheduled_jobs import load_jobs
+from app import headless
+
+
+class CronSchedule:
+    """Standard 5-field cron expression: minute hour day-of-month month day-of-week."""
+
+    FIELDS = [("minute", 0, 59), ("hour", 0, 23), ("day", 1, 31), ("month", 1, 12), ("weekday", 0, 6)]
+
+    ALIASES = {
+        "@hourly": "0 * * * *",
+        "@daily": "0 0 * * *",
+        "@weekly": "0 0 * * 0",
+        "@monthly": "0 0 1 * *",
+    }
+
+    def __init__(self, expression):
+        self.expression = expression
+        parts = self.ALIASES.get(expression.strip(), expression).split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+
+        values = {}
+        for text, (name, low, high) in zip(parts, self.FIELDS):
+            values[name] = self._parse_field(text, name, low, high)
+        self.minutes = values["minute"]
+        self.hours = values["hour"]
+        self.days = values["day"]
+        self.months = values["month"]
+        self.weekdays = values["weekday"]
+
+        # Vixie cron: when both day fields are restricted, either one matching is enough
+        self._day_or_weekday = parts[2] != "*" and parts[4] != "*"
+
+    @staticmethod
+    def _parse_field(text, name, low, high):
+        result = set()
+        for part in text.split(","):
+            match = re.fullmatch(r"(\*|\d+)(?:-(\d+))?(?:/(\d+))?", part)
+            if not match:
+                raise ValueError(f"Invalid {name} field: {text!r}")
+            start, end, step = match.groups()
+            if start == "*":
+                first, last = low, high
+            else:
+                first = int(start)
+                last = int(end) if end else (high if step else first)
+            step = int(step) if step else 1
+
+            # Day-of-week accepts 7 as Sunday
+            top = 7 if name == "weekday" else high
+            if first < low or last > top or first > last or step < 1:
+                raise ValueError(f"Invalid {name} field: {text!r}")
+            result.update(v % 7 if name == "weekday" else v for v in range(first, last + 1, step))
+        return result
+
+    def _day_matches(self, t):
+        day_ok = t.day in self.days
+        weekday_ok = (t.weekday() + 1) % 7 in self.weekdays
+        if self._day_or_weekday:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, after):
+        """First matching minute strictly after 'after'."""
+        t = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = after.year + 5
+        while t.year <= limit:
+            if t.month not in self.months:
+                t = (t.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(t):
+                t = (t + timedelta(days=1)).replace(hour=0, minute=0)
+            elif t.hour not in self.hours:
+                t = (t + timedelta(hours=1)).replace(minute=0)
+            elif t.minute not in self.minutes:
+                t += timedelta(minutes=1)
+            else:
+                return t
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+
+class Scheduler:
+    """Runs scheduled jobs headlessly through QueryExecutor, journaling and exporting every run."""
+
+    def __init__(self, jobs_file=None, max_concurrent_jobs=None, export_dir=None, stream=sys.stderr):
+        settings = AppConfig.SCHEDULER
+        self.jobs_file = jobs_file or settings['jobs_file']
+        self.export_dir = export_dir or settings['export_dir']
+        self.stream = stream
+
+        self.pool = ConnectionPool()
+        self.journal = DeploymentJournal()
+        self._slots = threading.BoundedSemaphore(max_concurrent_jobs or settings['max_concurrent_jobs'])
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        self.jobs = {}
+        self._jobs_mtime = None
+        self._state = {}   # name -> {next_run, running, pending, last_status, last_run_id}
+        self.reload_jobs()
+
+    # ------------- Jobs -------------
+    def reload_jobs(self):
+        """Pick up jobs added or changed in the jobs file since the last load."""
+        mtime = os.path.getmtime(self.jobs_file) if os.path.exists(self.jobs_file) else None
+        if mtime == self._jobs_mtime and self.jobs:
+            return
+        self._jobs_mtime = mtime
+        jobs = {name: job for name, job in load_jobs(self.jobs_file).items() if job.get("enabled", True)}
+
+        now = datetime.now()
+        with self._lock:
+            for name, job in jobs.items():
+                state = self._state.setdefault(name, {"running": False, "pending": False,
+                                                      "last_status": None, "last_run_id": None})
+                if self.jobs.get(name) != job:
+                    state["next_run"] = self.next_run_time(name, job, now)
+            for name in set(self._state) - set(jobs):
+                if not self._state[name]["running"]:
+                    del self._state[name]
+            self.jobs = jobs
+
+    @staticmethod
+    def stagger_offset(name, job):
+        """Stable offset (seconds) derived from the job name, unless the job sets 'stagger'."""
+        if job.get("stagger") is not None:
+            return int(job["stagger"])
+        window = AppConfig.SCHEDULER['stagger_seconds']
+        if window <= 0:
+            return 0
+        return int(hashlib.sha1(name.encode("utf-8")).hexdigest(), 16) % window
+
+    @classmethod
+    def next_run_time(cls, name, job, after):
+        offset = timedelta(seconds=cls.stagger_offset(name, job))
+        return CronSchedule(job["schedule"]).next_after(after - offset) + offset
+
+    def status(self):
+        with self._lock:
+            return {name: dict(state) for name, state in self._state.items()}
+
+    # ------------- Loop -------------
+    def run_forever(self):
+        self._log(f"Scheduler started with {len(self.jobs)} job(s)")
+        try:
+            while not self._stop.is_set():
+                self.reload_jobs()
+                now = datetime.now()
+                with self._lock:
+                    due = [name for name, state in self._state.items()
+                           if name in self.jobs and state["next_run"] <= now]
+                    for name in due:
+                        # Computed from now, so a late wake-up fires once rather than catching up
+                        self._state[name]["next_run"] = self.next_run_time(name, self.jobs[name], now)
+                for name in due:
+                    self.trigger(name)
+
+                with self._lock:
+                    upcoming = [s["next_run"] for n, s in self._state.items() if n in self.jobs]
+                wait = min([(t - datetime.now()).total_seconds() for t in upcoming] + [60.0])
+                self._stop.wait(max(wait, 0.5))
+        finally:
+            self.close()
+
+    def stop(self):
+        self._stop.set()
+
+    def close(self):
+        self.pool.close_all()
+        self.journal.close()
+
+    def trigger(self, name):
+        """Start a run of 'name', or coalesce it into the run already in progress."""
+        with self._lock:
+            state = self._state[name]
+            if state["running"]:
+                if not state["pending"]:
+                    self._log(f"{name}: still running, coalescing into one follow-up run")
+                state["pending"] = True
+                return
+            state["running"] = True
+        threading.Thread(target=self._run_loop, args=(name,), name=f"schedule-{name}", daemon=True).start()
+
+    def _run_loop(self, name):
+        with self._slots:
+            while True:
+                try:
+                    output = self.run_job(name, self.jobs[name])
+                    status, run_id = ("ok" if output["ok"] else "errors"), output["run_id"]
+                except Exception as e:
+                    self._log(f"{name}: failed - {e}")
+                    status, run_id = "failed", None
+                with self._lock:
+                    state = self._state[name]
+                    state["last_status"], state["last_run_id"] = status, run_id
+                    if state["pending"] and not self._stop.is_set():
+                        state["pending"] = False
+                        continue
+                    state["running"] = False
+                    return
+
+    # ------------- Running -------------
+    def run_job(self, name, job):
+        """Run one job now; returns the headless summary plus run_id and log_path."""
+        db_manager = headless.connect_profile(job["profile"], pool=self.pool)
+        selected = headless.resolve_databases(db_manager, job["databases"])
+        query = headless.read_script(job["script"])
+        sink = headless.StatusSink()
+
+        ledger = None
+        if job.get("track_migrations"):
+            from app.database.migration_ledger import MigrationLedger
+            ledger = MigrationLedger(db_manager, sink)
+
+        self._log(f"{name}: running on {len(selected)} database(s)")
+        started = datetime.now()
+        run_id = self.journal.start_run(query, selected, db_manager.current_config)
+        try:
+            executor = QueryExecutor(db_manager, sink, self.journal, ledger)
+            result = executor.execute_query(
+                selected, query,
+                max_workers=job.get("max_workers") or AppConfig.SCHEDULER['max_workers'],
+                run_id=run_id, track_migrations=bool(job.get("track_migrations"))
+            )
+            self.journal.finish_run(run_id, DeploymentJournal.run_status(result))
+        except Exception:
+            self.journal.finish_run(run_id, "failed")
+            raise
+
+        log_path = self._export(name, query, started, selected, result, db_manager.current_config)
+        output = headless.summarize(result, include_results=False)
+        output["run_id"] = run_id
+        output["log_path"] = log_path
+        output["summary"] = sink.summary
+        failed = sum(1 for db in output["databases"] if db["status"] == "Error")
+        self._log(f"{name}: finished in {output['exec_time']:.2f}s, {failed} failed database(s)")
+        return output
+
+    def _export(self, name, query, started, selected, result, server_info):
+        query_data = {
+            "query": query,
+            "start_time": started,
+            "exec_time": result.get("exec_time", 0.0),
+            "total_rows": result.get("total_rows", 0),
+            "databases": selected,
+            "results": [item for db_info in result.get("databases_info", [])
+                        for item in db_info.get("results_struct", [])],
+        }
+        os.makedirs(self.export_dir, exist_ok=True)
+        prefix = re.sub(r"[^\w.-]", "_", name)
+        path = os.path.join(self.export_dir, FileOperationsManager.default_log_name(query_data, prefix))
+        ok, message = FileOperationsManager.write_query_log(query_data, server_info, path)
+        if not ok:
+            self._log(f"{name}: {message}")
+            return None
+        return path
+
+    def _log(self, message):
+        if self.stream is not None:
+            print(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] {message}", file=self.stream, flush=True)
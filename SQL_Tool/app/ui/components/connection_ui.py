@@ -99,7 +99,7 @@ class ConnectionUI:
         self.db_type_selector = ttk.Combobox(
             input_frame,
             textvariable=self.db_type_var,
-            values=["SQL Server", "PostgreSQL", "MySQL"],  # Added MySQL option
+            values=["SQL Server", "PostgreSQL", "MySQL", "SQLite"],  # SQLite: server is a folder of .db files
             state="readonly",
             width=33,
             font=self.app.font_normal
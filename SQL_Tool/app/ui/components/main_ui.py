@@ -4,7 +4,7 @@ import tkinter as tk
 from tkinter import ttk
 from .database_explorer import DatabaseExplorer
 from .query_editor import QueryEditor
-from .result_viewer import ResultViewer
+from .session_tab import SessionTab
 from app.ui.styling.logo_handler import LogoHandler
 
 class MainUI:
@@ -18,11 +18,18 @@ class MainUI:
         # UI components
         self.database_explorer = None
         self.query_editor = None
-        self.result_viewer = None
+        self.session_notebook = None
+        self.session_tabs = {}  # notebook page widget name -> SessionTab
 
         # UI elements
         self.run_query_btn = None
         self.save_log_btn = None
+        self.schema_check_btn = None
+        self.schema_menu = None
+        self.rollout_btn = None
+        self.resume_btn = None
+        self.track_migrations_var = tk.BooleanVar(value=False)
+        self.profile_run_var = tk.BooleanVar(value=False)
 
         self.build_ui()
 
@@ -144,6 +151,55 @@ class MainUI:
             command=self.clear_results
         ).grid(row=0, column=4, padx=5)
 
+        self.schema_check_btn = ttk.Button(
+            button_frame,
+            text="🧬 Schema Drift ▾",
+            style='Modern.TButton',
+            command=self._show_schema_menu
+        )
+        self.schema_check_btn.grid(row=0, column=5, padx=5)
+
+        self.schema_menu = tk.Menu(self.main_frame, tearoff=0, font=self.app.font_small)
+        self.schema_menu.add_command(label="Check drift against baseline", command=self._check_schema_drift)
+        self.schema_menu.add_command(label="Use selected database as baseline", command=self._set_schema_baseline)
+        self.schema_menu.add_command(label="Reset baseline", command=self.app.reset_schema_baseline)
+
+        self.rollout_btn = ttk.Button(
+            button_frame,
+            text="🚦 Rollout",
+            style='Modern.TButton',
+            command=self._start_rollout
+        )
+        self.rollout_btn.grid(row=0, column=6, padx=5)
+
+        self.resume_btn = ttk.Button(
+            button_frame,
+            text="⏯️ Resume Run",
+            style='Modern.TButton',
+            command=self.app.resume_last_run
+        )
+        self.resume_btn.grid(row=0, column=7, padx=5)
+
+        tk.Checkbutton(
+            button_frame,
+            text="Track migrations",
+            variable=self.track_migrations_var,
+            bg=self.app.card_bg,
+            fg=self.app.primary_color,
+            activebackground=self.app.card_bg,
+            font=self.app.font_small
+        ).grid(row=0, column=8, padx=5)
+
+        tk.Checkbutton(
+            button_frame,
+            text="Profile run",
+            variable=self.profile_run_var,
+            bg=self.app.card_bg,
+            fg=self.app.primary_color,
+            activebackground=self.app.card_bg,
+            font=self.app.font_small
+        ).grid(row=0, column=9, padx=5)
+
     def build_database_explorer(self, parent):
         self.database_explorer = DatabaseExplorer(parent, self.app)
 
@@ -155,10 +211,13 @@ class MainUI:
         query_pane.grid(row=0, column=0, sticky="nsew")
 
         self.query_editor = QueryEditor(query_pane, self.app)
-        self.result_viewer = ResultViewer(query_pane, self.app)
+        # One tab per query session; each runs, cancels and exports on its own
+        self.session_notebook = ttk.Notebook(query_pane)
+        self.session_notebook.bind("<<NotebookTabChanged>>", lambda e: self.app.on_session_selected())
+        self.session_tabs = {}
 
-        query_pane.add(self.query_editor.get_frame(), weight=7)
-        query_pane.add(self.result_viewer.get_frame(), weight=3)
+        query_pane.add(self.query_editor.get_frame(), weight=5)
+        query_pane.add(self.session_notebook, weight=5)
 
     def _build_status_bar(self):
         self.status_bar = tk.Label(
@@ -178,20 +237,35 @@ class MainUI:
         query = self.query_editor.get_query()
         self.app.start_query_thread(selected_databases, query)
 
-    def set_query_running_state(self, is_running):
-        state = "disabled" if is_running else "normal"
-        self.run_query_btn.config(state=state)
-        if is_running:
-            self.save_log_btn.config(state="disabled")
-            self.query_editor.disable()
-            self.show_status("Executing query...")
-        else:
-            self.query_editor.enable()
-            self.show_status("Ready.")
-
-    def enable_save_log_button(self):
-        self.save_log_btn.config(state="normal")
-        self.show_status("Query execution completed. You can now export the results.")
+    def _start_rollout(self):
+        selected_databases = self.database_explorer.get_selected_databases()
+        query = self.query_editor.get_query()
+        self.app.show_rollout_dialog(selected_databases, query)
+
+    def _show_schema_menu(self):
+        btn = self.schema_check_btn
+        self.schema_menu.tk_popup(btn.winfo_rootx(), btn.winfo_rooty() + btn.winfo_height())
+
+    def _check_schema_drift(self):
+        selected_databases = self.database_explorer.get_selected_databases()
+        self.app.start_schema_check(selected_databases)
+
+    def _set_schema_baseline(self):
+        selected_databases = self.database_explorer.get_selected_databases()
+        self.app.set_schema_baseline(selected_databases)
+
+    def show_running_sessions(self, count):
+        self.show_status(f"{count} session(s) running..." if count else "Ready.")
+
+    def get_track_migrations(self):
+        return self.track_migrations_var.get()
+
+    def get_profile_run(self):
+        return self.profile_run_var.get()
+
+    def set_export_enabled(self, enabled):
+        """Header export button follows whether the active session has results to save."""
+        self.save_log_btn.config(state="normal" if enabled else "disabled")
 
     def populate_databases(self, databases):
         if self.database_explorer:
@@ -211,8 +285,9 @@ class MainUI:
         return ""
 
     def clear_results(self):
-        if self.result_viewer:
-            self.result_viewer.clear_results()
+        tab = self.get_active_tab()
+        if tab:
+            tab.clear()
         self.show_status("Results cleared.")
 
     def show_status(self, status):
@@ -220,8 +295,6 @@ class MainUI:
             self.status_bar.config(text=status)
 
     def show_error(self, error_message):
-        if self.result_viewer:
-            self.result_viewer.show_error(error_message)
         if self.status_bar:
             self.status_bar.config(text=f"Error: {error_message}", fg=self.app.error_color)
 
@@ -251,14 +324,31 @@ class MainUI:
     def refresh_connection_status(self):
         self.build_ui()
 
-    def show_execution_summary(self, summary):
-        """Passes the execution summary to the result viewer."""
-        if self.result_viewer:
-            # CORRECT: Call the existing 'show_execution_summary' method
-            self.result_viewer.show_execution_summary(summary)
-
-    def append_result(self, result_text):
-        """Passes a chunk of result text to the result viewer."""
-        if self.result_viewer:
-            # CORRECT: Change 'append_text' to 'append_result'
-            self.result_viewer.append_result(result_text)
\ No newline at end of file
+    def is_shown(self):
+        return bool(self.main_frame) and self.main_frame.winfo_ismapped()
+
+    # ------------- Session tabs -------------
+    def add_session_tab(self, session):
+        """Create and select the tab of a new session; returns its SessionTab."""
+        tab = SessionTab(self.session_notebook, self.app, session)
+        self.session_notebook.add(tab.get_frame(), text=tab.title())
+        self.session_tabs[str(tab.get_frame())] = tab
+        self.session_notebook.select(tab.get_frame())
+        return tab
+
+    def remove_session_tab(self, tab):
+        self.session_tabs.pop(str(tab.get_frame()), None)
+        self.session_notebook.forget(tab.get_frame())
+        tab.get_frame().destroy()
+
+    def update_session_tab(self, tab):
+        """Refresh a tab's title (running marker) after its session started or finished."""
+        self.session_notebook.tab(tab.get_frame(), text=tab.title())
+
+    def select_session_tab(self, tab):
+        self.session_notebook.select(tab.get_frame())
+
+    def get_active_tab(self):
+        if not self.session_notebook or not self.session_notebook.select():
+            return None
+        return self.session_tabs.get(self.session_notebook.select())
\ No newline at end of file
@@ -7,6 +7,7 @@ class ResultViewer:
         self.app = app_controller
         self.result_text = None
         self.result_viewer_frame = None
+        self.collapsed_count = 0
         self.build_viewer()
 
     def build_viewer(self):
@@ -68,8 +69,14 @@ class ResultViewer:
         )
         self.result_text.pack(fill="both", expand=True)
 
+        # Headers of results that are rendered on click
+        self.result_text.tag_config("collapsed", foreground="#4fc1ff", underline=True)
+        self.result_text.tag_bind("collapsed", "<Enter>", lambda e: self.result_text.config(cursor="hand2"))
+        self.result_text.tag_bind("collapsed", "<Leave>", lambda e: self.result_text.config(cursor=""))
+
     def clear_results(self):
         """Clear the results text area"""
+        self.forget_collapsed()
         self.result_text.config(state="normal")
         self.result_text.delete("1.0", tk.END)
         self.result_text.config(state="disabled")
@@ -82,8 +89,37 @@ class ResultViewer:
         # Auto-scroll to bottom to show latest results
         self.result_text.see(tk.END)
 
+    def append_collapsed(self, title, render):
+        """Append a one-line header that is replaced by render() when clicked."""
+        tag = f"collapsed_{self.collapsed_count}"
+        self.collapsed_count += 1
+        self.result_text.config(state="normal")
+        self.result_text.insert(tk.END, f"\n▶ {title} (click to show)\n", ("collapsed", tag))
+        self.result_text.config(state="disabled")
+        self.result_text.tag_bind(tag, "<Button-1>", lambda e: self.expand_collapsed(tag, render))
+
+    def expand_collapsed(self, tag, render):
+        """Replace a collapsed header with its rendered result."""
+        ranges = self.result_text.tag_ranges(tag)
+        if not ranges:
+            return
+        text = render()
+        self.result_text.config(state="normal")
+        self.result_text.delete(ranges[0], ranges[1])
+        self.result_text.insert(ranges[0], text)
+        self.result_text.config(state="disabled", cursor="")
+        self.result_text.tag_delete(tag)
+
+    def forget_collapsed(self):
+        """Drop click bindings of collapsed headers (and the results they reference)."""
+        for tag in self.result_text.tag_names():
+            if tag.startswith("collapsed_"):
+                self.result_text.tag_delete(tag)
+        self.collapsed_count = 0
+
     def show_execution_summary(self, summary):
         """Display the detailed execution summary at the top (from original)"""
+        self.forget_collapsed()
         self.result_text.config(state="normal")
         self.result_text.delete("1.0", tk.END)  # Clear previous content
         self.result_text.insert(tk.END, summary + "\n")
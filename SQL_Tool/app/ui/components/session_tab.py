@@ -0,0 +1,116 @@
+import tkinter as tk
+from tkinter import ttk
+
+from .result_viewer import ResultViewer
+from .summary_grid import SummaryGrid
+
+
+class SessionTab:
+    """Notebook page of one query session: toolbar, live summary grid and result console."""
+
+    def __init__(self, parent, app_controller, session):
+        self.parent = parent
+        self.app = app_controller
+        self.session = session
+        self.frame = None
+        self.cancel_btn = None
+        self.export_btn = None
+        self.close_btn = None
+        self.state_label = None
+        self.summary_grid = None
+        self.result_viewer = None
+        self.build_tab()
+
+    def build_tab(self):
+        self.frame = tk.Frame(self.parent, bg=self.app.bg_color)
+
+        toolbar = tk.Frame(self.frame, bg=self.app.card_bg, pady=4)
+        toolbar.pack(fill="x", pady=(0, 4))
+
+        self.cancel_btn = ttk.Button(
+            toolbar,
+            text="⏹️ Cancel Run",
+            style='Warning.TButton',
+            command=lambda: self.app.cancel_session(self.session.id),
+            state='disabled'
+        )
+        self.cancel_btn.pack(side="left", padx=5)
+
+        self.export_btn = ttk.Button(
+            toolbar,
+            text="💾 Export Results",
+            style='Modern.TButton',
+            command=lambda: self.app.save_query_log(self.session.id),
+            state='disabled'
+        )
+        self.export_btn.pack(side="left", padx=5)
+
+        ttk.Button(
+            toolbar,
+            text="➕ New Session",
+            style='Modern.TButton',
+            command=self.app.open_session
+        ).pack(side="left", padx=5)
+
+        self.close_btn = ttk.Button(
+            toolbar,
+            text="✖ Close Tab",
+            style='Red.TButton',
+            command=lambda: self.app.close_session(self.session.id)
+        )
+        self.close_btn.pack(side="right", padx=5)
+
+        self.state_label = tk.Label(
+            toolbar,
+            text="Idle",
+            bg=self.app.card_bg,
+            fg=self.app.muted_color,
+            font=self.app.font_small
+        )
+        self.state_label.pack(side="right", padx=10)
+
+        pane = ttk.PanedWindow(self.frame, orient="vertical")
+        pane.pack(fill="both", expand=True)
+        self.summary_grid = SummaryGrid(pane, self.app)
+        self.result_viewer = ResultViewer(pane, self.app)
+        pane.add(self.summary_grid.get_frame(), weight=2)
+        pane.add(self.result_viewer.get_frame(), weight=3)
+
+    def get_frame(self):
+        return self.frame
+
+    def title(self):
+        marker = "⏳ " if self.session.running else ""
+        return f"{marker}{self.session.name}"
+
+    def set_running(self, running, cancelling=False, cancellable=True):
+        """Toolbar state for a starting, cancelling or finished run."""
+        can_cancel = running and cancellable and not cancelling
+        self.cancel_btn.config(state="normal" if can_cancel else "disabled")
+        self.close_btn.config(state="disabled" if running else "normal")
+        if running:
+            self.export_btn.config(state="disabled")
+        self.state_label.config(text="Cancelling..." if cancelling else "Running..." if running else "Idle")
+
+    def enable_export(self):
+        self.export_btn.config(state="normal")
+
+    # ------------- Output -------------
+    def clear(self):
+        self.summary_grid.clear()
+        self.result_viewer.clear_results()
+
+    def update_progress(self, progress):
+        self.summary_grid.update(progress)
+
+    def show_execution_summary(self, summary):
+        self.result_viewer.show_execution_summary(summary)
+
+    def append_result(self, result_text):
+        self.result_viewer.append_result(result_text)
+
+    def append_collapsed_result(self, title, render):
+        self.result_viewer.append_collapsed(title, render)
+
+    def show_error(self, error_message):
+        self.result_viewer.show_error(error_message)
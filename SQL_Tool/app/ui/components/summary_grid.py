@@ -0,0 +1,164 @@
+import tkinter as tk
+from tkinter import ttk
+
+
+class SummaryGrid:
+    """Live run summary: one row per database, updated cell by cell from db_progress events."""
+
+    COLUMNS = (
+        # (key, heading, width, anchor)
+        ("database", "Database", 200, "w"),
+        ("state", "Status", 110, "w"),
+        ("progress", "Statements", 90, "center"),
+        ("rows", "Rows", 100, "e"),
+        ("time", "Time(s)", 80, "e"),
+        ("error", "Error", 360, "w"),
+    )
+
+    STATE_LABELS = {
+        "queued": "⏳ Queued",
+        "connecting": "🔄 Connecting",
+        "running": "▶️ Running",
+        "done": "✅ Done",
+        "error": "❌ Error",
+        "cancelled": "⏹️ Cancelled",
+        "current": "⏭️ Current",
+        "skipped": "⏭️ Skipped",
+    }
+
+    # Status sort order: problems first, then work in flight, then finished
+    STATE_ORDER = ("error", "running", "connecting", "queued", "cancelled", "done", "current", "skipped")
+
+    def __init__(self, parent, app_controller):
+        self.parent = parent
+        self.app = app_controller
+        self.frame = None
+        self.tree = None
+        self.title_label = None
+        self.cells = {}          # database -> {column key: displayed text}
+        self.sort_values = {}    # database -> {column key: sort key}
+        self.state_counts = {}   # state -> number of databases in it
+        self.totals = {}         # database -> statements in its script
+        self.sort_column = None
+        self.sort_reverse = False
+        self.build_grid()
+
+    def build_grid(self):
+        self.frame = tk.Frame(
+            self.parent,
+            bg=self.app.card_bg,
+            relief="solid",
+            bd=1,
+            highlightbackground=self.app.border_color,
+            highlightthickness=1
+        )
+
+        container = tk.Frame(self.frame, bg=self.app.card_bg, padx=12, pady=8)
+        container.pack(fill="both", expand=True)
+
+        header = tk.Frame(container, bg=self.app.dark_bg, relief="solid", bd=1)
+        header.pack(fill="x", pady=(0, 6))
+        self.title_label = tk.Label(
+            header,
+            text="📈 Run Summary",
+            font=('Segoe UI', 11, 'bold'),
+            bg=self.app.dark_bg,
+            fg="white",
+            pady=6
+        )
+        self.title_label.pack(anchor="w", padx=12)
+
+        tree_frame = tk.Frame(container, bg=self.app.card_bg)
+        tree_frame.pack(fill="both", expand=True)
+        tree_frame.grid_rowconfigure(0, weight=1)
+        tree_frame.grid_columnconfigure(0, weight=1)
+
+        self.tree = ttk.Treeview(tree_frame, columns=[c[0] for c in self.COLUMNS], show="headings", height=6)
+        for key, heading, width, anchor in self.COLUMNS:
+            self.tree.heading(key, text=heading, command=lambda k=key: self.sort_by(k))
+            self.tree.column(key, width=width, anchor=anchor, stretch=(key == "error"))
+        self.tree.tag_configure("error", foreground=self.app.error_color)
+        self.tree.tag_configure("done", foreground=self.app.success_color)
+
+        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        scrollbar.grid(row=0, column=1, sticky="ns")
+
+    def get_frame(self):
+        return self.frame
+
+    def clear(self):
+        self.tree.delete(*self.tree.get_children())
+        self.cells = {}
+        self.sort_values = {}
+        self.state_counts = {}
+        self.totals = {}
+        self.title_label.config(text="📈 Run Summary")
+
+    def update(self, progress):
+        """Apply one db_progress payload; only cells whose text changed are touched."""
+        db = progress["database"]
+        state = progress["state"]
+        cells = {"state": self.STATE_LABELS.get(state, state.title())}
+        order = self.STATE_ORDER.index(state) if state in self.STATE_ORDER else len(self.STATE_ORDER)
+        sort_values = {"state": order}
+
+        statement = progress.get("statement")
+        statements = progress.get("statements") or self.totals.get(db)
+        if statements:
+            self.totals[db] = statements
+        if statement is not None:
+            cells["progress"] = f"{statement}/{statements}" if statements else str(statement)
+            sort_values["progress"] = statement
+        elif statements:
+            cells["progress"] = f"0/{statements}"
+            sort_values["progress"] = 0
+        if progress.get("rows") is not None:
+            cells["rows"] = f"{progress['rows']:,}"
+            sort_values["rows"] = progress["rows"]
+        if progress.get("exec_time") is not None:
+            cells["time"] = f"{progress['exec_time']:.2f}"
+            sort_values["time"] = progress["exec_time"]
+        if state in ("done", "error") or progress.get("error"):
+            cells["error"] = (progress.get("error") or "")[:200]
+            sort_values["error"] = cells["error"]
+
+        tags = (state,) if state in ("done", "error") else ()
+        shown = self.cells.get(db)
+        if shown is None:
+            shown = self.cells[db] = {key: "" for key, *_ in self.COLUMNS}
+            shown.update(cells, database=db)
+            self.sort_values[db] = {"database": db.lower(), "state": order, "progress": 0, "rows": 0,
+                                    "time": 0.0, "error": ""}
+            self.tree.insert("", tk.END, iid=db, values=[shown[key] for key, *_ in self.COLUMNS], tags=tags)
+        else:
+            self._count_state(shown["state"], -1)
+            for key, text in cells.items():
+                if shown[key] != text:
+                    shown[key] = text
+                    self.tree.set(db, key, text)
+            self.tree.item(db, tags=tags)
+        self._count_state(cells["state"], 1)
+        self.sort_values[db].update(sort_values)
+        self._update_title()
+
+    def _count_state(self, label, delta):
+        self.state_counts[label] = self.state_counts.get(label, 0) + delta
+
+    def _update_title(self):
+        finished = sum(self.state_counts.get(self.STATE_LABELS[s], 0)
+                       for s in ("done", "error", "cancelled", "current", "skipped"))
+        failed = self.state_counts.get(self.STATE_LABELS["error"], 0)
+        self.title_label.config(text=f"📈 Run Summary — {finished}/{len(self.cells)} finished, {failed} error(s)")
+
+    def sort_by(self, column):
+        """Sort rows by a column; clicking the same heading again reverses the order."""
+        self.sort_reverse = not self.sort_reverse if column == self.sort_column else column in ("rows", "time")
+        self.sort_column = column
+        ordered = sorted(self.sort_values, key=lambda db: self.sort_values[db][column], reverse=self.sort_reverse)
+        for index, db in enumerate(ordered):
+            self.tree.move(db, "", index)
+        for key, heading, *_ in self.COLUMNS:
+            arrow = (" ▼" if self.sort_reverse else " ▲") if key == column else ""
+            self.tree.heading(key, text=heading + arrow)
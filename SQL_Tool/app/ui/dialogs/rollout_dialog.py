@@ -0,0 +1,120 @@
+import tkinter as tk
+from tkinter import ttk, messagebox, scrolledtext
+
+from app.core.config import AppConfig
+
+
+class RolloutDialog:
+    def __init__(self, parent, app_controller):
+        self.parent = parent
+        self.app = app_controller
+        self.window = None
+        self.fields = {}
+        self.post_check_text = None
+
+    def show_rollout(self, selected_databases, query):
+        """Ask for canary/wave settings, then start a staged rollout."""
+        self.selected_databases = selected_databases
+        self.query = query
+
+        self.window = tk.Toplevel(self.parent)
+        self.window.title("Staged Rollout")
+        self.window.geometry("520x480")
+        self.window.configure(bg=self.app.bg_color)
+
+        # Make window modal
+        self.window.transient(self.parent)
+        self.window.grab_set()
+
+        self._build_header()
+        self._build_settings()
+        self._build_buttons()
+
+        self.window.focus_set()
+
+    def _build_header(self):
+        header_frame = tk.Frame(self.window, bg=self.app.card_bg, pady=15)
+        header_frame.pack(fill="x", padx=10, pady=(10, 5))
+
+        tk.Label(
+            header_frame,
+            text="🚦 Staged Rollout",
+            font=self.app.font_subtitle,
+            bg=self.app.card_bg,
+            fg=self.app.primary_color
+        ).pack(side="left")
+
+        tk.Label(
+            header_frame,
+            text=f"{len(self.selected_databases)} database(s) selected",
+            font=self.app.font_small,
+            bg=self.app.card_bg,
+            fg=self.app.muted_color
+        ).pack(side="right")
+
+    def _build_settings(self):
+        settings = AppConfig.ROLLOUT
+        form = tk.Frame(self.window, bg=self.app.bg_color)
+        form.pack(fill="x", padx=20, pady=10)
+
+        rows = [
+            ('canary_count', "Canary databases:", settings['canary_count']),
+            ('wave_size', "Wave size:", settings['wave_size']),
+            ('max_workers', "Parallel workers:", settings['max_workers']),
+            ('error_threshold', "Halt at error rate (%):", int(settings['error_threshold'] * 100)),
+        ]
+        for row, (key, label, default) in enumerate(rows):
+            tk.Label(
+                form, text=label, bg=self.app.bg_color,
+                fg=self.app.primary_color, font=self.app.font_label
+            ).grid(row=row, column=0, sticky="w", pady=4)
+            var = tk.StringVar(value=str(default))
+            ttk.Entry(form, textvariable=var, width=10).grid(row=row, column=1, sticky="w", padx=10)
+            self.fields[key] = var
+
+        tk.Label(
+            self.window,
+            text="Post-check queries (one per line, must return a non-zero value):",
+            bg=self.app.bg_color, fg=self.app.primary_color, font=self.app.font_small
+        ).pack(anchor="w", padx=20)
+
+        self.post_check_text = scrolledtext.ScrolledText(
+            self.window, height=8, font=AppConfig.FONTS['code'], wrap=tk.NONE
+        )
+        self.post_check_text.pack(fill="both", expand=True, padx=20, pady=(4, 10))
+
+    def _build_buttons(self):
+        button_frame = tk.Frame(self.window, bg=self.app.bg_color, pady=10)
+        button_frame.pack(fill="x", padx=10)
+
+        ttk.Button(
+            button_frame,
+            text="Start Rollout",
+            style='Accent.TButton',
+            command=self._start
+        ).pack(side="left", padx=(0, 10))
+
+        ttk.Button(
+            button_frame,
+            text="Cancel",
+            style='Modern.TButton',
+            command=self.window.destroy
+        ).pack(side="right")
+
+    def _start(self):
+        try:
+            options = {
+                'canary_count': int(self.fields['canary_count'].get()),
+                'wave_size': int(self.fields['wave_size'].get()),
+                'max_workers': int(self.fields['max_workers'].get()),
+                'error_threshold': float(self.fields['error_threshold'].get()) / 100,
+            }
+        except ValueError:
+            messagebox.showwarning("Input Error", "Rollout settings must be numbers.", parent=self.window)
+            return
+
+        checks = self.post_check_text.get("1.0", tk.END).splitlines()
+        options['post_checks'] = [c.strip().rstrip(";") for c in checks if c.strip()]
+
+        self.window.destroy()
+        self.app.start_query_thread(self.selected_databases, self.query, rollout_options=options)
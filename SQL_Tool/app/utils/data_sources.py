@@ -0,0 +1,46 @@
+import os
+import csv
+from contextlib import contextmanager
+
+from app.core.config import AppConfig
+
+
+EXCEL_EXTENSIONS = (".xlsx", ".xlsm")
+
+
+@contextmanager
+def open_rows(path, sheet=None, delimiter=","):
+    """
+    Stream a CSV or Excel file as (columns, rows): the first row is the header and
+    rows is an iterator of tuples. Excel needs openpyxl and reads the named sheet
+    (or the active one). Empty cells become None when AppConfig.LOAD['empty_as_null'] is set.
+    """
+    empty_as_null = AppConfig.LOAD['empty_as_null']
+    if os.path.splitext(path)[1].lower() in EXCEL_EXTENSIONS:
+        try:
+            import openpyxl
+        except ImportError:
+            raise RuntimeError("openpyxl is required to load Excel files (pip install openpyxl)")
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            worksheet = workbook[sheet] if sheet else workbook.active
+            values = worksheet.iter_rows(values_only=True)
+            columns = [str(c).strip() for c in next(values, ()) if c is not None]
+            width = len(columns)
+            rows = (_clean(row[:width], empty_as_null) for row in values if any(v is not None for v in row))
+            yield columns, rows
+        finally:
+            workbook.close()
+        return
+
+    with open(path, "r", newline="", encoding=AppConfig.LOAD['csv_encoding']) as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        columns = [c.strip() for c in next(reader, [])]
+        rows = (_clean(row, empty_as_null) for row in reader if row)
+        yield columns, rows
+
+
+def _clean(row, empty_as_null):
+    if not empty_as_null:
+        return tuple(row)
+    return tuple(None if v == "" else v for v in row)
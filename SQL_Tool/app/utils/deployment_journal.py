@@ -0,0 +1,196 @@
+import json
+import uuid
+import sqlite3
+import hashlib
+import threading
+from datetime import datetime
+
+from app.core.config import AppConfig
+
+
+class DeploymentJournal:
+    """
+    Append-only, crash-safe record of query runs in a local SQLite file.
+    Each completed statement is committed as soon as it happens so an interrupted
+    run can be resumed without re-applying finished work.
+    """
+
+    SCHEMA = [
+        """CREATE TABLE IF NOT EXISTS runs (
+            run_id TEXT PRIMARY KEY,
+            started_at TEXT NOT NULL,
+            server TEXT,
+            db_type TEXT,
+            query TEXT NOT NULL,
+            query_hash TEXT NOT NULL,
+            databases TEXT NOT NULL,
+            kind TEXT NOT NULL DEFAULT 'query',
+            options TEXT
+        )""",
+        """CREATE TABLE IF NOT EXISTS entries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            run_id TEXT NOT NULL REFERENCES runs(run_id),
+            kind TEXT NOT NULL,
+            database_name TEXT,
+            statement_num INTEGER,
+            status TEXT NOT NULL,
+            error TEXT,
+            recorded_at TEXT NOT NULL
+        )""",
+        "CREATE INDEX IF NOT EXISTS ix_entries_run ON entries(run_id, kind)",
+    ]
+
+    # Final run statuses that leave nothing to resume
+    CLOSED_STATUSES = ("completed",)
+
+    def __init__(self, path=None):
+        self.path = path or AppConfig.JOURNAL['path']
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        for ddl in self.SCHEMA:
+            self._conn.execute(ddl)
+        # Journals created before manifest runs (or rollout resume) existed lack these columns
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(runs)")]
+        if "kind" not in columns:
+            self._conn.execute("ALTER TABLE runs ADD COLUMN kind TEXT NOT NULL DEFAULT 'query'")
+        if "options" not in columns:
+            self._conn.execute("ALTER TABLE runs ADD COLUMN options TEXT")
+        self._conn.commit()
+
+    # ------------- Writing -------------
+    def start_run(self, query, databases, server_info=None, kind="query", options=None):
+        """
+        Register a new run and return its id. kind is 'query' or 'manifest' (query holds the manifest JSON);
+        options (JSON-serializable, e.g. rollout settings) are stored so a resume runs the same way.
+        """
+        run_id = uuid.uuid4().hex
+        server_info = server_info or {}
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO runs (run_id, started_at, server, db_type, query, query_hash, databases, kind, options) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    run_id, self._now(), server_info.get('server'), server_info.get('db_type'),
+                    query, hashlib.sha256(query.encode("utf-8")).hexdigest(), json.dumps(list(databases)), kind,
+                    json.dumps(options) if options is not None else None,
+                )
+            )
+            self._conn.commit()
+        return run_id
+
+    def record_statement(self, run_id, database, statement_num, success, error=None):
+        self._append(run_id, "statement", database, statement_num, "done" if success else "error", error)
+
+    def record_database(self, run_id, database, status):
+        self._append(run_id, "database", database, None, status, None)
+
+    def finish_run(self, run_id, status):
+        """Mark the end of a run; anything other than 'completed' stays resumable."""
+        self._append(run_id, "run", None, None, status, None)
+
+    @staticmethod
+    def run_status(result):
+        """Final status for an executor/rollout result dict."""
+        if result.get("halted"):
+            return "halted"
+        if any(db_info["status"] == "Cancelled" for db_info in result.get("databases_info", [])):
+            return "cancelled"
+        if any(db_info["status"] == "Error" for db_info in result.get("databases_info", [])):
+            return "completed_with_errors"
+        return "completed"
+
+    def _append(self, run_id, kind, database, statement_num, status, error):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO entries (run_id, kind, database_name, statement_num, status, error, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (run_id, kind, database, statement_num, status, error, self._now())
+            )
+            self._conn.commit()
+
+    # ------------- Reading -------------
+    def completed_statements(self, run_id):
+        """Return {database: set(statement_num)} of statements that succeeded in a run."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT database_name, statement_num FROM entries "
+                "WHERE run_id = ? AND kind = 'statement' AND status = 'done'",
+                (run_id,)
+            ).fetchall()
+        completed = {}
+        for database, statement_num in rows:
+            completed.setdefault(database, set()).add(statement_num)
+        return completed
+
+    def get_run(self, run_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT run_id, started_at, server, db_type, query, databases, kind, options FROM runs WHERE run_id = ?",
+                (run_id,)
+            ).fetchone()
+        return self._run_dict(row) if row else None
+
+    def last_incomplete_run(self, server=None, kind="query"):
+        """Most recent run of this kind that did not finish as 'completed' (optionally for one server)."""
+        closed = ", ".join("?" for _ in self.CLOSED_STATUSES)
+        sql = (
+            "SELECT run_id, started_at, server, db_type, query, databases, kind, options FROM runs r "
+            "WHERE r.kind = ? AND NOT EXISTS (SELECT 1 FROM entries e WHERE e.run_id = r.run_id "
+            f"AND e.kind = 'run' AND e.status IN ({closed}))"
+        )
+        params = [kind] + list(self.CLOSED_STATUSES)
+        if server is not None:
+            sql += " AND r.server = ?"
+            params.append(server)
+        sql += " ORDER BY r.started_at DESC, r.rowid DESC LIMIT 1"
+        with self._lock:
+            row = self._conn.execute(sql, params).fetchone()
+        return self._run_dict(row) if row else None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _run_dict(row):
+        run_id, started_at, server, db_type, query, databases, kind, options = row
+        return {
+            'run_id': run_id,
+            'started_at': datetime.fromisoformat(started_at),
+            'server': server,
+            'db_type': db_type,
+            'query': query,
+            'databases': json.loads(databases),
+            'kind': kind,
+            'options': json.loads(options) if options else None,
+        }
+
+    @staticmethod
+    def _now():
+        return datetime.now().isoformat(timespec="microseconds")
+
+
+class ScopedJournal:
+    """
+    Journal view for one part of a larger run (a manifest step, a server in a fleet run).
+    Database keys are stored as 'scope/database' so identical names in different parts never collide.
+    """
+
+    def __init__(self, journal, scope):
+        self.journal = journal
+        self.prefix = f"{scope}/"
+
+    def completed_statements(self, run_id):
+        return {
+            key[len(self.prefix):]: done
+            for key, done in self.journal.completed_statements(run_id).items()
+            if key.startswith(self.prefix)
+        }
+
+    def record_statement(self, run_id, database, statement_num, success, error=None):
+        self.journal.record_statement(run_id, self.prefix + database, statement_num, success, error)
+
+    def record_database(self, run_id, database, status):
+        self.journal.record_database(run_id, self.prefix + database, status)
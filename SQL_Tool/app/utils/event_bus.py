@@ -0,0 +1,161 @@
+"""
+Bounded worker-to-UI event bus.
+
+Drop-in for the queue.Queue the controller used to poll: producers put((type, payload))
+and the Tk loop calls get_nowait(). Differences:
+
+- At most AppConfig.EVENTS['capacity'] events wait for the UI. Producers then block
+  until the UI catches up (backpressure); 'droppable' types are discarded instead and
+  counted. The consumer thread itself never blocks on its own bus.
+- Events of 'coalesce' types replace a still-pending event with the same key (the
+  payload's 'database', if any) and keep its place in line, so the UI only ever sees
+  the latest status line and the latest progress of each database.
+- Payloads are passed by reference; result events carry StatementResult records whose
+  rows live in the run's ResultStore, never copies of rendered text.
+- stats()/describe() report depth, coalesced and dropped events, producer wait time and
+  how long events sat in the bus before the UI picked them up (lag).
+"""
+
+import time
+import threading
+from queue import Empty
+from collections import deque
+
+from app.core.config import AppConfig
+
+
+class EventBus:
+    """Bounded, coalescing (type, payload) channel with a Queue-like put()/get_nowait()."""
+
+    def __init__(self, capacity=None, coalesce=None, droppable=None):
+        settings = AppConfig.EVENTS
+        self.capacity = capacity or settings['capacity']
+        self.coalesce = frozenset(settings['coalesce'] if coalesce is None else coalesce)
+        self.droppable = frozenset(settings['droppable'] if droppable is None else droppable)
+        self.poll_interval = settings['put_poll_interval']
+        self.closed = False
+        self._events = deque()     # [type, payload, enqueued_ns, coalesce key]
+        self._pending = {}         # coalesce key -> event still in _events
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+        self._consumer = None      # thread ident of the UI loop, set on its first get
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self.published = 0
+            self.delivered = 0
+            self.coalesced = 0
+            self.dropped = 0
+            self.blocked_puts = 0
+            self.blocked_ns = 0
+            self.peak_depth = len(self._events)
+            self.lag_total_ns = 0
+            self.lag_max_ns = 0
+
+    @staticmethod
+    def _coalesce_key(typ, payload):
+        return typ, payload.get("database") if isinstance(payload, dict) else None
+
+    # ------------- Producer side -------------
+    def put(self, item, block=True, timeout=None):
+        """
+        Publish (type, payload). When the bus is full: droppable types (and block=False)
+        are dropped, others wait for room, up to timeout seconds (then dropped).
+        """
+        typ, payload = item
+        with self._not_full:
+            self.published += 1
+            key = None
+            if typ in self.coalesce:
+                key = self._coalesce_key(typ, payload)
+                event = self._pending.get(key)
+                if event is not None:
+                    event[1] = payload
+                    self.coalesced += 1
+                    return True
+
+            if len(self._events) >= self.capacity and threading.get_ident() != self._consumer:
+                if typ in self.droppable or not block or self.closed:
+                    self.dropped += 1
+                    return False
+                if not self._wait_for_room(timeout):
+                    self.dropped += 1
+                    return False
+
+            event = [typ, payload, time.perf_counter_ns(), key]
+            self._events.append(event)
+            if key is not None:
+                self._pending[key] = event
+            self.peak_depth = max(self.peak_depth, len(self._events))
+            return True
+
+    def _wait_for_room(self, timeout):
+        """Block (lock held by the caller) until there is room; False on timeout or close."""
+        self.blocked_puts += 1
+        start = time.perf_counter_ns()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while len(self._events) >= self.capacity and not self.closed:
+                wait = self.poll_interval
+                if deadline is not None:
+                    wait = min(wait, deadline - time.monotonic())
+                    if wait <= 0:
+                        return False
+                self._not_full.wait(wait)
+            return not self.closed
+        finally:
+            self.blocked_ns += time.perf_counter_ns() - start
+
+    # ------------- Consumer side -------------
+    def get_nowait(self):
+        """Oldest pending (type, payload); raises queue.Empty when there is none."""
+        with self._lock:
+            self._consumer = threading.get_ident()
+            if not self._events:
+                raise Empty
+            typ, payload, enqueued_ns, key = self._events.popleft()
+            if key is not None:
+                del self._pending[key]
+            lag = time.perf_counter_ns() - enqueued_ns
+            self.delivered += 1
+            self.lag_total_ns += lag
+            self.lag_max_ns = max(self.lag_max_ns, lag)
+            self._not_full.notify()
+        return typ, payload
+
+    def qsize(self):
+        return len(self._events)
+
+    def empty(self):
+        return not self._events
+
+    def close(self):
+        """Release blocked producers; later puts that would wait are dropped."""
+        with self._lock:
+            self.closed = True
+            self._not_full.notify_all()
+
+    # ------------- Metrics -------------
+    def stats(self):
+        with self._lock:
+            return {
+                "published": self.published,
+                "delivered": self.delivered,
+                "coalesced": self.coalesced,
+                "dropped": self.dropped,
+                "depth": len(self._events),
+                "peak_depth": self.peak_depth,
+                "capacity": self.capacity,
+                "blocked_puts": self.blocked_puts,
+                "blocked_s": round(self.blocked_ns / 1e9, 3),
+                "lag_max_ms": round(self.lag_max_ns / 1e6, 1),
+                "lag_mean_ms": round(self.lag_total_ns / self.delivered / 1e6, 1) if self.delivered else 0.0,
+            }
+
+    def describe(self):
+        s = self.stats()
+        return (f"Event Bus           : {s['delivered']:,} delivered, {s['coalesced']:,} coalesced, "
+                f"{s['dropped']:,} dropped, peak {s['peak_depth']:,}/{s['capacity']:,} queued, "
+                f"producers waited {s['blocked_puts']}x ({s['blocked_s']:.2f}s), "
+                f"UI lag mean {s['lag_mean_ms']:.1f} ms / max {s['lag_max_ms']:.1f} ms")
@@ -1,13 +1,12 @@
 # app/utils/file_operations.py
 import hashlib
 from datetime import datetime
-from tkinter import filedialog
 
 class FileOperationsManager:
     @staticmethod
     def save_query_log(query_data: dict, server_info: dict):
         """
-        Save the executed summary and all per-database results to a .log file.
+        Ask for a location, then save the executed summary and all per-database results to a .log file.
         Returns (success: bool, message: str).
         Expected query_data keys:
           - query: str
@@ -25,23 +24,42 @@ class FileOperationsManager:
         if not query_data.get("results"):
             return False, "No query results to save"
 
-        # Build default filename
-        q = query_data.get("query", "")
-        ts: datetime = query_data.get("start_time", datetime.now())
-        ts_str = ts.strftime("%Y%m%d_%H%M%S")
-        q_hash = hashlib.md5(q.encode("utf-8")).hexdigest()[:8]
-        default_name = f"SQLTool_{ts_str}_{q_hash}.log"
+        # Imported here so headless callers (scheduler, CLI) never load Tkinter
+        from tkinter import filedialog
 
         # Ask where to save
         filepath = filedialog.asksaveasfilename(
             title="Save Query Log",
-            initialfile=default_name,
+            initialfile=FileOperationsManager.default_log_name(query_data),
             defaultextension=".log",
             filetypes=[("Log Files", "*.log"), ("Text Files", "*.txt"), ("All Files", "*.*")],
         )
         if not filepath:
             return False, "Save cancelled"
 
+        return FileOperationsManager.write_query_log(query_data, server_info, filepath)
+
+    @staticmethod
+    def default_log_name(query_data: dict, prefix: str = "SQLTool"):
+        """File name built from the start time and a hash of the query."""
+        q = query_data.get("query", "")
+        ts: datetime = query_data.get("start_time", datetime.now())
+        q_hash = hashlib.md5(q.encode("utf-8")).hexdigest()[:8]
+        return f"{prefix}_{ts.strftime('%Y%m%d_%H%M%S')}_{q_hash}.log"
+
+    @staticmethod
+    def write_query_log(query_data: dict, server_info: dict, filepath: str):
+        """
+        Write the log to filepath without any dialog.
+        Returns (success: bool, message: str).
+        """
+        if not query_data or not query_data.get("results"):
+            return False, "No query results to save"
+
+        q = query_data.get("query", "")
+        ts: datetime = query_data.get("start_time", datetime.now())
+        ts_str = ts.strftime("%Y%m%d_%H%M%S")
+
         # Compose header
         server = server_info.get("server") if server_info else "N/A"
         user = server_info.get("username") if server_info else "N/A"
@@ -75,8 +93,15 @@ class FileOperationsManager:
                         f.write(f"Query {stmt_num}:\n")
                     if not item.get("success", True):
                         f.write(f"ERROR: {item.get('error','')}\n")
-                    # The 'result' field already contains the formatted table or rows
-                    f.write(item.get("result", ""))
+                    # Every row is written, streamed line by line; only the on-screen render is capped
+                    export_lines = getattr(item, "export_lines", None)
+                    if export_lines is None:
+                        f.write(item.get("result", ""))
+                    else:
+                        for n, line in enumerate(export_lines()):
+                            if n:
+                                f.write("\n")
+                            f.write(line)
                     f.write("\n")
 
                 f.write("\n" + "=" * 80 + "\n")
@@ -0,0 +1,189 @@
+"""
+Per-phase timing for runs.
+
+    metrics = RunMetrics()
+    with metrics.span("execute", db="tenant_a", statement=2):
+        cursor.execute(sql)
+
+Durations come from time.perf_counter_ns (monotonic, high resolution). Each phase
+gets a histogram; individual spans are kept (up to AppConfig.METRICS['max_spans'])
+for the JSON export. Exports: Prometheus textfile, JSON and a text breakdown.
+"""
+
+import os
+import time
+import threading
+from array import array
+from contextlib import contextmanager
+
+from app.core.config import AppConfig
+
+
+# Display order for the breakdown; unknown phases follow alphabetically
+PHASES = ("connect", "execute", "fetch", "format", "commit", "database", "queue", "render")
+
+
+class Histogram:
+    """Cumulative-bucket histogram in seconds, plus the raw durations for percentiles."""
+
+    __slots__ = ("buckets", "counts", "durations")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.durations = array("q")  # nanoseconds
+
+    def observe(self, ns):
+        self.durations.append(ns)
+        seconds = ns / 1e9
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+
+    @property
+    def count(self):
+        return len(self.durations)
+
+    @property
+    def total(self):
+        return sum(self.durations) / 1e9
+
+    def percentile(self, p):
+        if not self.durations:
+            return 0.0
+        ordered = sorted(self.durations)
+        return ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] / 1e9
+
+    def cumulative(self):
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            yield bound, running
+
+
+class RunMetrics:
+    """Thread-safe span recorder for one run (connect, execute, fetch, format, commit, queue, render)."""
+
+    def __init__(self, enabled=None):
+        settings = AppConfig.METRICS
+        self.enabled = settings['enabled'] if enabled is None else enabled
+        self.buckets = tuple(settings['buckets'])
+        self.max_spans = settings['max_spans']
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}
+            self.spans = []
+            self.dropped_spans = 0
+            self.started_ns = time.perf_counter_ns()
+            self.finished_ns = None
+
+    @contextmanager
+    def span(self, phase, db=None, statement=None):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter_ns() - start, db, statement, start)
+
+    def record(self, phase, ns, db=None, statement=None, start_ns=None):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self.histograms.get(phase)
+            if histogram is None:
+                histogram = self.histograms[phase] = Histogram(self.buckets)
+            histogram.observe(ns)
+            if len(self.spans) < self.max_spans:
+                offset = (start_ns if start_ns is not None else time.perf_counter_ns() - ns) - self.started_ns
+                self.spans.append((phase, db, statement, offset, ns))
+            else:
+                self.dropped_spans += 1
+
+    def mark_finished(self):
+        """Executor side of the run is done; later 'queue' spans are measured from here."""
+        self.finished_ns = time.perf_counter_ns()
+
+    def record_queue_wait(self):
+        """Called by the UI when it picks up the run's summary: time it sat in the message queue."""
+        finished_ns, self.finished_ns = self.finished_ns, None
+        if finished_ns is not None:
+            self.record("queue", time.perf_counter_ns() - finished_ns, start_ns=finished_ns)
+
+    def _ordered_phases(self):
+        known = [p for p in PHASES if p in self.histograms]
+        return known + sorted(p for p in self.histograms if p not in PHASES)
+
+    # ------------- Export -------------
+    def to_json(self, include_spans=True):
+        with self._lock:
+            phases = {
+                phase: {
+                    "count": h.count,
+                    "total_s": round(h.total, 6),
+                    "mean_s": round(h.total / h.count, 6) if h.count else 0.0,
+                    "p50_s": round(h.percentile(50), 6),
+                    "p95_s": round(h.percentile(95), 6),
+                    "max_s": round(max(h.durations) / 1e9, 6) if h.count else 0.0,
+                    "buckets": {str(bound): count for bound, count in h.cumulative()},
+                }
+                for phase, h in ((p, self.histograms[p]) for p in self._ordered_phases())
+            }
+            output = {"phases": phases}
+            if include_spans:
+                output["spans"] = [
+                    {"phase": phase, "database": db, "statement": statement,
+                     "start_s": round(offset / 1e9, 6), "duration_s": round(ns / 1e9, 6)}
+                    for phase, db, statement, offset, ns in self.spans
+                ]
+                output["dropped_spans"] = self.dropped_spans
+            return output
+
+    def to_prometheus(self, prefix="sqltool"):
+        """Prometheus text exposition format (histogram per phase)."""
+        name = f"{prefix}_phase_duration_seconds"
+        lines = [f"# HELP {name} Time spent per run phase.", f"# TYPE {name} histogram"]
+        with self._lock:
+            for phase in self._ordered_phases():
+                h = self.histograms[phase]
+                for bound, count in h.cumulative():
+                    lines.append(f'{name}_bucket{{phase="{phase}",le="{bound}"}} {count}')
+                lines.append(f'{name}_bucket{{phase="{phase}",le="+Inf"}} {h.count}')
+                lines.append(f'{name}_sum{{phase="{phase}"}} {h.total:.9f}')
+                lines.append(f'{name}_count{{phase="{phase}"}} {h.count}')
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path, prefix="sqltool"):
+        """Atomically replace a node_exporter textfile-collector file."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus(prefix))
+        os.replace(tmp_path, path)
+
+    def breakdown(self):
+        """Text table of time per phase, for the execution summary and the results pane."""
+        with self._lock:
+            phases = self._ordered_phases()
+            if not phases:
+                return ""
+            # 'database' spans contain the others, so shares are of the per-statement phases
+            leaf_total = sum(self.histograms[p].total for p in phases if p != "database") or 1.0
+            lines = ["PHASE TIMING",
+                     f"{'Phase':<10} {'Count':>7} {'Total(s)':>10} {'Mean(ms)':>10} {'p95(ms)':>10} "
+                     f"{'Max(ms)':>10} {'Share':>7}"]
+            for phase in phases:
+                h = self.histograms[phase]
+                share = "" if phase == "database" else f"{h.total / leaf_total * 100:.1f}%"
+                lines.append(
+                    f"{phase:<10} {h.count:>7} {h.total:>10.3f} {h.total / h.count * 1000:>10.2f} "
+                    f"{h.percentile(95) * 1000:>10.2f} {max(h.durations) / 1e6:>10.2f} {share:>7}"
+                )
+            return "\n".join(lines)
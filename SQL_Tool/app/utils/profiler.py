@@ -0,0 +1,164 @@
+"""
+Sampling profiler for one run.
+
+A background thread snapshots every thread's Python stack (sys._current_frames)
+every few milliseconds while the profiler is running, so it costs nothing when it
+is off and little when it is on. Results can be saved as collapsed stacks
+(flamegraph.pl, speedscope, inferno), a speedscope JSON file and a top-functions table.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from collections import Counter
+
+from app.core.config import AppConfig
+
+
+# Leaf frames of threads that are just waiting; dropped unless PROFILING['include_idle']
+IDLE_LEAVES = {
+    ("threading", "wait"),
+    ("threading", "_wait_for_tstate_lock"),
+    ("queue", "get"),
+    ("selectors", "select"),
+    ("socketserver", "serve_forever"),
+    ("tkinter", "mainloop"),
+    ("concurrent.futures.thread", "_worker"),
+}
+
+
+class SamplingProfiler:
+    """Samples all threads' stacks; start()/stop() or use as a context manager."""
+
+    def __init__(self, interval=None, include_idle=None):
+        settings = AppConfig.PROFILING
+        self.interval = interval or settings['interval']
+        self.include_idle = settings['include_idle'] if include_idle is None else include_idle
+        self.samples = Counter()          # (thread name, stack tuple) -> count
+        self.sample_count = 0
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+        self._started_at = None
+
+    def start(self):
+        self._stop.clear()
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._sample_loop, name="sampling-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is None:
+            return self
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.duration = time.perf_counter() - self._started_at
+        return self
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _sample_loop(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((frame.f_globals.get("__name__", "?"), code.co_name, code.co_filename,
+                                  code.co_firstlineno))
+                    frame = frame.f_back
+                if not stack or (not self.include_idle and stack[0][:2] in IDLE_LEAVES):
+                    continue
+                stack.reverse()
+                self.samples[(names.get(thread_id, str(thread_id)), tuple(stack))] += 1
+                self.sample_count += 1
+
+    # ------------- Output -------------
+    @staticmethod
+    def _frame_name(frame):
+        module, function = frame[0], frame[1]
+        return f"{module}.{function}"
+
+    def collapsed(self):
+        """Brendan Gregg collapsed-stack lines: 'thread;root;...;leaf count'."""
+        lines = []
+        for (thread_name, stack), count in self.samples.most_common():
+            names = [thread_name] + [self._frame_name(f) for f in stack]
+            lines.append(f"{';'.join(n.replace(';', ':') for n in names)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self, name="SQL Tool run"):
+        """speedscope file-format JSON: one sampled profile per thread."""
+        frames = []
+        frame_index = {}
+        profiles = {}
+        for (thread_name, stack), count in self.samples.items():
+            indexes = []
+            for frame in stack:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({"name": self._frame_name(frame), "file": frame[2], "line": frame[3]})
+                indexes.append(frame_index[frame])
+            profile = profiles.setdefault(thread_name, {"samples": [], "weights": []})
+            profile["samples"].append(indexes)
+            profile["weights"].append(count * self.interval)
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "SQL Tool sampling profiler",
+            "shared": {"frames": frames},
+            "profiles": [
+                {"type": "sampled", "name": thread_name, "unit": "seconds", "startValue": 0,
+                 "endValue": round(sum(p["weights"]), 6), "samples": p["samples"], "weights": p["weights"]}
+                for thread_name, p in profiles.items()
+            ],
+        }
+
+    def top_functions(self, limit=None):
+        """Table of functions by own (leaf) samples, with inclusive samples alongside."""
+        limit = limit or AppConfig.PROFILING['top_functions']
+        own = Counter()
+        inclusive = Counter()
+        for (_, stack), count in self.samples.items():
+            own[stack[-1]] += count
+            for frame in set(stack):
+                inclusive[frame] += count
+
+        total = self.sample_count or 1
+        lines = [f"PROFILE: {self.sample_count} sample(s) over {self.duration:.2f}s "
+                 f"every {self.interval * 1000:.0f} ms",
+                 f"{'Own%':>6} {'Total%':>7}  Function"]
+        for frame, count in own.most_common(limit):
+            location = f"{os.path.basename(frame[2])}:{frame[3]}"
+            lines.append(f"{count / total * 100:>5.1f}% {inclusive[frame] / total * 100:>6.1f}%  "
+                         f"{self._frame_name(frame)} ({location})")
+        return "\n".join(lines)
+
+    def save(self, directory, base_name):
+        """Write <base>.collapsed.txt, <base>.speedscope.json and <base>.top.txt; returns the paths."""
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, base_name)
+        paths = {
+            "collapsed": f"{base}.collapsed.txt",
+            "speedscope": f"{base}.speedscope.json",
+            "top": f"{base}.top.txt",
+        }
+        with open(paths["collapsed"], "w", encoding="utf-8") as f:
+            f.write(self.collapsed())
+        with open(paths["speedscope"], "w", encoding="utf-8") as f:
+            json.dump(self.speedscope(base_name), f)
+        with open(paths["top"], "w", encoding="utf-8") as f:
+            f.write(self.top_functions() + "\n")
+        return paths
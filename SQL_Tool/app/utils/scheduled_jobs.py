@@ -0,0 +1,47 @@
+# app/utils/scheduled_jobs.py
+
+import json
+import os
+
+from app.core.config import AppConfig
+
+# {
+#     "jobs": {
+#         "nightly-recon": {"profile": "prod-mssql", "databases": ["tenant_*"],
+#                           "script": "scripts/recon.sql", "schedule": "0 */4 * * *",
+#                           "max_workers": 4, "enabled": true}
+#     }
+# }
+
+
+def load_jobs(path=None):
+    """Loads all scheduled jobs as {name: job}."""
+    path = path or AppConfig.SCHEDULER['jobs_file']
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            return json.load(f).get("jobs", {})
+        except json.JSONDecodeError:
+            return {}
+
+
+def save_job(name, job, path=None):
+    """Adds or replaces one scheduled job."""
+    path = path or AppConfig.SCHEDULER['jobs_file']
+    jobs = load_jobs(path)
+    jobs[name] = job
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"jobs": jobs}, f, indent=4)
+
+
+def remove_job(name, path=None):
+    """Removes one scheduled job; returns False if it did not exist."""
+    path = path or AppConfig.SCHEDULER['jobs_file']
+    jobs = load_jobs(path)
+    if name not in jobs:
+        return False
+    del jobs[name]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"jobs": jobs}, f, indent=4)
+    return True
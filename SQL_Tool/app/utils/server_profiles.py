@@ -0,0 +1,58 @@
+# app/utils/server_profiles.py
+
+import json
+import os
+
+PROFILES_FILE = "server_profiles.json"
+PASSWORD_ENV = "SQLTOOL_PASSWORD"
+
+# {
+#     "profiles": {
+#         "prod-mssql": {"db_type": "SQL Server", "server": "sql01", "username": "deploy",
+#                        "password_env": "PROD_MSSQL_PASSWORD"},
+#         "local-bench": {"db_type": "SQLite", "server": "./bench_dbs", "username": ""},
+#         "prod-pg": {"db_type": "PostgreSQL", "server": "pg01", "username": "deploy", "driver": "psycopg"}
+#     }
+# }
+
+
+def load_profiles(path=None):
+    """Loads all saved server profiles as {name: profile}."""
+    path = path or PROFILES_FILE
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            return json.load(f).get("profiles", {})
+        except json.JSONDecodeError:
+            return {}
+
+
+def save_profile(name, profile, path=None):
+    """Adds or replaces one profile; passwords are never written, only password_env."""
+    path = path or PROFILES_FILE
+    profiles = load_profiles(path)
+    profiles[name] = {k: v for k, v in profile.items() if k != "password"}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"profiles": profiles}, f, indent=4)
+
+
+def get_profile(name, path=None):
+    """Returns one profile with its password resolved, or raises ValueError."""
+    profiles = load_profiles(path)
+    if name not in profiles:
+        raise ValueError(f"Unknown server profile: {name}")
+    profile = dict(profiles[name])
+    profile.setdefault("name", name)
+    profile["password"] = resolve_password(profile)
+    return profile
+
+
+def resolve_password(profile):
+    """Password from the profile's own env var, then SQLTOOL_PASSWORD, then the profile itself."""
+    env_name = profile.get("password_env")
+    if env_name and os.environ.get(env_name) is not None:
+        return os.environ[env_name]
+    if os.environ.get(PASSWORD_ENV) is not None:
+        return os.environ[PASSWORD_ENV]
+    return profile.get("password", "")
@@ -0,0 +1,293 @@
+"""
+Benchmark harness on synthetic SQLite databases (no server needed). Run from SQL_Tool/:
+
+    python -m benchmarks.bench                                   # default sweep
+    python -m benchmarks.bench --databases 1,10,100,500 --rows 1000,100000,1000000 --width 12
+    python -m benchmarks.bench --save-baseline                   # store results in benchmarks/baseline.json
+    python -m benchmarks.bench --compare                         # fail (exit 1) on regressions vs the baseline
+
+Measures:
+  fanout     end-to-end execute_query time across N databases (curve over --databases)
+  fetch      rows/s of a full SELECT into a ResultSet, and peak traced memory (curve over --rows)
+  format     rows/s of QueryExecutor._format_query_results
+  validator  MB/s of QueryValidator.contains_dangerous_sql on a large script
+  ui_insert  seconds to insert formatted results into the result viewer (needs a display)
+
+Fixtures are cached under --fixtures by shape, so repeated runs only pay for them once.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import random
+import argparse
+import platform
+import tracemalloc
+from types import SimpleNamespace
+
+from app.core.config import AppConfig
+from app.database.connection import DatabaseManager
+from app.database.query_executor import QueryExecutor
+from app.utils.validators import QueryValidator
+
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+
+
+class NullSink:
+    """Message queue that discards everything, so the UI queue does not skew timings."""
+
+    def put(self, item):
+        pass
+
+
+# ------------- Fixtures -------------
+def make_fixtures(root, count, rows, width, seed=42):
+    """
+    Directory with count SQLite databases (db0000.db ...), each holding a table 'bench'
+    of rows x width columns cycling through int, real and text. One template database
+    is generated and copied, so large counts are cheap.
+    """
+    import sqlite3
+
+    directory = os.path.join(root, f"n{count}_r{rows}_w{width}")
+    marker = os.path.join(directory, ".complete")
+    if os.path.exists(marker):
+        return directory
+    shutil.rmtree(directory, ignore_errors=True)
+    os.makedirs(directory)
+
+    kinds = ["INTEGER", "REAL", "TEXT"]
+    columns = [f"c{i} {kinds[i % 3]}" for i in range(width)]
+    rng = random.Random(seed)
+
+    def generate():
+        for n in range(rows):
+            yield tuple(
+                n * (i + 1) if i % 3 == 0 else
+                rng.random() * 1000 if i % 3 == 1 else
+                f"value_{n}_{i}_{rng.randrange(1 << 20):x}"
+                for i in range(width)
+            )
+
+    template = os.path.join(directory, "db0000.db")
+    conn = sqlite3.connect(template)
+    conn.execute(f"CREATE TABLE bench ({', '.join(columns)})")
+    conn.executemany(f"INSERT INTO bench VALUES ({', '.join('?' * width)})", generate())
+    conn.commit()
+    conn.close()
+    for i in range(1, count):
+        shutil.copyfile(template, os.path.join(directory, f"db{i:04d}.db"))
+
+    with open(marker, "w") as f:
+        f.write("ok")
+    return directory
+
+
+def _manager(directory):
+    db_manager = DatabaseManager()
+    db_manager.set_config("SQLite", directory, "", "")
+    return db_manager
+
+
+def _best(repeat, fn):
+    """Minimum wall time of fn over repeat runs (and fn's last return value)."""
+    best = None
+    value = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, value
+
+
+# ------------- Benchmarks -------------
+def bench_fanout(directory, count, workers, repeat):
+    executor = QueryExecutor(_manager(directory), NullSink())
+    databases = [f"db{i:04d}" for i in range(count)]
+    query = "SELECT COUNT(*), SUM(c0) FROM bench"
+    seconds, _ = _best(repeat, lambda: executor.execute_query(databases, query, max_workers=workers))
+    return {
+        f"fanout.seconds[dbs={count}]": (seconds, "s", "lower"),
+        f"fanout.dbs_per_s[dbs={count}]": (count / seconds, "dbs/s", "higher"),
+    }
+
+
+def bench_fetch(directory, rows, repeat):
+    db_manager = _manager(directory)
+    driver = db_manager.driver
+
+    def fetch():
+        with db_manager.database_connection("db0000") as conn:
+            cursor = driver.cursor(conn)
+            cursor.execute("SELECT * FROM bench")
+            return driver.fetch_result_set(cursor, AppConfig.QUERY_BATCH_SIZE)
+
+    seconds, result_set = _best(repeat, fetch)
+
+    tracemalloc.start()
+    fetch()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        f"fetch.rows_per_s[rows={rows}]": (rows / seconds, "rows/s", "higher"),
+        f"fetch.peak_mb[rows={rows}]": (peak / 1e6, "MB", "lower"),
+        f"fetch.resultset_mb[rows={rows}]": (result_set.nbytes() / 1e6, "MB", "lower"),
+    }, result_set
+
+
+def bench_format(result_set, rows, repeat):
+    executor = QueryExecutor(None, NullSink())
+    saved = AppConfig.RESULTS['max_display_rows']
+    # Format every row, not just the display cap, so the number tracks the formatter itself
+    AppConfig.RESULTS['max_display_rows'] = rows
+    try:
+        seconds, text = _best(repeat, lambda: executor._format_query_results(result_set, "db0000", 1))
+    finally:
+        AppConfig.RESULTS['max_display_rows'] = saved
+    return {f"format.rows_per_s[rows={rows}]": (rows / seconds, "rows/s", "higher")}, text
+
+
+def bench_validator(repeat, statements=20000):
+    script = ";\n".join(
+        f"SELECT c{i % 7}, COUNT(*) FROM bench WHERE c0 > {i} GROUP BY c{i % 7} -- report {i}"
+        for i in range(statements)
+    ) + ";\nDELETE FROM bench WHERE c0 < 0;"
+    megabytes = len(script.encode("utf-8")) / 1e6
+    seconds, _ = _best(repeat, lambda: QueryValidator.contains_dangerous_sql(script))
+    return {"validator.mb_per_s": (megabytes / seconds, "MB/s", "higher")}
+
+
+def bench_ui_insert(text, rows, repeat):
+    """Insert formatted results into a real ResultViewer; None when there is no display."""
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception:
+        return None
+    try:
+        root.withdraw()
+        from app.ui.components.result_viewer import ResultViewer
+        colors = SimpleNamespace(card_bg="#ffffff", dark_bg="#2c3e50", border_color="#d0d0d0")
+        viewer = ResultViewer(root, colors)
+        viewer.get_frame().pack()
+
+        def insert():
+            viewer.clear_results()
+            viewer.append_result(text)
+            root.update_idletasks()
+
+        seconds, _ = _best(repeat, insert)
+        return {f"ui_insert.seconds[rows={rows}]": (seconds, "s", "lower")}
+    finally:
+        root.destroy()
+
+
+# ------------- Reporting -------------
+def compare(results, baseline, tolerance):
+    """Lines describing each metric against the baseline, and the names of regressions."""
+    lines = []
+    regressions = []
+    for name, entry in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            lines.append(f"{name:<42} {entry['value']:>14,.3f} {entry['unit']:<7}   (no baseline)")
+            continue
+        ratio = entry["value"] / base["value"] if base["value"] else float("inf")
+        worse = ratio > 1 + tolerance if entry["better"] == "lower" else ratio < 1 / (1 + tolerance)
+        if worse:
+            regressions.append(name)
+        lines.append(f"{name:<42} {entry['value']:>14,.3f} {entry['unit']:<7} x{ratio:>6.2f} vs baseline"
+                     f"{'  REGRESSION' if worse else ''}")
+    return lines, regressions
+
+
+def run(args):
+    AppConfig.METRICS['enabled'] = not args.no_metrics
+    db_counts = [int(n) for n in args.databases.split(",")]
+    row_counts = [int(n) for n in args.rows.split(",")]
+    results = {}
+
+    def add(measurements):
+        for name, (value, unit, better) in measurements.items():
+            results[name] = {"value": value, "unit": unit, "better": better}
+            print(f"{name:<42} {value:>14,.3f} {unit}", file=sys.stderr, flush=True)
+
+    for count in db_counts:
+        directory = make_fixtures(args.fixtures, count, args.fanout_rows, args.width)
+        add(bench_fanout(directory, count, args.workers, args.repeat))
+
+    for rows in row_counts:
+        directory = make_fixtures(args.fixtures, 1, rows, args.width)
+        measurements, result_set = bench_fetch(directory, rows, args.repeat)
+        add(measurements)
+        measurements, text = bench_format(result_set, rows, args.repeat)
+        add(measurements)
+        if not args.no_ui:
+            measurements = bench_ui_insert(text, rows, args.repeat)
+            if measurements is None:
+                print("ui_insert: skipped (no display)", file=sys.stderr)
+                args.no_ui = True
+            else:
+                add(measurements)
+
+    add(bench_validator(args.repeat))
+
+    report = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "cpus": os.cpu_count()},
+        "parameters": {"databases": db_counts, "rows": row_counts, "width": args.width,
+                       "fanout_rows": args.fanout_rows, "workers": args.workers, "repeat": args.repeat},
+        "results": results,
+    }
+
+    exit_code = 0
+    if args.compare:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        lines, regressions = compare(results, baseline, args.tolerance)
+        print("\n".join(lines))
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}", file=sys.stderr)
+            exit_code = 1
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline saved to {args.baseline}", file=sys.stderr)
+    return exit_code
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="bench", description="SQL Tool benchmark harness (SQLite fixtures)")
+    parser.add_argument("--databases", default="1,10,50", help="Comma list of database counts for the fan-out curve")
+    parser.add_argument("--rows", default="1000,100000", help="Comma list of row counts for fetch/format curves")
+    parser.add_argument("--width", type=int, default=8, help="Columns per synthetic table")
+    parser.add_argument("--fanout-rows", type=int, default=1000, help="Rows per database in fan-out fixtures")
+    parser.add_argument("--workers", type=int, default=AppConfig.THROTTLE['max_workers'],
+                        help="Parallel workers for fan-out")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the best is kept")
+    parser.add_argument("--fixtures", default=os.path.join(BENCH_DIR, "fixtures"), help="Fixture cache folder")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline")
+    parser.add_argument("--compare", action="store_true", help="Compare against the baseline; exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before flagging (0.2 = 20%%)")
+    parser.add_argument("--no-ui", action="store_true", help="Skip the Tk insert benchmark")
+    parser.add_argument("--no-metrics", action="store_true", help="Disable phase-timing spans while measuring")
+    return parser
+
+
+def main(argv=None):
+    return run(build_parser().parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())